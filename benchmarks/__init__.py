@@ -0,0 +1,10 @@
+"""
+Standalone performance benchmarks for the kitchen app.
+
+Every benchmark is a module runnable from the project root, for example::
+
+    DJANGO_SECRET_KEY=... python -m benchmarks.session_writes
+
+Benchmarks run against a throwaway database created the same way the test
+runner creates one, so the development database is never touched.
+"""
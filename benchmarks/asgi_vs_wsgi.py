@@ -0,0 +1,215 @@
+"""
+Compares the ASGI deployment (uvicorn) with the WSGI one (gunicorn) under
+concurrent load.
+
+Seeds a throwaway SQLite database, starts both servers against it and
+fires ``--requests`` requests at the async API views from ``--concurrency``
+keep-alive clients, reporting requests per second and latency percentiles
+for each server and URL.
+"""
+import argparse
+import http.client
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+TMP_DIR = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = (
+    f"sqlite:///{Path(TMP_DIR.name) / 'benchmark.sqlite3'}"
+)
+os.environ["DJANGO_DEBUG"] = "False"
+
+from benchmarks.utils import setup_django  # noqa: E402
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from kitchen.models import Dish, DishType, Ingredient  # noqa: E402
+
+
+def seed(dishes: int) -> str:
+    """
+    Fills the database and returns the session id of a logged in cook.
+    """
+    call_command("migrate", verbosity=0)
+    cook = get_user_model().objects.create_user(username="bench")
+    dish_type = DishType.objects.create(name="Main Course")
+    ingredients = Ingredient.objects.bulk_create(
+        Ingredient(name=f"Ingredient {num}") for num in range(20)
+    )
+    created = Dish.objects.bulk_create(
+        Dish(
+            name=f"Dish {num}",
+            description="Benchmark dish",
+            price=10,
+            dish_type=dish_type,
+            image="dish_images/benchmark.jpg",
+        )
+        for num in range(dishes)
+    )
+    Dish.ingredients.through.objects.bulk_create(
+        Dish.ingredients.through(dish=dish, ingredient=ingredient)
+        for dish in created
+        for ingredient in ingredients[:5]
+    )
+    Dish.cooks.through.objects.bulk_create(
+        Dish.cooks.through(dish=dish, cook=cook) for dish in created
+    )
+    client = Client()
+    client.force_login(cook)
+    return client.cookies["sessionid"].value
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_commands(port: int, workers: int, threads: int) -> dict:
+    return {
+        "gunicorn (WSGI)": [
+            sys.executable, "-m", "gunicorn", "restaurant_mate.wsgi",
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(workers),
+            "--threads", str(threads),
+            "--log-level", "warning",
+        ],
+        "uvicorn (ASGI)": [
+            sys.executable, "-m", "uvicorn",
+            "restaurant_mate.asgi:application",
+            "--host", "127.0.0.1",
+            "--port", str(port),
+            "--workers", str(workers),
+            "--log-level", "warning",
+        ],
+    }
+
+
+def wait_until_up(port: int, timeout: float = 20) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"The server on port {port} didn't start.")
+
+
+def load(
+    port: int,
+    path: str,
+    session_id: str,
+    requests: int,
+    concurrency: int,
+) -> dict[str, float]:
+    """
+    Sends ``requests`` GET requests to ``path`` from ``concurrency``
+    threads, each over its own keep-alive connection.
+    """
+    latencies = []
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+    headers = {"Cookie": f"sessionid={session_id}"}
+
+    def client() -> None:
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    break
+            started = time.perf_counter()
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            elapsed = (time.perf_counter() - started) * 1000
+            assert response.status == 200, (path, response.status)
+            with lock:
+                latencies.append(elapsed)
+        connection.close()
+
+    started = time.perf_counter()
+    clients = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": cuts[49],
+        "p95": cuts[94],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dishes", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=4,
+        help="Threads per gunicorn worker.",
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    session_id = seed(args.dishes)
+    dish = Dish.objects.first()
+    api_list = reverse("kitchen:api-list", kwargs={"resource": "dishes"})
+    urls = {
+        "api list": f"{api_list}?include=ingredients,cooks",
+        "api detail": reverse(
+            "kitchen:api-detail",
+            kwargs={"resource": "dishes", "pk": dish.pk}
+        ),
+    }
+
+    print(
+        f"{args.requests} requests per URL, {args.concurrency} concurrent "
+        f"clients, {args.workers} worker(s)"
+    )
+    print(
+        f"{'server':<16} {'url':<11} {'req/s':>8} {'p50 ms':>8} "
+        f"{'p95 ms':>8}"
+    )
+    port = free_port()
+    commands = server_commands(port, args.workers, args.threads)
+    for server, command in commands.items():
+        process = subprocess.Popen(command, env=os.environ.copy())
+        try:
+            wait_until_up(port)
+            for name, path in urls.items():
+                load(port, path, session_id, args.concurrency, 1)
+                result = load(
+                    port, path, session_id, args.requests, args.concurrency
+                )
+                print(
+                    f"{server:<16} {name:<11} {result['rps']:>8.0f} "
+                    f"{result['p50']:>8.1f} {result['p95']:>8.1f}"
+                )
+        finally:
+            process.terminate()
+            process.wait()
+    TMP_DIR.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Measures the bulk dish import against saving dishes one by one.
+
+Generates ``--dishes`` rows over a pool of dish types, ingredients and
+cooks, imports them with ``KitchenImporter`` and times the per-row ORM
+path (``create()`` and ``add()``, as a form would) on a sample of
+``--sample`` rows for comparison.
+"""
+import argparse
+import logging
+
+from benchmarks.utils import benchmark_database, setup_django, timed
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from kitchen.importer import KitchenImporter  # noqa: E402
+from kitchen.models import Dish, DishType, Ingredient  # noqa: E402
+
+
+def generate_rows(dishes: int, offset: int = 0):
+    for num in range(offset, offset + dishes):
+        yield {
+            "name": f"Dish {num}",
+            "description": "Benchmark dish",
+            "price": "12.50",
+            "dish_type": f"Type {num % 10}",
+            "ingredients": [
+                f"Ingredient {(num + step) % 500}" for step in range(5)
+            ],
+            "cooks": [f"cook{num % 200}", f"cook{(num + 1) % 200}"],
+        }
+
+
+def import_one_by_one(rows) -> None:
+    cook_model = get_user_model()
+    with transaction.atomic():
+        for row in rows:
+            dish = Dish.objects.create(
+                name=row["name"],
+                description=row["description"],
+                price=row["price"],
+                dish_type=DishType.objects.get_or_create(
+                    name=row["dish_type"]
+                )[0],
+            )
+            dish.ingredients.add(*(
+                Ingredient.objects.get_or_create(name=name)[0]
+                for name in row["ingredients"]
+            ))
+            dish.cooks.add(*(
+                cook_model.objects.get_or_create(username=username)[0]
+                for username in row["cooks"]
+            ))
+
+
+def count_queries(func) -> int:
+    queries = 0
+
+    def count(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        func()
+    return queries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dishes", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    with benchmark_database(), override_settings(DEBUG=False):
+        importer = KitchenImporter(batch_size=args.batch_size)
+        bulk_queries = 0
+
+        def run_bulk():
+            nonlocal bulk_queries
+            bulk_queries = count_queries(
+                lambda: importer.run(generate_rows(args.dishes))
+            )
+
+        bulk_ms = timed(run_bulk)
+        sample = list(generate_rows(args.sample, offset=args.dishes))
+        single_queries = 0
+
+        def run_single():
+            nonlocal single_queries
+            single_queries = count_queries(lambda: import_one_by_one(sample))
+
+        single_ms = timed(run_single)
+
+        print(f"{'path':<12} {'dishes':>8} {'total ms':>10} "
+              f"{'dishes/s':>9} {'queries':>8}")
+        for name, dishes, elapsed, queries in (
+            ("bulk", args.dishes, bulk_ms, bulk_queries),
+            ("one by one", args.sample, single_ms, single_queries),
+        ):
+            print(
+                f"{name:<12} {dishes:>8} {elapsed:>10.0f} "
+                f"{dishes / elapsed * 1000:>9.0f} {queries:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
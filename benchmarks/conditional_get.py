@@ -0,0 +1,144 @@
+"""
+Measures what conditional GET saves on the dish pages.
+
+For the index, the dish list and a dish page, times a full render, a
+revalidation answered with ``304 Not Modified`` and the freshness check
+alone (computing the validators), and counts the queries of the first two.
+"""
+import argparse
+import logging
+import statistics
+
+from benchmarks.utils import benchmark_database, setup_django, timed
+
+setup_django()
+
+from asgiref.sync import async_to_sync  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client, RequestFactory, override_settings  # noqa
+from django.urls import reverse  # noqa: E402
+
+from kitchen.models import Dish, DishType, Ingredient  # noqa: E402
+from kitchen.views import DishDetailView, DishListView, IndexView  # noqa
+
+
+def seed(dishes: int) -> None:
+    get_user_model().objects.create_user(
+        username="bench",
+        password="benchmark",
+    )
+    dish_type = DishType.objects.create(name="Main Course")
+    ingredients = Ingredient.objects.bulk_create(
+        Ingredient(name=f"Ingredient {num}") for num in range(20)
+    )
+    created = Dish.objects.bulk_create(
+        Dish(
+            name=f"Dish {num}",
+            description="Benchmark dish",
+            price=10,
+            dish_type=dish_type,
+            image="dish_images/benchmark.jpg",
+        )
+        for num in range(dishes)
+    )
+    Dish.ingredients.through.objects.bulk_create(
+        Dish.ingredients.through(dish=dish, ingredient=ingredient)
+        for dish in created
+        for ingredient in ingredients[:5]
+    )
+
+
+def count_queries(func) -> int:
+    queries = 0
+
+    def count(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        func()
+    return queries
+
+
+def measure(
+    client: Client,
+    url: str,
+    view_class: type,
+    view_kwargs: dict,
+    repeat: int,
+) -> dict[str, float]:
+    user = get_user_model().objects.get(username="bench")
+    first = client.get(url)
+    headers = {"if-none-match": first["ETag"]}
+
+    assert client.get(url, headers=headers).status_code == 304, url
+
+    def check_freshness():
+        request = RequestFactory().get(url)
+        request.user = user
+        view = view_class()
+        view.setup(request, **view_kwargs)
+        async_to_sync(view.aget_validators)()
+
+    return {
+        "full_ms": statistics.median(
+            timed(lambda: client.get(url)) for _ in range(repeat)
+        ),
+        "not_modified_ms": statistics.median(
+            timed(lambda: client.get(url, headers=headers))
+            for _ in range(repeat)
+        ),
+        "check_ms": statistics.median(
+            timed(check_freshness) for _ in range(repeat)
+        ),
+        "full_queries": count_queries(lambda: client.get(url)),
+        "not_modified_queries": count_queries(
+            lambda: client.get(url, headers=headers)
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dishes", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    with benchmark_database(), override_settings(DEBUG=False):
+        seed(args.dishes)
+        client = Client()
+        client.force_login(get_user_model().objects.get(username="bench"))
+        dish = Dish.objects.first()
+        pages = (
+            ("index", reverse("kitchen:main-page"), IndexView, {}),
+            ("dishes", reverse("kitchen:dishes-page"), DishListView, {}),
+            (
+                "dish detail",
+                dish.get_absolute_url(),
+                DishDetailView,
+                {"pk": dish.pk},
+            ),
+        )
+
+        print(f"{args.dishes} dishes, median of {args.repeat} requests")
+        print(
+            f"{'page':<12} {'full ms':>8} {'304 ms':>8} {'check ms':>9} "
+            f"{'full q':>7} {'304 q':>6}"
+        )
+        for name, url, view_class, view_kwargs in pages:
+            result = measure(client, url, view_class, view_kwargs,
+                             args.repeat)
+            print(
+                f"{name:<12} {result['full_ms']:>8.2f} "
+                f"{result['not_modified_ms']:>8.2f} "
+                f"{result['check_ms']:>9.2f} "
+                f"{result['full_queries']:>7} "
+                f"{result['not_modified_queries']:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Load-tests the kitchen views through the project's WSGI and ASGI apps.
+
+Seeds ``--dishes`` dishes with the bulk importer, then for each app sends
+``--requests`` requests per endpoint from ``--concurrency`` concurrent
+clients: threads for WSGI, tasks on one event loop for ASGI. Requests are
+handed straight to the application callables, so the numbers measure
+Django and the database without a server or the network in between.
+
+Reports p50/p95/p99 latency and requests per second per URL name, and
+writes them to ``--output`` as JSON so runs can be compared.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from io import BytesIO
+from itertools import count
+from urllib.parse import urlencode
+
+os.environ.setdefault("DJANGO_DEBUG", "False")
+
+from benchmarks.utils import benchmark_database, setup_django  # noqa: E402
+
+setup_django()
+
+import django  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from kitchen.importer import KitchenImporter  # noqa: E402
+from kitchen.models import Dish  # noqa: E402
+
+
+# Plain file system storages for uploads and static files, so the run needs
+# neither collectstatic's manifest nor the content-addressed uploads.
+BENCHMARK_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+    },
+}
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    path: str
+    form: dict | None = None
+    unique_field: str | None = None
+    accept: str = "text/html"
+
+
+def seed(dishes: int) -> None:
+    KitchenImporter().run(
+        {
+            "name": f"Dish {num}",
+            "description": "Benchmark dish",
+            "price": "12.50",
+            "dish_type": f"Type {num % 10}",
+            "ingredients": [
+                f"Ingredient {(num + step) % 100}" for step in range(4)
+            ],
+            "cooks": [f"cook{num % 20}"],
+            "image": "dish_images/benchmark.jpg",
+        }
+        for num in range(dishes)
+    )
+
+
+def endpoints() -> list[Endpoint]:
+    dish = Dish.objects.order_by("pk").first()
+    cook = get_user_model().objects.order_by("pk").first()
+    return [
+        Endpoint("kitchen:main-page", "GET", reverse("kitchen:main-page")),
+        Endpoint("kitchen:dishes-page", "GET", reverse("kitchen:dishes-page")),
+        Endpoint("kitchen:cooks-page", "GET", reverse("kitchen:cooks-page")),
+        Endpoint("kitchen:dish-detail-page", "GET", dish.get_absolute_url()),
+        Endpoint(
+            "kitchen:cook-detail-page",
+            "GET",
+            reverse("kitchen:cook-detail-page", kwargs={"slug": cook.slug}),
+        ),
+        Endpoint(
+            "kitchen:search",
+            "GET",
+            f"{reverse('kitchen:search')}?{urlencode({'query': 'Dish 1'})}",
+        ),
+        Endpoint(
+            "kitchen:api-list",
+            "GET",
+            reverse("kitchen:api-list", kwargs={"resource": "dishes"}),
+            accept="application/json",
+        ),
+        Endpoint(
+            "kitchen:dish-type-create",
+            "POST",
+            reverse("kitchen:dish-type-create"),
+            form={"description": "Created by the load test"},
+            unique_field="name",
+        ),
+        Endpoint(
+            "kitchen:toggle-dish-assign",
+            "POST",
+            reverse("kitchen:toggle-dish-assign", kwargs={"pk": dish.pk}),
+            form={},
+        ),
+    ]
+
+
+class RequestBuilder:
+    """
+    Turns an endpoint into the method, path, query string, headers and
+    body of one request, carrying the session and CSRF cookies.
+    """
+
+    def __init__(self, session_id: str, csrf_token: str) -> None:
+        self.csrf_token = csrf_token
+        self.cookie = f"sessionid={session_id}; csrftoken={csrf_token}"
+        self.counter = count()
+        self.lock = threading.Lock()
+
+    def build(self, endpoint: Endpoint) -> tuple:
+        path, _, query = endpoint.path.partition("?")
+        headers = {
+            "host": "127.0.0.1",
+            "cookie": self.cookie,
+            "accept": endpoint.accept,
+        }
+        body = b""
+        if endpoint.method == "POST":
+            form = dict(endpoint.form or {})
+            if endpoint.unique_field:
+                with self.lock:
+                    number = next(self.counter)
+                form[endpoint.unique_field] = f"Load test {number}"
+            body = urlencode(form).encode()
+            headers["content-type"] = "application/x-www-form-urlencoded"
+            headers["x-csrftoken"] = self.csrf_token
+        return endpoint.method, path, query, headers, body
+
+
+def call_wsgi(application, request: tuple) -> int:
+    method, path, query, headers, body = request
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SERVER_NAME": "127.0.0.1",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "REMOTE_ADDR": "127.0.0.1",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in headers.items():
+        key = name.upper().replace("-", "_")
+        if key != "CONTENT_TYPE":
+            key = f"HTTP_{key}"
+        environ[key] = value
+    status = []
+
+    def start_response(status_line, response_headers, exc_info=None):
+        status.append(int(status_line.split()[0]))
+
+    response = application(environ, start_response)
+    try:
+        for _ in response:
+            pass
+    finally:
+        response.close()
+    return status[0]
+
+
+async def call_asgi(application, request: tuple) -> int:
+    method, path, query, headers, body = request
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (name.encode(), value.encode()) for name, value in headers.items()
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # Nothing else arrives; Django cancels this once it has responded.
+        await asyncio.Future()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await application(scope, receive, send)
+    return status[0]
+
+
+def summarize(results: list[tuple[float, int]], elapsed: float) -> dict:
+    """
+    Sums up the ``(milliseconds, status)`` of a run. Latencies and the
+    request rate only cover successful responses, 2xx and 3xx; the others
+    are counted per status instead of skewing the numbers.
+    """
+    latencies = [ms for ms, status in results if status < 400]
+    failures = {}
+    for _, status in results:
+        if status >= 400:
+            failures[str(status)] = failures.get(str(status), 0) + 1
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100)
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        # quantiles() needs two samples; a single one is every percentile.
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        "requests": len(results),
+        "errors": sum(failures.values()),
+        "error_statuses": failures,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(p50, 2),
+        "p95_ms": round(p95, 2),
+        "p99_ms": round(p99, 2),
+    }
+
+
+def run_wsgi(application, builder, endpoint, requests, concurrency) -> dict:
+    def one(_):
+        request = builder.build(endpoint)
+        started = time.perf_counter()
+        status = call_wsgi(application, request)
+        return (time.perf_counter() - started) * 1000, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - started
+    return summarize(results, elapsed)
+
+
+def run_asgi(application, builder, endpoint, requests, concurrency) -> dict:
+    async def drive():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                request = builder.build(endpoint)
+                started = time.perf_counter()
+                status = await call_asgi(application, request)
+                return (time.perf_counter() - started) * 1000, status
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one() for _ in range(requests)))
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(drive())
+    return summarize(results, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dishes", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--apps",
+        default="wsgi,asgi",
+        help="Comma separated apps to drive, out of wsgi and asgi.",
+    )
+    parser.add_argument("--output", default="load_test_results.json")
+    args = parser.parse_args()
+
+    # Failed requests are counted per status; their tracebacks, logged by
+    # django.request at ERROR level, would only flood the output.
+    logging.disable(logging.ERROR)
+    with (
+        benchmark_database(),
+        override_settings(DEBUG=False, STORAGES=BENCHMARK_STORAGES),
+    ):
+        seed(args.dishes)
+        client = Client()
+        client.force_login(get_user_model().objects.order_by("pk").first())
+        client.get(reverse("kitchen:dish-type-create"))
+        builder = RequestBuilder(
+            client.cookies["sessionid"].value,
+            client.cookies["csrftoken"].value,
+        )
+
+        from django.core.asgi import get_asgi_application
+        from django.core.wsgi import get_wsgi_application
+
+        runners = {
+            "wsgi": (get_wsgi_application(), run_wsgi),
+            "asgi": (get_asgi_application(), run_asgi),
+        }
+        results = {}
+        print(
+            f"{args.dishes} dishes, {args.requests} requests per URL, "
+            f"{args.concurrency} concurrent clients"
+        )
+        print(
+            f"{'app':<5} {'url name':<28} {'req/s':>8} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+        )
+        for app_name in args.apps.split(","):
+            application, run = runners[app_name]
+            results[app_name] = {}
+            for endpoint in endpoints():
+                run(application, builder, endpoint, args.concurrency, 1)
+                result = run(
+                    application,
+                    builder,
+                    endpoint,
+                    args.requests,
+                    args.concurrency,
+                )
+                results[app_name][endpoint.name] = result
+                print(
+                    f"{app_name:<5} {endpoint.name:<28} "
+                    f"{result['rps']:>8.1f} {result['p50_ms']:>8.1f} "
+                    f"{result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+                    f"{result['errors']:>7}"
+                )
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "dishes": args.dishes,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Counts ``django_session`` writes caused by the previous URL middleware.
+
+Replays the same browsing trace of 1,000 requests once through a legacy
+middleware that stores the referer on every request and once through
+``kitchen.middleware.StorePreviousURLMiddleware``, then reports how many
+session writes each one caused.
+"""
+import argparse
+import itertools
+import logging
+
+from benchmarks.utils import benchmark_database, setup_django
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.utils.deprecation import MiddlewareMixin  # noqa: E402
+
+from kitchen.models import Dish, DishType  # noqa: E402
+
+CURRENT_MIDDLEWARE = "kitchen.middleware.StorePreviousURLMiddleware"
+LEGACY_MIDDLEWARE = "benchmarks.session_writes.LegacyPreviousURLMiddleware"
+
+TRACE_STEPS = (
+    ("/", None),
+    ("/dishes/", "/"),
+    ("/dishes/?page=2", "/dishes/"),
+    ("/dishes/?page=2", "/dishes/"),
+    ("/files/dish_images/missing.jpg", "/dishes/?page=2"),
+    ("/cooks/", "/dishes/?page=2"),
+    ("/cooks/", "/dishes/?page=2"),
+    ("/admin/", "/cooks/"),
+    ("/ingredients/", "/cooks/"),
+    ("/dish_types/", "/ingredients/"),
+)
+
+
+class LegacyPreviousURLMiddleware(MiddlewareMixin):
+    def process_request(self, request):
+        request.session["previous_url"] = request.META.get("HTTP_REFERER")
+
+
+def count_session_writes(client: Client, requests: int) -> int:
+    writes = 0
+
+    def count_writes(execute, sql, params, many, context):
+        nonlocal writes
+        if "django_session" in sql and sql.lstrip().startswith(
+            ("INSERT", "UPDATE")
+        ):
+            writes += 1
+        return execute(sql, params, many, context)
+
+    trace = itertools.islice(itertools.cycle(TRACE_STEPS), requests)
+    with connection.execute_wrapper(count_writes):
+        for path, referer in trace:
+            headers = {"referer": f"http://testserver{referer}"} \
+                if referer else {}
+            client.get(path, headers=headers)
+    return writes
+
+
+def seed() -> None:
+    get_user_model().objects.create_superuser(
+        username="bench",
+        first_name="Bench",
+        last_name="Mark",
+        password="benchmark",
+    )
+    dish_type = DishType.objects.create(name="Main Course")
+    Dish.objects.bulk_create(
+        Dish(
+            name=f"Dish {num}",
+            description="Benchmark dish",
+            price=10,
+            dish_type=dish_type,
+            image="dish_images/benchmark.jpg",
+        )
+        for num in range(12)
+    )
+
+
+def replay(middleware_path: str, requests: int) -> int:
+    from django.conf import settings
+
+    middleware = [
+        middleware_path if path == CURRENT_MIDDLEWARE else path
+        for path in settings.MIDDLEWARE
+        if "debug_toolbar" not in path
+    ]
+    with override_settings(MIDDLEWARE=middleware, DEBUG=False):
+        client = Client()
+        client.force_login(get_user_model().objects.get(username="bench"))
+        return count_session_writes(client, requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    with benchmark_database():
+        seed()
+        legacy_writes = replay(LEGACY_MIDDLEWARE, args.requests)
+        current_writes = replay(CURRENT_MIDDLEWARE, args.requests)
+
+    avoided = legacy_writes - current_writes
+    print(f"Requests replayed:       {args.requests}")
+    print(f"Session writes (legacy): {legacy_writes}")
+    print(f"Session writes (now):    {current_writes}")
+    print(
+        f"Writes avoided:          {avoided} "
+        f"({avoided / max(legacy_writes, 1):.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
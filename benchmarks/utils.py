@@ -0,0 +1,61 @@
+import os
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import django
+
+
+def setup_django() -> None:
+    """
+    Configures Django with the project settings so benchmark modules can
+    import models and views.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "restaurant_mate.settings")
+    django.setup()
+
+
+@contextmanager
+def benchmark_database() -> Iterator[None]:
+    """
+    Creates a throwaway test database for the duration of the block.
+
+    SQLite databases are created as a temporary file rather than in memory,
+    so threads driving concurrent requests share the same data. Their
+    connections wait up to 30 seconds for another one's write lock, so
+    concurrent writes measure the views rather than fail on lock
+    contention.
+    """
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if connection.vendor == "sqlite":
+            connection.settings_dict["TEST"]["NAME"] = str(
+                Path(tmp_dir) / "benchmark.sqlite3"
+            )
+            connection.settings_dict["OPTIONS"].setdefault("timeout", 30)
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0,
+            autoclobber=True
+        )
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+
+def timed(func: Callable[[], object]) -> float:
+    """
+    Runs ``func`` once and returns the elapsed wall time in milliseconds.
+    """
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
@@ -1,12 +1,33 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.utils import timezone
 
-from .models import Cook, DishType, Dish, Ingredient
+from .jobs import dispatch_jobs
+from .models import (
+    Cook,
+    DishType,
+    Dish,
+    DishCook,
+    DishIngredient,
+    ImageJob,
+    Ingredient,
+)
+
+
+class DishCookInline(admin.TabularInline):
+    model = DishCook
+    extra = 1
+
+
+class DishIngredientInline(admin.TabularInline):
+    model = DishIngredient
+    extra = 1
 
 
 @admin.register(Dish)
 class DishAdmin(admin.ModelAdmin):
     list_display = ("name", "dish_type", "price", "created_at", "updated_at",)
+    inlines = (DishCookInline, DishIngredientInline,)
 
 
 @admin.register(DishType)
@@ -85,3 +106,39 @@ class CookAdmin(UserAdmin):
 class IngredientAdmin(admin.ModelAdmin):
     list_display = ("name", "description")
     search_fields = ("name",)
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "file_name",
+        "model_label",
+        "object_id",
+        "status",
+        "attempts",
+        "run_after",
+        "updated_at",
+    )
+    list_filter = ("status", "model_label",)
+    search_fields = ("file_name",)
+    readonly_fields = (
+        "model_label",
+        "object_id",
+        "field_name",
+        "file_name",
+        "attempts",
+        "last_error",
+        "created_at",
+        "updated_at",
+    )
+    actions = ("retry_jobs",)
+
+    @admin.action(description="Retry selected jobs")
+    def retry_jobs(self, request, queryset):
+        retried = queryset.exclude(status=ImageJob.Status.DONE).update(
+            status=ImageJob.Status.PENDING,
+            attempts=0,
+            run_after=timezone.now(),
+        )
+        dispatch_jobs()
+        self.message_user(request, f"{retried} jobs queued again.")
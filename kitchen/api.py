@@ -0,0 +1,216 @@
+"""
+Read-only JSON representation of the kitchen catalogue.
+
+Every resource is served straight from ``values()`` rows, without building
+model instances. Clients pick the columns they need with ``?fields=`` and
+ask for related rows with ``?include=``; each included relation costs one
+extra query for the whole page, whatever its size. Lists are paged with
+the keyset paginator, so no page needs an ``OFFSET`` or a ``COUNT(*)``.
+
+Queries run on the async ORM, so the API views serve requests on the event
+loop under ASGI instead of a worker thread each.
+"""
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.db.models import F, QuerySet
+
+from .models import Dish, DishType, Ingredient
+from .pagination import KeysetPaginator
+
+
+class InvalidQuery(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Resource:
+    """
+    Describes how a model is exposed: the columns clients may select,
+    the ones returned when they don't, and the relations they may include,
+    mapped to the name of the related resource.
+    """
+    model: type[models.Model]
+    fields: tuple[str, ...]
+    default_fields: tuple[str, ...]
+    relations: dict[str, str] = field(default_factory=dict)
+
+
+def get_resources() -> dict[str, Resource]:
+    """
+    Returns the resources of the API by the name used in their URLs.
+    """
+    return {
+        "dishes": Resource(
+            model=Dish,
+            fields=(
+                "id", "name", "description", "price", "dish_type",
+                "created_at", "updated_at",
+            ),
+            default_fields=("id", "name", "price", "dish_type"),
+            relations={
+                "dish_type": "dish_types",
+                "ingredients": "ingredients",
+                "cooks": "cooks",
+            },
+        ),
+        "dish_types": Resource(
+            model=DishType,
+            fields=("id", "name", "description"),
+            default_fields=("id", "name"),
+        ),
+        "ingredients": Resource(
+            model=Ingredient,
+            fields=("id", "name", "description"),
+            default_fields=("id", "name"),
+        ),
+        "cooks": Resource(
+            model=get_user_model(),
+            fields=(
+                "id", "username", "slug", "first_name", "last_name",
+                "years_of_experience", "bio",
+            ),
+            default_fields=("id", "username", "slug"),
+            relations={"dishes": "dishes"},
+        ),
+    }
+
+
+def parse_list(value: str | None) -> list[str]:
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class ResourceQuery:
+    """
+    Resolves the ``fields`` and ``include`` parameters of a request against
+    ``resource`` and turns querysets of it into JSON-ready dictionaries.
+    """
+
+    def __init__(
+        self,
+        resource: Resource,
+        fields: str | None = None,
+        include: str | None = None,
+    ) -> None:
+        resources = get_resources()
+        self.resource = resource
+        self.fields = parse_list(fields) or list(resource.default_fields)
+        self.include = parse_list(include)
+
+        unknown = set(self.fields) - set(resource.fields)
+        if unknown:
+            raise InvalidQuery(
+                f"Unknown fields: {', '.join(sorted(unknown))}."
+            )
+        unknown = set(self.include) - resource.relations.keys()
+        if unknown:
+            raise InvalidQuery(
+                f"Unknown relations: {', '.join(sorted(unknown))}."
+            )
+        if "id" not in self.fields:
+            self.fields.insert(0, "id")
+        self.included = {
+            name: resources[resource.relations[name]]
+            for name in self.include
+        }
+
+    def queryset(self) -> QuerySet:
+        """
+        Returns the ``values()`` queryset of the selected columns, plus the
+        ones the paginator orders by and the keys of included relations
+        that are foreign keys.
+        """
+        model = self.resource.model
+        columns = list(dict.fromkeys(
+            self.fields
+            + [name.lstrip("-") for name in model._meta.ordering]
+            + [name for name in self.include if self._is_foreign_key(name)]
+        ))
+        return model._default_manager.values("pk", *columns)
+
+    async def page(
+        self,
+        per_page: int,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], Any]:
+        """
+        Returns the serialized rows of the page after ``cursor`` and the
+        page itself, which knows the cursors of its neighbours.
+        """
+        page = await KeysetPaginator(self.queryset(), per_page).apage(cursor)
+        return await self.serialize(page.object_list), page
+
+    async def get(self, pk: int) -> dict[str, Any]:
+        """
+        Returns the serialized row with the primary key ``pk``.
+
+        Raises:
+            DoesNotExist: When there is no such row.
+        """
+        row = await self.queryset().aget(pk=pk)
+        return (await self.serialize([row]))[0]
+
+    async def serialize(
+        self,
+        rows: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """
+        Keeps the selected columns of ``rows`` and attaches the included
+        relations, fetched with a single query per relation.
+        """
+        related = {
+            name: await self._fetch_related(name, rows)
+            for name in self.include
+        }
+        results = []
+        for row in rows:
+            item = {name: row[name] for name in self.fields}
+            for name, values in related.items():
+                if self._is_foreign_key(name):
+                    item[name] = values.get(row[name])
+                else:
+                    item[name] = values.get(row["pk"], [])
+            results.append(item)
+        return results
+
+    def _is_foreign_key(self, name: str) -> bool:
+        return self.resource.model._meta.get_field(name).many_to_one
+
+    async def _fetch_related(
+        self,
+        name: str,
+        rows: list[dict[str, Any]],
+    ) -> dict:
+        """
+        Returns the default columns of the rows related through ``name``,
+        by primary key for a foreign key, or as lists keyed by the primary
+        key of the row they belong to for the other relations.
+        """
+        related = self.included[name]
+        manager = related.model._default_manager
+        fields = related.default_fields
+        if not rows:
+            return {}
+
+        if self._is_foreign_key(name):
+            keys = {row[name] for row in rows if row[name] is not None}
+            return {
+                values["id"]: values
+                async for values in manager.filter(pk__in=keys).values(*fields)
+            }
+
+        model_field = self.resource.model._meta.get_field(name)
+        if model_field.concrete:
+            remote_name = model_field.related_query_name()
+        else:
+            remote_name = model_field.field.name
+        grouped = {}
+        async for values in manager.filter(
+            **{f"{remote_name}__in": [row["pk"] for row in rows]}
+        ).values(*fields, api_owner=F(remote_name)):
+            grouped.setdefault(values.pop("api_owner"), []).append(values)
+        return grouped
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class KitchenConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'kitchen'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+
+        signals.connect_signals()
@@ -0,0 +1,170 @@
+"""
+Async handlers for the kitchen's generic views.
+
+Views built from these mixins serve requests on the event loop under
+ASGI. They query with the async ORM, and the helpers that only have a sync
+implementation, like the cache backends, are called in one
+``sync_to_async`` hop each rather than running the whole view in a
+thread. Templates are rendered by Django in a thread afterwards, as for
+any ``TemplateResponse`` returned from an async view.
+"""
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.mixins import AccessMixin
+from django.core.paginator import InvalidPage
+from django.db.models import Model, QuerySet
+from django.http import Http404, HttpRequest, HttpResponse
+
+
+async def aevaluate(queryset: QuerySet) -> QuerySet:
+    """
+    Fetches the rows of ``queryset`` in a worker thread, as the async ORM
+    does, and returns the queryset with its results cached, so templates
+    and sync code iterate it without querying again.
+    """
+    await sync_to_async(len)(queryset)
+    return queryset
+
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    """
+    Async counterpart of ``LoginRequiredMixin`` for views with async
+    handlers: the user is loaded with ``request.auser()``, so the session
+    isn't read synchronously from the event loop.
+    """
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncListMixin:
+    """
+    Async ``get()`` for a ``ListView``.
+
+    The page is fetched by ``apaginate_queryset()`` before the context is
+    built, and ``paginate_queryset()`` hands it over to the view's
+    ``get_context_data()``. Mixins paging differently override
+    ``apaginate_queryset()`` and call ``super()`` for the numbered pages
+    implemented here. Context needing more queries is added in
+    ``aget_context_data()``.
+    """
+
+    async def get(
+        self,
+        request: HttpRequest,
+        *args,
+        **kwargs
+    ) -> HttpResponse:
+        self.object_list = await self.aget_queryset()
+        if (
+            not self.get_allow_empty()
+            and not await self.object_list.aexists()
+        ):
+            raise Http404("Empty list.")
+        context = await self.aget_context_data()
+        return self.render_to_response(context)
+
+    async def aget_queryset(self) -> QuerySet:
+        """
+        Returns ``get_queryset()``, built in a worker thread: a search
+        reads the table list of the database the first time it runs.
+        """
+        return await sync_to_async(self.get_queryset)()
+
+    async def aget_context_data(self, **kwargs) -> dict[str, Any]:
+        page_size = self.get_paginate_by(self.object_list)
+        if page_size:
+            self.paginated = await self.apaginate_queryset(
+                self.object_list,
+                page_size
+            )
+        return self.get_context_data(**kwargs)
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple:
+        return self.paginated
+
+    async def apaginate_queryset(
+        self,
+        queryset: QuerySet,
+        page_size: int
+    ) -> tuple:
+        """
+        Async version of ``MultipleObjectMixin.paginate_queryset()``: counts
+        the rows with ``acount()`` and fetches the rows of the page.
+        """
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        paginator.__dict__["count"] = await queryset.acount()
+        page_number = (
+            self.kwargs.get(self.page_kwarg)
+            or self.request.GET.get(self.page_kwarg)
+            or 1
+        )
+        try:
+            page_number = int(page_number)
+        except ValueError:
+            if page_number != "last":
+                raise Http404(
+                    "Page is not “last”, nor can it be converted to an int."
+                )
+            page_number = paginator.num_pages
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as error:
+            raise Http404(f"Invalid page ({page_number}): {error}")
+        page.object_list = await aevaluate(page.object_list)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class AsyncDetailMixin:
+    """
+    Async ``get()`` for a ``DetailView``. The object is fetched with
+    ``aget_object()``, and context needing more queries is added in
+    ``aget_context_data()``.
+    """
+
+    async def get(
+        self,
+        request: HttpRequest,
+        *args,
+        **kwargs
+    ) -> HttpResponse:
+        self.object = await self.aget_object()
+        context = await self.aget_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_object(self, queryset: QuerySet | None = None) -> Model:
+        """
+        Async version of ``SingleObjectMixin.get_object()``.
+        """
+        if queryset is None:
+            queryset = self.get_queryset()
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        if slug is not None and (pk is None or self.query_pk_and_slug):
+            queryset = queryset.filter(**{self.get_slug_field(): slug})
+        if pk is None and slug is None:
+            raise AttributeError(
+                f"Generic detail view {self.__class__.__name__} must be "
+                "called with either an object pk or a slug in the URLconf."
+            )
+        try:
+            return await queryset.aget()
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                f"No {queryset.model._meta.verbose_name} found matching the "
+                "query"
+            )
+
+    async def aget_context_data(self, **kwargs) -> dict[str, Any]:
+        return self.get_context_data(**kwargs)
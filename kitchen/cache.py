@@ -0,0 +1,331 @@
+"""
+Caching helpers for the kitchen app.
+
+Cached values are never invalidated by deleting keys. Instead their keys
+embed version numbers (a row's ``updated_at``, or a per-model generation
+counter that model signals bump in ``kitchen.signals``), so a change
+simply makes the next lookup miss and stale entries age out of the cache
+on their own.
+
+Every lookup made through these helpers is counted as a hit or a miss
+under a name, see ``get_cache_stats()``.
+"""
+import hashlib
+import time
+from collections.abc import Iterable
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.paginator import Page
+from django.db import models
+from django.db.models import Prefetch, QuerySet, prefetch_related_objects
+from django.template.loader import render_to_string
+from django.utils.safestring import SafeString, mark_safe
+
+from .models import Dish, Ingredient
+from .search import search_models
+
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+QUERYSET_TIMEOUT = 60 * 15
+STATS_NAMES_KEY = "kitchen:stats:names"
+IMAGE_GENERATION = "image"
+
+
+def _generation_key(name: str) -> str:
+    return f"kitchen:generation:{name}"
+
+
+def get_generation(name: str) -> int:
+    """
+    Returns the current value of the ``name`` generation counter.
+
+    Generations are the time of the last bump in nanoseconds, or of the
+    first lookup if the counter was never bumped or got evicted. So they
+    never repeat a value already used in keys, and double as the time the
+    counted rows last changed.
+    """
+    key = _generation_key(name)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(name: str) -> None:
+    """
+    Moves the ``name`` generation counter on, so every key built from its
+    previous value stops matching.
+    """
+    key = _generation_key(name)
+    current = cache.get(key, 0)
+    cache.set(key, max(time.time_ns(), current + 1), timeout=None)
+
+
+def get_model_generation(*model_classes: type[models.Model]) -> str:
+    """
+    Returns the generations of ``model_classes`` joined into one key part.
+    """
+    return ".".join(
+        str(get_generation(model._meta.model_name))
+        for model in model_classes
+    )
+
+
+def record_lookups(name: str, hits: int = 0, misses: int = 0) -> None:
+    """
+    Counts ``hits`` cache hits and ``misses`` misses of the ``name``
+    lookup. Callers count a whole page of lookups at once, so that a page
+    costs at most one cache write per outcome.
+    """
+    for outcome, count in (("hits", hits), ("misses", misses)):
+        if not count:
+            continue
+        key = f"kitchen:stats:{name}:{outcome}"
+        if cache.add(key, count, timeout=None):
+            names = cache.get(STATS_NAMES_KEY, set())
+            if name not in names:
+                cache.set(STATS_NAMES_KEY, names | {name}, timeout=None)
+            continue
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            cache.set(key, count, timeout=None)
+
+
+def get_cache_stats() -> dict[str, dict[str, int]]:
+    """
+    Returns the hits and misses counted so far for every lookup name.
+
+    The counters live in the cache itself, so they cover every process
+    sharing the cache.
+    """
+    names = sorted(cache.get(STATS_NAMES_KEY, set()))
+    counters = cache.get_many([
+        f"kitchen:stats:{name}:{outcome}"
+        for name in names
+        for outcome in ("hits", "misses")
+    ])
+    return {
+        name: {
+            outcome: counters.get(f"kitchen:stats:{name}:{outcome}", 0)
+            for outcome in ("hits", "misses")
+        }
+        for name in names
+    }
+
+
+def reset_cache_stats() -> None:
+    names = cache.get(STATS_NAMES_KEY, set())
+    cache.delete_many([
+        f"kitchen:stats:{name}:{outcome}"
+        for name in names
+        for outcome in ("hits", "misses")
+    ] + [STATS_NAMES_KEY])
+
+
+def dish_fragment_key(dish: Dish, template_name: str, generation: str) -> str:
+    return (
+        f"kitchen:fragment:{template_name}:{dish.pk}:"
+        f"{dish.updated_at.timestamp()}:{generation}"
+    )
+
+
+def get_dish_fragments(
+    dishes: Iterable[Dish],
+    template_name: str
+) -> dict[int, SafeString]:
+    """
+    Returns the rendered ``template_name`` fragment of every dish, keyed by
+    dish id.
+
+    Fragments are looked up with a single ``get_many``. Only the dishes
+    that missed get their ingredients prefetched, in one query, and are
+    rendered and stored, so a fully cached page of cards costs no query
+    beyond listing the dishes.
+    """
+    dishes = list(dishes)
+    generation = (
+        f"{get_generation(Ingredient._meta.model_name)}."
+        f"{get_generation(IMAGE_GENERATION)}"
+    )
+    keys = {
+        dish.pk: dish_fragment_key(dish, template_name, generation)
+        for dish in dishes
+    }
+    fragments = cache.get_many(keys.values())
+
+    missing = [dish for dish in dishes if keys[dish.pk] not in fragments]
+    record_lookups(
+        "dish_fragments",
+        hits=len(dishes) - len(missing),
+        misses=len(missing)
+    )
+    if missing:
+        prefetch_related_objects(
+            missing,
+            Prefetch(
+                "ingredients",
+                queryset=Ingredient.objects.only("id", "name")
+            )
+        )
+        rendered = {
+            keys[dish.pk]: render_to_string(template_name, {"dish": dish})
+            for dish in missing
+        }
+        cache.set_many(rendered, timeout=FRAGMENT_TIMEOUT)
+        fragments.update(rendered)
+
+    return {pk: mark_safe(fragments[key]) for pk, key in keys.items()}
+
+
+async def aget_dish_fragments(
+    dishes: Iterable[Dish],
+    template_name: str
+) -> dict[int, SafeString]:
+    """
+    Async version of ``get_dish_fragments()``. The cache backends are sync,
+    so the whole lookup runs in one hop to a thread instead of one per
+    cache call.
+    """
+    return await sync_to_async(get_dish_fragments)(dishes, template_name)
+
+
+def search_models_cached(
+    term: str,
+    models_to_search: Iterable[type[models.Model]],
+    limit: int,
+    budget_ms: float,
+) -> tuple[dict[type[models.Model], list[models.Model]], bool]:
+    """
+    Works like ``kitchen.search.search_models()``, but remembers the ids
+    each model's search returned. A model whose ids are cached is answered
+    with a primary key lookup instead of a search query, and only the
+    other models are searched.
+    """
+    models_to_search = list(models_to_search)
+    term_hash = hashlib.sha256(term.encode()).hexdigest()
+    keys = {
+        model: (
+            f"kitchen:search:{model._meta.label_lower}:{limit}:"
+            f"{term_hash}:{get_model_generation(model)}"
+        )
+        for model in models_to_search
+    }
+    cached_ids = cache.get_many(keys.values())
+
+    results, timed_out = {}, False
+    missing = [model for model in models_to_search
+               if keys[model] not in cached_ids]
+    if missing:
+        results, timed_out = search_models(term, missing, limit, budget_ms)
+        cache.set_many(
+            {
+                keys[model]: [obj.pk for obj in rows]
+                for model, rows in results.items()
+            },
+            timeout=QUERYSET_TIMEOUT
+        )
+
+    record_lookups(
+        "search",
+        hits=len(models_to_search) - len(missing),
+        misses=len(missing)
+    )
+    for model in models_to_search:
+        if model not in missing:
+            ids = cached_ids[keys[model]]
+            rows = model._default_manager.in_bulk(ids)
+            results[model] = [rows[pk] for pk in ids if pk in rows]
+
+    return {
+        model: results[model]
+        for model in models_to_search
+        if model in results
+    }, timed_out
+
+
+class CachedPageMixin:
+    """
+    Caches the page a ``ListView`` shows, together with the total row
+    count, so a repeated request for the same page costs no query.
+
+    The page is keyed on the SQL of the view's queryset, which covers any
+    search filter, and on the generations of the queryset's model and of
+    ``page_cache_models``. Keyset pages aren't cached: their queries are
+    cheap already.
+
+    The page is fetched on the event loop by
+    ``kitchen.async_views.AsyncListMixin``, listed after this mixin.
+    """
+    page_cache_name = None
+    page_cache_models = ()
+
+    def _get_cached_page(
+        self,
+        queryset: QuerySet,
+        page_size: int
+    ) -> tuple[str, tuple | None]:
+        """
+        Returns the cache key of the requested page and the cached page, if
+        any, counting the lookup.
+        """
+        name = self.page_cache_name or queryset.model._meta.model_name
+        page_number = (
+            self.kwargs.get(self.page_kwarg)
+            or self.request.GET.get(self.page_kwarg)
+            or 1
+        )
+        query_hash = hashlib.sha256(str(queryset.query).encode()).hexdigest()
+        generation = get_model_generation(
+            queryset.model, *self.page_cache_models
+        )
+        key = (
+            f"kitchen:page:{name}:{query_hash}:{page_size}:{page_number}:"
+            f"{generation}"
+        )
+        cached = cache.get(key)
+        record_lookups(
+            name,
+            hits=int(cached is not None),
+            misses=int(cached is None)
+        )
+        return key, cached
+
+    async def apaginate_queryset(
+        self,
+        queryset: QuerySet,
+        page_size: int
+    ) -> tuple:
+        get_pagination_mode = getattr(self, "get_pagination_mode", None)
+        if get_pagination_mode and get_pagination_mode() != "offset":
+            return await super().apaginate_queryset(queryset, page_size)
+
+        # The cache backends are sync, so the lookups share a single hop to
+        # a thread.
+        key, cached = await sync_to_async(self._get_cached_page)(
+            queryset,
+            page_size
+        )
+        if cached is None:
+            paginator, page, object_list, is_paginated = (
+                await super().apaginate_queryset(queryset, page_size)
+            )
+            page.object_list = object_list = list(object_list)
+            await cache.aset(
+                key,
+                (paginator.count, page.number, object_list),
+                timeout=QUERYSET_TIMEOUT
+            )
+            return paginator, page, object_list, is_paginated
+
+        count, number, object_list = cached
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        paginator.__dict__["count"] = count
+        page = Page(object_list, number, paginator)
+        return paginator, page, object_list, page.has_other_pages()
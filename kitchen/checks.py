@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+PROCESS_LOCAL_CACHES = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs) -> list[Warning]:
+    """
+    Warns when the default cache isn't shared between processes. The
+    cached pages, fragments and conditional GET validators are invalidated
+    through generation counters kept in that cache.
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            "The default cache is not shared between processes.",
+            hint=(
+                "Changes handled by one worker won't invalidate the kitchen "
+                "caches of the others. Use a shared backend such as the "
+                "file-based, database or Redis cache."
+            ),
+            obj=backend,
+            id="kitchen.W001",
+        )
+    ]
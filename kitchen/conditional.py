@@ -0,0 +1,118 @@
+"""
+Conditional GET support for the kitchen pages.
+
+A page's validators are computed from a few cache lookups, plus an
+aggregate over the shown rows for detail pages, so a client revalidating
+a page it already has gets a ``304 Not Modified`` without the page's
+queries or templates ever running.
+"""
+import hashlib
+from datetime import datetime, timezone
+
+from asgiref.sync import sync_to_async
+from django.db.models import Aggregate, Count, Max, QuerySet
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_generation
+
+
+class ConditionalGetMixin:
+    """
+    Answers GET requests with ``304 Not Modified`` while the client's copy
+    of the page is still fresh.
+
+    Freshness comes from the generations named in
+    ``freshness_generations``, which model signals bump on every change,
+    and, for pages that return rows from ``get_freshness_queryset()``,
+    from the latest ``updated_at`` and the number of those rows and the
+    extra aggregates of ``get_freshness_aggregates()``. Both are shared by
+    every worker: the aggregates are read from the database and the
+    generations from the shared default cache. List pages rely on the
+    generations alone, so revalidating them costs no query over the table.
+
+    The ETag also covers the path and query string and the user, as pages
+    embed per-user bits like the assign button. Responses vary on
+    ``Cookie``, which holds the CSRF token the page's forms derive from.
+
+    ``get()`` is async and calls the view's async ``get()`` from
+    ``kitchen.async_views`` when the page has to be built.
+    """
+    freshness_generations = ("cook",)
+
+    def get_freshness_queryset(self) -> QuerySet | None:
+        """
+        Returns the rows the page shows, when they can be found without
+        scanning a table, or ``None`` to rely on the generations alone.
+        """
+        return None
+
+    def get_freshness_aggregates(self) -> dict[str, Aggregate]:
+        """
+        Returns extra aggregates over ``get_freshness_queryset()`` that
+        change whenever rows the page shows change.
+        """
+        return {}
+
+    async def aget_validators(self) -> tuple[str, datetime | None]:
+        """
+        Returns the ETag and the Last-Modified time of the page.
+        """
+        queryset = self.get_freshness_queryset()
+        freshness = {}
+        if queryset is not None:
+            freshness = await queryset.order_by().aaggregate(
+                last_updated=Max("updated_at"),
+                rows=Count("pk"),
+                **self.get_freshness_aggregates()
+            )
+        generations = await sync_to_async(self.get_generations)()
+        fingerprint = repr((
+            sorted(freshness.items()),
+            generations,
+            self.request.get_full_path(),
+            self.request.user.pk,
+        ))
+        etag = quote_etag(hashlib.sha256(fingerprint.encode()).hexdigest())
+
+        last_modified = max(
+            [
+                datetime.fromtimestamp(generation / 10 ** 9, timezone.utc)
+                for generation in generations
+            ] + [
+                freshness.get("last_updated")
+                or datetime.fromtimestamp(0, timezone.utc)
+            ]
+        )
+        return etag, last_modified
+
+    def get_generations(self) -> list[int]:
+        return [get_generation(name) for name in self.freshness_generations]
+
+    async def get(
+        self,
+        request: HttpRequest,
+        *args,
+        **kwargs
+    ) -> HttpResponse:
+        etag, last_modified = await self.aget_validators()
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()),
+        )
+        if response is None:
+            response = await super().get(request, *args, **kwargs)
+
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(
+            last_modified.timestamp()
+        )
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Cookie",))
+        return response
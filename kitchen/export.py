@@ -0,0 +1,151 @@
+"""
+Streaming export of the whole menu.
+
+Dishes are read in ``batch_size`` chunks with ``iterator()``, and every
+chunk gets its dish type joined and its ingredients and cooks prefetched
+in one query each, so memory use depends on the batch size only, never on
+the number of dishes. The ``a``-prefixed functions do the same with the
+async ORM, for responses served under ASGI.
+"""
+import csv
+import json
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch, QuerySet
+
+from .models import Dish, Ingredient
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+EXPORT_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "dish_type",
+    "ingredients",
+    "cooks",
+    "created_at",
+    "updated_at",
+)
+LIST_SEPARATOR = "|"
+
+
+def export_queryset() -> QuerySet[Dish]:
+    """
+    Returns the dishes to export, in id order, with their dish type joined
+    and their ingredients and cooks prefetched.
+    """
+    return (
+        Dish.objects.select_related("dish_type")
+        .prefetch_related(
+            Prefetch(
+                "ingredients",
+                queryset=Ingredient.objects.only("id", "name")
+            ),
+            Prefetch(
+                "cooks",
+                queryset=get_user_model().objects.only("id", "username")
+            ),
+        )
+        .order_by("pk")
+    )
+
+
+def dish_row(dish: Dish) -> dict[str, Any]:
+    return {
+        "id": dish.pk,
+        "name": dish.name,
+        "description": dish.description,
+        "price": dish.price,
+        "dish_type": dish.dish_type.name,
+        "ingredients": [
+            ingredient.name for ingredient in dish.ingredients.all()
+        ],
+        "cooks": [cook.username for cook in dish.cooks.all()],
+        "created_at": dish.created_at,
+        "updated_at": dish.updated_at,
+    }
+
+
+def export_rows(batch_size: int = 1000) -> Iterator[dict[str, Any]]:
+    """
+    Yields every dish as a dictionary of ``EXPORT_FIELDS``, in id order.
+    """
+    for dish in export_queryset().iterator(chunk_size=batch_size):
+        yield dish_row(dish)
+
+
+async def aexport_rows(
+    batch_size: int = 1000
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Async version of ``export_rows()``.
+    """
+    async for dish in export_queryset().aiterator(chunk_size=batch_size):
+        yield dish_row(dish)
+
+
+class _LineBuffer:
+    """
+    A file-like object handing back what ``csv.writer`` writes to it.
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def line_format(
+    export_format: str
+) -> tuple[list[str], Callable[[dict[str, Any]], str]]:
+    """
+    Returns the header lines of ``export_format`` and the function turning
+    a row into a line. CSV cells of lists join their items with
+    ``LIST_SEPARATOR``.
+    """
+    if export_format == "jsonl":
+        return [], lambda row: json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+    writer = csv.writer(_LineBuffer())
+    return [writer.writerow(EXPORT_FIELDS)], lambda row: writer.writerow([
+        LIST_SEPARATOR.join(value) if isinstance(value, list) else value
+        for value in row.values()
+    ])
+
+
+def export_lines(
+    export_format: str,
+    batch_size: int = 1000
+) -> Iterator[str]:
+    """
+    Yields the menu as lines of CSV, header first, or of JSON objects.
+
+    Parameters:
+        export_format (str): One of ``EXPORT_FORMATS``.
+        batch_size (int): Number of dishes read from the database at a time.
+    """
+    header, format_row = line_format(export_format)
+    yield from header
+    for row in export_rows(batch_size):
+        yield format_row(row)
+
+
+async def aexport_lines(
+    export_format: str,
+    batch_size: int = 1000
+) -> AsyncIterator[str]:
+    """
+    Async version of ``export_lines()``, which ``StreamingHttpResponse``
+    streams from the event loop under ASGI instead of reading it whole
+    into memory first.
+    """
+    header, format_row = line_format(export_format)
+    for line in header:
+        yield line
+    async for row in aexport_rows(batch_size):
+        yield format_row(row)
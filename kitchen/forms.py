@@ -117,3 +117,16 @@ class IngredientSearchForm(forms.Form):
             }
         )
     )
+
+
+class KitchenSearchForm(forms.Form):
+    query = forms.CharField(
+        max_length=255,
+        required=False,
+        label=False,
+        widget=forms.TextInput(
+            attrs={
+                "placeholder": "Search dishes, cooks, ingredients..."
+            }
+        )
+    )
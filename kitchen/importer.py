@@ -0,0 +1,245 @@
+"""
+Bulk import of dishes, dish types, ingredients and cooks.
+
+Reads the CSV or JSON lines layout written by ``kitchen.export``, so an
+export can be loaded back. Only ``name``, ``price`` and ``dish_type`` are
+required; ``ingredients`` and ``cooks`` hold names and usernames, as lists
+in JSON or joined with ``|`` in CSV.
+
+Rows are imported in batches, each in its own transaction, with a fixed
+number of queries per batch: dish types, ingredients and cooks are matched
+by name in one query each and the missing ones created with
+``bulk_create``, then the dishes and their through rows are bulk inserted.
+Bulk inserts send no model signals, so the search indexes are rebuilt and
+the cache generations bumped once the import is over.
+"""
+import csv
+import json
+from collections.abc import Callable, Iterable, Iterator
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Any, TextIO
+
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
+
+from .cache import bump_generation
+from .export import LIST_SEPARATOR
+from .models import Dish, DishType, Ingredient, allocate_slug
+from .search import get_search_backend, searchable_fields
+
+
+class InvalidRow(ValueError):
+    pass
+
+
+def read_rows(source: TextIO, import_format: str) -> Iterator[dict]:
+    """
+    Yields the rows of ``source`` as dictionaries, one line at a time.
+    JSON lines holding anything but an object are rejected here, before
+    they reach the import.
+    """
+    if import_format == "csv":
+        yield from csv.DictReader(source)
+        return
+    for number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            raise InvalidRow(f"Line {number} is not valid JSON.")
+        if not isinstance(row, dict):
+            raise InvalidRow(f"Line {number} is not a JSON object.")
+        yield row
+
+
+def _names(value: Any) -> list[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(LIST_SEPARATOR)
+    return [name.strip() for name in value if name.strip()]
+
+
+class KitchenImporter:
+    """
+    Imports rows in ``batch_size`` batches, remembering the ids of the dish
+    types, ingredients and cooks it already matched or created.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 1000,
+        progress: Callable[[int], None] | None = None,
+    ) -> None:
+        self.batch_size = batch_size
+        self.progress = progress
+        self.dish_type_ids = {}
+        self.ingredient_ids = {}
+        self.cook_ids = {}
+        self.taken_slugs = None
+        self.dishes_created = 0
+
+    def run(self, rows: Iterable[dict], first_line: int = 1) -> int:
+        """
+        Imports every row and returns the number of dishes created.
+        Invalid rows are reported by line, counted from ``first_line``,
+        which is 2 for a CSV file as its header takes the first line.
+        """
+        rows = iter(rows)
+        line = first_line
+        while batch := list(islice(rows, self.batch_size)):
+            self.import_batch(batch, first_line=line)
+            line += len(batch)
+            if self.progress:
+                self.progress(self.dishes_created)
+        self.finish()
+        return self.dishes_created
+
+    def import_batch(self, batch: list[dict], first_line: int = 1) -> None:
+        parsed = [
+            self.parse_row(row, line)
+            for line, row in enumerate(batch, start=first_line)
+        ]
+        with transaction.atomic():
+            self.dish_type_ids.update(self.upsert_by_name(
+                DishType,
+                "name",
+                {row["dish_type"] for row in parsed},
+                self.dish_type_ids,
+            ))
+            self.ingredient_ids.update(self.upsert_by_name(
+                Ingredient,
+                "name",
+                {name for row in parsed for name in row["ingredients"]},
+                self.ingredient_ids,
+            ))
+            self.cook_ids.update(self.upsert_cooks(
+                {name for row in parsed for name in row["cooks"]}
+            ))
+
+            dishes = Dish.objects.bulk_create(
+                Dish(
+                    name=row["name"],
+                    description=row["description"],
+                    price=row["price"],
+                    dish_type_id=self.dish_type_ids[row["dish_type"]],
+                    image=row["image"],
+                )
+                for row in parsed
+            )
+            Dish.ingredients.through.objects.bulk_create(
+                [
+                    Dish.ingredients.through(
+                        dish_id=dish.pk,
+                        ingredient_id=self.ingredient_ids[name],
+                    )
+                    for dish, row in zip(dishes, parsed)
+                    for name in row["ingredients"]
+                ],
+                ignore_conflicts=True,
+            )
+            Dish.cooks.through.objects.bulk_create(
+                [
+                    Dish.cooks.through(
+                        dish_id=dish.pk,
+                        cook_id=self.cook_ids[username],
+                    )
+                    for dish, row in zip(dishes, parsed)
+                    for username in row["cooks"]
+                ],
+                ignore_conflicts=True,
+            )
+        self.dishes_created += len(dishes)
+
+    @staticmethod
+    def parse_row(row: dict, line: int) -> dict[str, Any]:
+        name = (row.get("name") or "").strip()
+        dish_type = (row.get("dish_type") or "").strip()
+        if not name or not dish_type:
+            raise InvalidRow(f"Row {line}: name and dish_type are required.")
+        try:
+            price = Decimal(str(row.get("price"))).quantize(Decimal("0.01"))
+        except InvalidOperation:
+            raise InvalidRow(
+                f"Row {line}: invalid price {row.get('price')!r}."
+            )
+        return {
+            "name": name,
+            "description": row.get("description") or "",
+            "price": price,
+            "dish_type": dish_type,
+            "image": row.get("image") or "",
+            "ingredients": _names(row.get("ingredients")),
+            "cooks": _names(row.get("cooks")),
+        }
+
+    @staticmethod
+    def upsert_by_name(
+        model: type[models.Model],
+        field: str,
+        names: set[str],
+        known: dict[str, int],
+    ) -> dict[str, int]:
+        """
+        Returns the ids of the ``model`` rows named ``names``, creating the
+        missing ones. Names are not unique, so the oldest row of a name
+        wins. Names already in ``known`` cost nothing.
+        """
+        missing = names - known.keys()
+        if not missing:
+            return {}
+        ids = dict(
+            model.objects.filter(**{f"{field}__in": missing})
+            .order_by("-pk")
+            .values_list(field, "pk")
+        )
+        created = model.objects.bulk_create(
+            model(**{field: name}) for name in sorted(missing - ids.keys())
+        )
+        ids.update((getattr(obj, field), obj.pk) for obj in created)
+        return ids
+
+    def upsert_cooks(self, usernames: set[str]) -> dict[str, int]:
+        """
+        Returns the ids of the cooks with ``usernames``, creating the
+        missing ones without a usable password and with unique slugs
+        allocated in memory from the slugs already taken.
+        """
+        cook_model = get_user_model()
+        missing = usernames - self.cook_ids.keys()
+        if not missing:
+            return {}
+        ids = dict(
+            cook_model.objects.filter(username__in=missing)
+            .values_list("username", "pk")
+        )
+        new_cooks = [
+            cook_model(username=username)
+            for username in sorted(missing - ids.keys())
+        ]
+        if new_cooks:
+            if self.taken_slugs is None:
+                self.taken_slugs = set(
+                    cook_model.objects.values_list("slug", flat=True)
+                )
+            for cook in new_cooks:
+                cook.set_unusable_password()
+                cook.slug = allocate_slug(cook.base_slug(), self.taken_slugs)
+                self.taken_slugs.add(cook.slug)
+            created = cook_model.objects.bulk_create(new_cooks)
+            ids.update((cook.username, cook.pk) for cook in created)
+        return ids
+
+    def finish(self) -> None:
+        """
+        Brings what bulk inserts bypassed up to date: the search indexes
+        and the cache generations.
+        """
+        backend = get_search_backend()
+        for model in searchable_fields():
+            backend.rebuild(model)
+        for model in (Dish, DishType, Ingredient, get_user_model(),
+                      Dish.cooks.through):
+            bump_generation(model._meta.model_name)
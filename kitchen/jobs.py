@@ -0,0 +1,254 @@
+"""
+A local queue for image post-processing, backed by the ``ImageJob`` table.
+
+Saving a new image only records a job. Once the saving transaction
+commits, the job is handed to the ``KITCHEN_IMAGE_JOBS`` runner:
+
+* ``"thread"`` wakes a daemon thread of the current process, so the work
+  happens next to, not inside, the request that uploaded the image.
+* ``"sync"`` runs the job right away, which is mostly useful in tests.
+* ``"manual"`` leaves it to the ``run_image_jobs`` command.
+
+Failed jobs are retried with an exponential backoff up to ``MAX_ATTEMPTS``
+times, and their last error is kept for the admin. A job still running
+after ``RUNNING_TIMEOUT`` is taken to belong to a worker that died, and is
+claimed again like a failed one.
+"""
+import logging
+import threading
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, models, transaction
+from django.db.models import F, Q
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
+
+from .cache import IMAGE_GENERATION, bump_generation
+from .models import ImageJob
+from .thumbnails import generate_thumbnails, has_thumbnails
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+RETRY_DELAY = timedelta(seconds=30)
+RUNNING_TIMEOUT = timedelta(minutes=10)
+PENDING_TIMEOUT = 60 * 60
+
+
+def _pending_key(file_name: str) -> str:
+    return f"kitchen:image-pending:{file_name}"
+
+
+def is_pending(field_file: FieldFile) -> bool:
+    """
+    Tells whether the derived files of ``field_file`` are still being
+    produced. Answered from the cache, so it costs no query.
+    """
+    if not field_file:
+        return False
+    return cache.get(_pending_key(field_file.name), False)
+
+
+def enqueue_image_job(
+    instance: models.Model,
+    field_name: str
+) -> ImageJob | None:
+    """
+    Queues the post-processing of the image stored in ``field_name`` of
+    ``instance``, unless it is already queued or running or, as happens
+    when the same photo is uploaded again, already done.
+    """
+    field_file = getattr(instance, field_name)
+    if not field_file or has_thumbnails(field_file):
+        return None
+    job_fields = {
+        "model_label": instance._meta.label_lower,
+        "object_id": instance.pk,
+        "field_name": field_name,
+        "file_name": field_file.name,
+    }
+    job = ImageJob.objects.filter(
+        status__in=(ImageJob.Status.PENDING, ImageJob.Status.RUNNING),
+        **job_fields
+    ).first()
+    created = job is None
+    if created:
+        job = ImageJob.objects.create(**job_fields)
+    transaction.on_commit(
+        lambda: _mark_pending(field_file.name, dispatch=created)
+    )
+    return job
+
+
+def _mark_pending(file_name: str, dispatch: bool) -> None:
+    """
+    Flags the image as pending once the job is committed, then hands a new
+    job to the runner. A rolled back save leaves no flag behind.
+    """
+    cache.set(_pending_key(file_name), True, PENDING_TIMEOUT)
+    if dispatch:
+        dispatch_jobs()
+
+
+def dispatch_jobs() -> None:
+    runner = getattr(settings, "KITCHEN_IMAGE_JOBS", "thread")
+    if runner == "thread":
+        worker.wake()
+    elif runner == "sync":
+        run_pending_jobs()
+
+
+def _claimable_jobs() -> Q:
+    """
+    Matches the due pending jobs, and the running ones whose worker hasn't
+    finished them within ``RUNNING_TIMEOUT``. Claiming a job sets its
+    ``updated_at``, so it tells when the job started running.
+    """
+    now = timezone.now()
+    return Q(
+        status=ImageJob.Status.PENDING,
+        run_after__lte=now,
+    ) | Q(
+        status=ImageJob.Status.RUNNING,
+        updated_at__lte=now - RUNNING_TIMEOUT,
+    )
+
+
+def fail_abandoned_jobs() -> int:
+    """
+    Fails the stale running jobs that used up their attempts, so an image
+    that keeps killing its worker isn't claimed forever.
+
+    Returns:
+        int: The number of jobs failed.
+    """
+    failed = ImageJob.objects.filter(
+        status=ImageJob.Status.RUNNING,
+        updated_at__lte=timezone.now() - RUNNING_TIMEOUT,
+        attempts__gte=MAX_ATTEMPTS,
+    ).update(
+        status=ImageJob.Status.FAILED,
+        last_error="The worker running the job stopped.",
+        updated_at=timezone.now(),
+    )
+    if failed:
+        bump_generation(IMAGE_GENERATION)
+        logger.error("%s abandoned image jobs failed.", failed)
+    return failed
+
+
+def claim_next_job() -> ImageJob | None:
+    """
+    Marks the next due job as running and returns it. The status check in
+    the ``UPDATE`` makes sure concurrent workers never claim the same job.
+    """
+    fail_abandoned_jobs()
+    due_ids = ImageJob.objects.filter(
+        _claimable_jobs()
+    ).values_list("pk", flat=True)[:10]
+    for job_id in due_ids:
+        claimed = ImageJob.objects.filter(
+            _claimable_jobs(),
+            pk=job_id,
+        ).update(
+            status=ImageJob.Status.RUNNING,
+            attempts=F("attempts") + 1,
+            updated_at=timezone.now(),
+        )
+        if claimed:
+            return ImageJob.objects.get(pk=job_id)
+    return None
+
+
+def process_job(job: ImageJob) -> None:
+    """
+    Generates the thumbnails of the job's image, recording the outcome on
+    the job. Jobs whose row is gone, or whose image was replaced since,
+    are done without any work. Once a job is over, for better or worse,
+    pages stop showing the placeholder for its image.
+    """
+    model = apps.get_model(job.model_label)
+    instance = model._default_manager.filter(pk=job.object_id).first()
+    field_file = getattr(instance, job.field_name, None)
+
+    try:
+        if field_file and field_file.name == job.file_name:
+            generate_thumbnails(field_file)
+    except Exception as error:
+        job.last_error = f"{type(error).__name__}: {error}"
+        if job.attempts >= MAX_ATTEMPTS:
+            job.status = ImageJob.Status.FAILED
+            cache.delete(_pending_key(job.file_name))
+            bump_generation(IMAGE_GENERATION)
+            logger.error("Image job %s failed: %s", job.pk, job.last_error)
+        else:
+            job.status = ImageJob.Status.PENDING
+            job.run_after = timezone.now() + RETRY_DELAY * 2 ** (
+                job.attempts - 1
+            )
+    else:
+        job.status = ImageJob.Status.DONE
+        job.last_error = ""
+        cache.delete(_pending_key(job.file_name))
+    job.save(
+        update_fields=["status", "last_error", "run_after", "updated_at"]
+    )
+
+
+def run_pending_jobs(limit: int | None = None) -> int:
+    """
+    Runs due jobs one after another until none is left, or ``limit`` ran.
+
+    Returns:
+        int: The number of jobs run.
+    """
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        process_job(job)
+        processed += 1
+    return processed
+
+
+class ImageWorker:
+    """
+    A daemon thread running the queued jobs of the current process. It
+    sleeps until woken by a new job, and polls every ``poll_interval``
+    seconds for retries that became due.
+    """
+    poll_interval = 30
+
+    def __init__(self) -> None:
+        self._wake_up = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def wake(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="kitchen-image-worker",
+                    daemon=True,
+                )
+                self._thread.start()
+        self._wake_up.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake_up.wait(timeout=self.poll_interval)
+            self._wake_up.clear()
+            try:
+                run_pending_jobs()
+            except Exception:
+                logger.exception("The image worker failed to run jobs.")
+            finally:
+                connections.close_all()
+
+
+worker = ImageWorker()
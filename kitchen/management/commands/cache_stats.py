@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from kitchen.cache import get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports the hits and misses of the kitchen caches. The counters "
+        "are kept in the configured cache, so they cover every process "
+        "only with a shared backend such as the file-based cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after reporting them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_cache_stats()
+        if not stats:
+            self.stdout.write("No cache lookups recorded.")
+        for name, counters in stats.items():
+            hits, misses = counters["hits"], counters["misses"]
+            lookups = hits + misses
+            hit_rate = hits / lookups * 100 if lookups else 0
+            self.stdout.write(
+                f"{name}: {hits} hits, {misses} misses "
+                f"({hit_rate:.1f}% hit rate)"
+            )
+        if options["reset"]:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
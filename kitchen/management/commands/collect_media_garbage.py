@@ -0,0 +1,90 @@
+import posixpath
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from kitchen.models import ImageJob
+from kitchen.thumbnails import (
+    THUMBNAIL_FORMATS,
+    THUMBNAIL_WIDTHS,
+    image_fields,
+    thumbnail_name,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes uploaded images that no dish or cook references anymore, "
+        "together with their thumbnails."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be deleted.",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=3600,
+            help=(
+                "Keep files modified less than this many seconds ago, as "
+                "their row may not be committed yet."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        directories, referenced = set(), set()
+        for model, field in image_fields().items():
+            directories.add(str(model._meta.get_field(field).upload_to))
+            referenced.update(
+                model.objects.exclude(**{field: ""})
+                .values_list(field, flat=True)
+                .iterator()
+            )
+        referenced.update(
+            ImageJob.objects.exclude(status=ImageJob.Status.DONE)
+            .values_list("file_name", flat=True)
+        )
+        cutoff = timezone.now() - timedelta(seconds=options["min_age"])
+        candidates = []
+        for directory in sorted(directories):
+            if not default_storage.exists(directory):
+                continue
+            for filename in default_storage.listdir(directory)[1]:
+                name = posixpath.join(directory, filename)
+                if filename.startswith("."):
+                    continue
+                if default_storage.get_modified_time(name) > cutoff:
+                    # A recent upload, or an old one uploaded again, whose
+                    # row may not be committed yet. Its thumbnails are kept
+                    # with it.
+                    referenced.add(name)
+                else:
+                    candidates.append(name)
+
+        keep = referenced | {
+            thumbnail_name(name, width, extension)
+            for name in referenced
+            for width in THUMBNAIL_WIDTHS
+            for extension in THUMBNAIL_FORMATS
+        }
+        deleted = freed = 0
+        for name in candidates:
+            if name in keep:
+                continue
+            deleted += 1
+            freed += default_storage.size(name)
+            if not options["dry_run"]:
+                default_storage.delete(name)
+
+        action = "would be deleted" if options["dry_run"] else "deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{deleted} unreferenced files {action} "
+                f"({freed / 1024 / 1024:.1f} MB)."
+            )
+        )
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from kitchen.export import EXPORT_FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams every dish with its dish type, ingredients and cooks as "
+        "CSV or JSON lines."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=EXPORT_FORMATS,
+            default="csv",
+            help="Output format.",
+        )
+        parser.add_argument(
+            "--output",
+            help="File to write to. Defaults to standard output.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of dishes read from the database at a time.",
+        )
+
+    def handle(self, *args, **options):
+        lines = export_lines(options["format"], options["batch_size"])
+        if not options["output"]:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+
+        header_lines = 1 if options["format"] == "csv" else 0
+        written = 0
+        with open(
+            options["output"], "w", encoding="utf-8", newline=""
+        ) as output:
+            for line in lines:
+                output.write(line)
+                written += 1
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{written - header_lines} dishes exported to "
+                f"{options['output']}."
+            )
+        )
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+
+from kitchen.thumbnails import (
+    ensure_thumbnails,
+    generate_thumbnails,
+    image_fields,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates the missing thumbnails of dish images and profile "
+        "pictures, e.g. for images uploaded before thumbnails existed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate thumbnails that already exist.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows fetched from the database at a time.",
+        )
+
+    def handle(self, *args, **options):
+        checked = generated = 0
+        for model, field in image_fields().items():
+            rows = (
+                model.objects.exclude(**{field: ""})
+                .only("pk", field)
+                .iterator(chunk_size=options["batch_size"])
+            )
+            for row in rows:
+                checked += 1
+                field_file = getattr(row, field)
+                if options["force"]:
+                    try:
+                        generate_thumbnails(field_file)
+                    except OSError as error:
+                        self.stderr.write(f"{field_file.name}: {error}")
+                        continue
+                    generated += 1
+                elif ensure_thumbnails(field_file):
+                    generated += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{checked} images checked, "
+                f"thumbnails generated for {generated}."
+            )
+        )
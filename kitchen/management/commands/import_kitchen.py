@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from kitchen.export import EXPORT_FORMATS
+from kitchen.importer import InvalidRow, KitchenImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports dishes with their dish types, ingredients and cooks from a "
+        "CSV or JSON lines file in the layout written by export_menu."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument(
+            "--format",
+            choices=EXPORT_FORMATS,
+            help="Input format. Defaults to the file extension.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of dishes inserted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        import_format = options["format"] or path.suffix.lstrip(".")
+        if import_format not in EXPORT_FORMATS:
+            raise CommandError(
+                f"Can't tell the format of {path.name}, use --format."
+            )
+
+        importer = KitchenImporter(
+            batch_size=options["batch_size"],
+            progress=lambda count: self.stdout.write(
+                f"{count} dishes imported..."
+            ),
+        )
+        try:
+            with open(path, encoding="utf-8", newline="") as source:
+                created = importer.run(
+                    read_rows(source, import_format),
+                    first_line=2 if import_format == "csv" else 1,
+                )
+        except OSError as error:
+            raise CommandError(str(error))
+        except InvalidRow as error:
+            raise CommandError(
+                f"{error} Batches before it were imported."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{created} dishes imported from {path.name}."
+            )
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from kitchen.search import get_search_backend, searchable_fields
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the search index of dishes, dish types, ingredients and "
+        "cooks from their tables, e.g. after bulk changes that bypassed "
+        "model signals."
+    )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        for model in searchable_fields():
+            backend.rebuild(model)
+            self.stdout.write(
+                f"Rebuilt {model._meta.verbose_name_plural} search index."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Done with {type(backend).__name__}.")
+        )
@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from kitchen.models import allocate_slug
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfills missing cook slugs and regenerates the ones that no "
+        "longer match the cook's name, updating cooks in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of cooks read and updated per batch.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many slugs would change without saving them.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Walks the cooks in primary key order and collects those whose slug
+        is empty or doesn't derive from their current name. Their new slugs
+        are allocated in memory against every slug already in the table, so
+        the whole run costs one query for the taken slugs plus one read and
+        one bulk update per batch, instead of a ``save()`` per cook.
+
+        Cooks whose slug is still valid keep it, so existing URLs survive.
+        """
+        batch_size = options["batch_size"]
+        cook_model = get_user_model()
+        taken = set(cook_model.objects.values_list("slug", flat=True))
+
+        cooks = cook_model.objects.only(
+            "pk", "username", "first_name", "last_name", "slug"
+        ).order_by("pk")
+
+        checked = updated = 0
+        batch = []
+        for cook in cooks.iterator(chunk_size=batch_size):
+            checked += 1
+            if self._slug_is_current(cook):
+                continue
+
+            cook.slug = allocate_slug(cook.base_slug(), taken)
+            taken.add(cook.slug)
+            batch.append(cook)
+            if len(batch) >= batch_size:
+                updated += self._flush(batch, options["dry_run"])
+                batch = []
+                self.stdout.write(
+                    f"{checked} cooks checked, {updated} updated"
+                )
+
+        updated += self._flush(batch, options["dry_run"])
+
+        verb = "would be updated" if options["dry_run"] else "updated"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{checked} cooks checked, {updated} slugs {verb}."
+            )
+        )
+
+    @staticmethod
+    def _slug_is_current(cook) -> bool:
+        base_slug = cook.base_slug()
+        if cook.slug == base_slug:
+            return True
+        prefix, _, suffix = cook.slug.rpartition("-")
+        return prefix == base_slug and suffix.isdigit()
+
+    @staticmethod
+    def _flush(batch: list, dry_run: bool) -> int:
+        if batch and not dry_run:
+            with transaction.atomic():
+                get_user_model().objects.bulk_update(batch, ["slug"])
+        return len(batch)
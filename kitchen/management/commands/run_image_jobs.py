@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from kitchen.jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the queued image jobs, for deployments where "
+        "KITCHEN_IMAGE_JOBS is \"manual\" or to drain the queue by hand."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running and poll for new jobs.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds between polls with --watch.",
+        )
+
+    def handle(self, *args, **options):
+        processed = run_pending_jobs()
+        while options["watch"]:
+            time.sleep(options["interval"])
+            processed += run_pending_jobs()
+        self.stdout.write(self.style.SUCCESS(f"{processed} jobs run."))
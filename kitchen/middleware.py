@@ -1,10 +1,143 @@
+import json
+import logging
+import random
+import time
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
 from django.utils.deprecation import MiddlewareMixin
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .profiling import QueryTimer, current_query_timer, current_request
+
+
+def default_excluded_paths() -> tuple[str, ...]:
+    """
+    Builds the path prefixes that never update the previous URL: static and
+    media files, the admin and health checks.
+    """
+    prefixes = [settings.STATIC_URL, settings.MEDIA_URL, "/admin/", "/health"]
+    return tuple(
+        prefix if prefix.startswith("/") else f"/{prefix}"
+        for prefix in prefixes
+        if prefix
+    )
+
+
+async def iterate_in_thread(iterator):
+    """
+    Yields the items of the sync ``iterator``, each read in a worker thread
+    so that blocking reads don't hold up the event loop.
+    """
+    read = sync_to_async(next, thread_sensitive=False)
+    while (item := await read(iterator, None)) is not None:
+        yield item
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    ``WhiteNoiseMiddleware`` that also runs on the event loop, so that under
+    ASGI the requests passing through it to Django aren't switched to a
+    thread and back.
+
+    Static files are looked up in memory as WhiteNoise does. Opening one
+    and reading its chunks happen in a worker thread, and the chunks are
+    streamed from an async iterator, which Django sends as they come
+    instead of reading the whole file into memory first.
+    """
+    sync_capable = True
+    async_capable = True
+    # Every chunk costs a thread switch, so chunks are larger than the
+    # 4 KiB ``FileResponse`` reads by default.
+    block_size = 64 * 1024
+
+    def __init__(self, get_response, *args, **kwargs) -> None:
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(
+                request.path_info
+            )
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is None:
+            return await self.get_response(request)
+
+        response = await sync_to_async(self.serve, thread_sensitive=False)(
+            static_file,
+            request
+        )
+        response.block_size = self.block_size
+        response.streaming_content = iterate_in_thread(
+            iter(response.streaming_content)
+        )
+        return response
 
 
 class StorePreviousURLMiddleware(MiddlewareMixin):
-    def process_request(self, request):
+    """
+    Remembers the referer of the latest page request as the previous URL
+    and exposes it as ``request.previous_url``.
+
+    The value is written only when it actually changes, so reloads and
+    repeated requests from the same page don't mark the session modified
+    and don't cost a ``django_session`` write. Requests to the
+    ``PREVIOUS_URL_EXCLUDED_PATHS`` prefixes never update it; they get the
+    stored value as ``request.previous_url``. With
+    ``PREVIOUS_URL_STORAGE = "cookie"`` the value lives in a signed cookie
+    instead of the session.
+
+    Under ASGI the request is handled on the event loop. Only reading the
+    session, which Django can't do asynchronously yet, is moved to a
+    thread; cookie storage never leaves the loop.
+    """
+    session_key = "previous_url"
+    cookie_name = "previous_url"
+    cookie_salt = "kitchen.middleware.previous_url"
+
+    def __init__(self, get_response) -> None:
+        super().__init__(get_response)
+        self.excluded_paths = tuple(
+            getattr(
+                settings,
+                "PREVIOUS_URL_EXCLUDED_PATHS",
+                default_excluded_paths()
+            )
+        )
+        self.use_cookie = (
+            getattr(settings, "PREVIOUS_URL_STORAGE", "session") == "cookie"
+        )
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Handles the request without the ``sync_to_async`` round trips
+        ``MiddlewareMixin`` makes around both hooks.
+        """
+        if self.use_cookie:
+            self.process_request(request)
+        else:
+            await sync_to_async(self.process_request)(request)
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_request(self, request: HttpRequest) -> None:
         """
-        Stores the previous URL in the session.
+        Stores the previous URL in the session, or marks the cookie for
+        update, when the referer differs from the stored value. Excluded
+        paths only read the stored value.
 
         Parameters:
             request (HttpRequest): The current HTTP request.
@@ -12,4 +145,193 @@ class StorePreviousURLMiddleware(MiddlewareMixin):
         Returns:
             None
         """
-        request.session["previous_url"] = request.META.get("HTTP_REFERER")
+        if self.use_cookie:
+            stored_url = request.get_signed_cookie(
+                self.cookie_name,
+                default=None,
+                salt=self.cookie_salt
+            )
+        else:
+            stored_url = request.session.get(self.session_key)
+        if request.path.startswith(self.excluded_paths):
+            request.previous_url = stored_url
+            return
+
+        referer = request.META.get("HTTP_REFERER")
+        if referer != stored_url:
+            if self.use_cookie:
+                request._previous_url_changed = True
+            else:
+                request.session[self.session_key] = referer
+        request.previous_url = referer
+
+    def process_response(
+        self,
+        request: HttpRequest,
+        response: HttpResponse
+    ) -> HttpResponse:
+        """
+        Writes the signed cookie when the previous URL changed during
+        this request in cookie mode.
+
+        Parameters:
+            request (HttpRequest): The current HTTP request.
+            response (HttpResponse): The response being returned.
+
+        Returns:
+            HttpResponse: The same response.
+        """
+        if not getattr(request, "_previous_url_changed", False):
+            return response
+
+        if request.previous_url is None:
+            response.delete_cookie(self.cookie_name, samesite="Lax")
+        else:
+            response.set_signed_cookie(
+                self.cookie_name,
+                request.previous_url,
+                salt=self.cookie_salt,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class PerformanceMiddleware:
+    """
+    Measures a sample of requests: the total time spent below this
+    middleware, the number and duration of database queries, and the time
+    spent rendering the template of a ``TemplateResponse``.
+
+    The measures are returned in a ``Server-Timing`` header, which browser
+    developer tools display, and logged as a JSON line to the
+    ``kitchen.performance`` logger, tagged with the resolved URL name.
+    ``KITCHEN_TIMING_SAMPLE_RATE`` is the share of requests measured; the
+    others only pay for a random draw.
+    """
+    sync_capable = True
+    async_capable = True
+    logger = logging.getLogger("kitchen.performance")
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.sample_rate = float(
+            getattr(settings, "KITCHEN_TIMING_SAMPLE_RATE", 1.0)
+        )
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.is_sampled():
+            return self.get_response(request)
+        timer = request._performance_timer = QueryTimer()
+        token = current_query_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_query_timer.reset(token)
+        return self.record(request, response, timer, started)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        if not self.is_sampled():
+            return await self.get_response(request)
+        timer = request._performance_timer = QueryTimer()
+        token = current_query_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_query_timer.reset(token)
+        return self.record(request, response, timer, started)
+
+    def is_sampled(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def process_template_response(
+        self,
+        request: HttpRequest,
+        response: HttpResponse
+    ) -> HttpResponse:
+        """
+        Times the rendering of a ``TemplateResponse``, which happens after
+        the view returns and the template response hooks ran.
+        """
+        if not hasattr(request, "_performance_timer"):
+            return response
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._performance_template_time = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def record(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        timer: QueryTimer,
+        started: float,
+    ) -> HttpResponse:
+        """
+        Adds the ``Server-Timing`` header to ``response`` and logs the
+        measures of the request, unless the logger would drop the line.
+        """
+        total = time.perf_counter() - started
+        template = getattr(request, "_performance_template_time", 0.0)
+        match = getattr(request, "resolver_match", None)
+        url_name = match.view_name if match else None
+
+        response.headers["Server-Timing"] = ", ".join((
+            f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries"',
+            f"view;dur={(total - template) * 1000:.1f}",
+            f"tpl;dur={template * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ))
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(json.dumps({
+                "url_name": url_name,
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "total_ms": round(total * 1000, 2),
+                "db_queries": timer.count,
+                "db_ms": round(timer.duration * 1000, 2),
+                "template_ms": round(template * 1000, 2),
+            }))
+        return response
+
+
+class QueryOriginMiddleware:
+    """
+    Makes the current request known to the query profiling in
+    ``kitchen.profiling``, so slow queries are reported with the path, view
+    and URL name that ran them.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            current_request.reset(token)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        token = current_request.set(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            current_request.reset(token)
@@ -0,0 +1,68 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+
+SEARCH_COLUMNS = (
+    ("kitchen_dish", "name"),
+    ("kitchen_dishtype", "name"),
+    ("kitchen_ingredient", "name"),
+    ("kitchen_cook", "username"),
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    quote_name = connection.ops.quote_name
+
+    if connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table, column in SEARCH_COLUMNS:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS "
+                f"{quote_name(f'{table}_{column}_trgm')} "
+                f"ON {quote_name(table)} USING gin "
+                f"((UPPER({quote_name(column)}::text)) gin_trgm_ops)"
+            )
+    elif connection.vendor == "sqlite":
+        for table, column in SEARCH_COLUMNS:
+            fts_table = quote_name(f"{table}_fts")
+            try:
+                schema_editor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} "
+                    "USING fts5(content, tokenize='trigram')"
+                )
+            except OperationalError:
+                # SQLite older than 3.34 has no trigram tokenizer, searches
+                # keep using icontains.
+                return
+            schema_editor.execute(
+                f"INSERT INTO {fts_table} (rowid, content) "
+                f"SELECT id, {quote_name(column)} FROM {quote_name(table)}"
+            )
+
+
+def drop_search_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    quote_name = connection.ops.quote_name
+
+    for table, column in SEARCH_COLUMNS:
+        if connection.vendor == "postgresql":
+            schema_editor.execute(
+                f"DROP INDEX IF EXISTS "
+                f"{quote_name(f'{table}_{column}_trgm')}"
+            )
+        elif connection.vendor == "sqlite":
+            schema_editor.execute(
+                f"DROP TABLE IF EXISTS {quote_name(f'{table}_fts')}"
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kitchen", "0001_initial_squashed_0009_alter_dish_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 5.0.7 on 2026-10-18 19:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kitchen', '0003_imagejob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dish',
+            index=models.Index(fields=['name', 'id'], name='kitchen_dish_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dish',
+            index=models.Index(fields=['-updated_at'], name='kitchen_dish_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dishtype',
+            index=models.Index(fields=['name', 'id'], name='kitchen_dishtype_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ingredient',
+            index=models.Index(fields=['name', 'id'], name='kitchen_ingredient_name_idx'),
+        ),
+        # The through tables already exist; these only declare the models
+        # Django used to create for them, so the operations below can
+        # change their indexes.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='DishCook',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('dish', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='kitchen.dish')),
+                        ('cook', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'db_table': 'kitchen_dish_cooks',
+                        'unique_together': {('dish', 'cook')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='dish',
+                    name='cooks',
+                    field=models.ManyToManyField(related_name='dishes', through='kitchen.DishCook', to=settings.AUTH_USER_MODEL),
+                ),
+                migrations.CreateModel(
+                    name='DishIngredient',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('dish', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='kitchen.dish')),
+                        ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='kitchen.ingredient')),
+                    ],
+                    options={
+                        'db_table': 'kitchen_dish_ingredients',
+                        'unique_together': {('dish', 'ingredient')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='dish',
+                    name='ingredients',
+                    field=models.ManyToManyField(related_name='dishes', through='kitchen.DishIngredient', to='kitchen.ingredient'),
+                ),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='dishcook',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='dishcook',
+            constraint=models.UniqueConstraint(fields=('dish', 'cook'), name='kitchen_dish_cooks_uniq'),
+        ),
+        migrations.AlterField(
+            model_name='dishcook',
+            name='dish',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='kitchen.dish'),
+        ),
+        migrations.AlterField(
+            model_name='dishcook',
+            name='cook',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='dishcook',
+            index=models.Index(fields=['cook', 'dish'], name='kitchen_dish_cooks_rev_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='dishingredient',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='dishingredient',
+            constraint=models.UniqueConstraint(fields=('dish', 'ingredient'), name='kitchen_dish_ingredients_uniq'),
+        ),
+        migrations.AlterField(
+            model_name='dishingredient',
+            name='dish',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='kitchen.dish'),
+        ),
+        migrations.AlterField(
+            model_name='dishingredient',
+            name='ingredient',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='kitchen.ingredient'),
+        ),
+        migrations.AddIndex(
+            model_name='dishingredient',
+            index=models.Index(fields=['ingredient', 'dish'], name='kitchen_dish_ingr_rev_idx'),
+        ),
+    ]
@@ -1,5 +1,9 @@
+import re
+from collections.abc import Collection
+
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
 from django.utils.text import slugify
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth import get_user_model
@@ -11,12 +15,49 @@ from django.core.validators import (
 )
 
 
+SLUG_SAVE_ATTEMPTS = 5
+
+
+def allocate_slug(base_slug: str, taken: Collection[str]) -> str:
+    """
+    Picks the first free slug out of ``base_slug``, ``base_slug-1``,
+    ``base_slug-2``... given the slugs that are already taken.
+
+    Parameters:
+        base_slug (str): The slug to start from.
+        taken (Collection[str]): Slugs that can't be used.
+
+    Returns:
+        str: The first slug that is not in ``taken``.
+    """
+    if base_slug not in taken:
+        return base_slug
+
+    suffix_pattern = re.compile(rf"^{re.escape(base_slug)}-(\d+)$")
+    used_suffixes = set()
+    for slug in taken:
+        match = suffix_pattern.match(slug)
+        if match:
+            used_suffixes.add(int(match.group(1)))
+
+    num = 1
+    while num in used_suffixes:
+        num += 1
+    return f"{base_slug}-{num}"
+
+
 class DishType(models.Model):
     name = models.CharField(max_length=128)
     description = models.TextField(blank=True, null=True)
 
     class Meta:
         ordering = ("name",)
+        indexes = [
+            models.Index(
+                fields=("name", "id"),
+                name="kitchen_dishtype_name_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -33,6 +74,8 @@ class Cook(AbstractUser):
     )
     slug = models.SlugField(unique=True, blank=True, db_index=True)
 
+    SLUG_SOURCE_FIELDS = ("first_name", "last_name")
+
     def full_name(self) -> str:
         return f"{self.first_name} {self.last_name}"
 
@@ -42,6 +85,15 @@ class Cook(AbstractUser):
     def __str__(self) -> str:
         return f"{self.username}: ({self.full_name()})"
 
+    def base_slug(self) -> str:
+        """
+        Builds the slug the user would get if it weren't taken yet: the
+        first and last name if both exist, otherwise the username.
+        """
+        if self.first_name and self.last_name:
+            return slugify(f"{self.first_name}-{self.last_name}")
+        return slugify(self.username) or "cook"
+
     def generate_unique_slug(self):
         """
         Generates a unique slug for the user. If the user has a first and last
@@ -49,21 +101,73 @@ class Cook(AbstractUser):
         the username. The slug will be made unique by appending a number to
         the end if the generated slug is already taken.
 
+        All the slugs sharing the base are read in a single query, so the
+        cost doesn't grow with the number of namesakes.
+
         Returns:
         str: The unique slug
         """
-        if self.first_name and self.last_name:
-            base_slug = slugify(f"{self.first_name}-{self.last_name}")
-        else:
-            base_slug = slugify(self.username)
+        base_slug = self.base_slug()
+        candidates = get_user_model().objects.filter(
+            slug__startswith=base_slug
+        )
+        if self.pk:
+            candidates = candidates.exclude(pk=self.pk)
+
+        return allocate_slug(
+            base_slug,
+            set(candidates.values_list("slug", flat=True))
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remembers the names the user was loaded with, so ``save()`` can tell
+        whether they changed without reading the row again.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded_names()
+        return instance
 
-        slug = base_slug
-        num = 1
-        while get_user_model().objects.filter(slug=slug).exists():
-            slug = f"{base_slug}-{num}"
-            num += 1
+    def refresh_from_db(self, using=None, fields=None):
+        if fields is not None:
+            fields = list(fields)
+        super().refresh_from_db(using, fields)
+        self._remember_loaded_names(fields)
 
-        return slug
+    def _remember_loaded_names(self, fields=None) -> None:
+        """
+        Snapshots the name fields that hold database values. A partial
+        refresh only replaces the fields it actually reloaded.
+        """
+        loaded_names = {} if fields is None else self.__dict__.get(
+            "_loaded_names", {}
+        )
+        deferred = self.get_deferred_fields()
+        for field in self.SLUG_SOURCE_FIELDS:
+            if field not in deferred and (fields is None or field in fields):
+                loaded_names[field] = getattr(self, field)
+        self._loaded_names = loaded_names
+
+    def _names_changed(self) -> bool:
+        """
+        Compares the current names with the ones remembered at load time.
+        Falls back to reading the row for instances that weren't loaded from
+        the database or were loaded without the name fields.
+        """
+        loaded_names = getattr(self, "_loaded_names", {})
+        if len(loaded_names) < len(self.SLUG_SOURCE_FIELDS):
+            existing_cook = get_user_model().objects.only(
+                *self.SLUG_SOURCE_FIELDS
+            ).get(pk=self.pk)
+            loaded_names = {
+                field: getattr(existing_cook, field)
+                for field in self.SLUG_SOURCE_FIELDS
+            }
+        return any(
+            getattr(self, field) != loaded_names[field]
+            for field in self.SLUG_SOURCE_FIELDS
+        )
 
     def save(self, *args, **kwargs) -> None:
         """
@@ -72,19 +176,47 @@ class Cook(AbstractUser):
         If the user is being created, the slug is generated from the first
         and last name if they exist.
         If the user is being updated and the first or last name changed,
-        the slug is regenerated.
+        the slug is regenerated. Saves limited by ``update_fields`` to
+        fields other than the names (like ``last_login`` on every login)
+        skip the check entirely.
         """
-        if self.pk:
-            existing_cook = get_user_model().objects.get(pk=self.pk)
-            if (
-                self.first_name != existing_cook.first_name
-                or self.last_name != existing_cook.last_name
-            ):
-                self.slug = self.generate_unique_slug()
+        update_fields = kwargs.get("update_fields")
+        if self._state.adding:
+            self._save_with_unique_slug(*args, **kwargs)
+        elif (
+            update_fields is not None
+            and not set(update_fields) & set(self.SLUG_SOURCE_FIELDS)
+        ):
+            super().save(*args, **kwargs)
+        elif self._names_changed():
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "slug"}
+            self._save_with_unique_slug(*args, **kwargs)
         else:
-            self.slug = self.generate_unique_slug()
+            super().save(*args, **kwargs)
+        self._remember_loaded_names()
 
-        super().save(*args, **kwargs)
+    def _save_with_unique_slug(self, *args, **kwargs) -> None:
+        """
+        Generates a fresh slug and saves the user with it.
+
+        A concurrent save may grab the same slug between reading the taken
+        slugs and writing the row. The unique index rejects the second
+        writer, so the slug is regenerated and the save retried inside a
+        savepoint, up to ``SLUG_SAVE_ATTEMPTS`` times.
+        """
+        for attempt in range(1, SLUG_SAVE_ATTEMPTS + 1):
+            self.slug = self.generate_unique_slug()
+            try:
+                with transaction.atomic(using=kwargs.get("using")):
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                slug_taken = get_user_model().objects.filter(
+                    slug=self.slug
+                ).exclude(pk=self.pk).exists()
+                if not slug_taken or attempt == SLUG_SAVE_ATTEMPTS:
+                    raise
 
     def get_absolute_url(self) -> str:
         return reverse("kitchen:cook-detail-page", kwargs={"slug": self.slug})
@@ -99,6 +231,12 @@ class Ingredient(models.Model):
 
     class Meta:
         ordering = ("name",)
+        indexes = [
+            models.Index(
+                fields=("name", "id"),
+                name="kitchen_ingredient_name_idx"
+            ),
+        ]
 
 
 class Dish(models.Model):
@@ -116,10 +254,12 @@ class Dish(models.Model):
     )
     cooks = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
+        through="DishCook",
         related_name="dishes"
     )
     ingredients = models.ManyToManyField(
         Ingredient,
+        through="DishIngredient",
         related_name="dishes"
     )
     image = models.ImageField(upload_to="dish_images")
@@ -129,9 +269,119 @@ class Dish(models.Model):
     class Meta:
         verbose_name_plural = "dishes"
         ordering = ("name",)
+        indexes = [
+            models.Index(fields=("name", "id"), name="kitchen_dish_name_idx"),
+            models.Index(
+                fields=("-updated_at",),
+                name="kitchen_dish_updated_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
     def get_absolute_url(self) -> str:
         return reverse("kitchen:dish-detail-page", kwargs={"pk": self.pk})
+
+
+class DishCook(models.Model):
+    """
+    Row of ``Dish.cooks``. The unique constraint leads with the dish and
+    serves ``dish.cooks``; the index serves ``cook.dishes``. Neither
+    column needs an index of its own.
+    """
+    dish = models.ForeignKey(
+        Dish,
+        on_delete=models.CASCADE,
+        db_index=False
+    )
+    cook = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        db_index=False
+    )
+
+    class Meta:
+        db_table = "kitchen_dish_cooks"
+        constraints = [
+            models.UniqueConstraint(
+                fields=("dish", "cook"),
+                name="kitchen_dish_cooks_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=("cook", "dish"),
+                name="kitchen_dish_cooks_rev_idx"
+            ),
+        ]
+
+
+class DishIngredient(models.Model):
+    """
+    Row of ``Dish.ingredients``, indexed both ways like ``DishCook``.
+    """
+    dish = models.ForeignKey(
+        Dish,
+        on_delete=models.CASCADE,
+        db_index=False
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        db_index=False
+    )
+
+    class Meta:
+        db_table = "kitchen_dish_ingredients"
+        constraints = [
+            models.UniqueConstraint(
+                fields=("dish", "ingredient"),
+                name="kitchen_dish_ingredients_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=("ingredient", "dish"),
+                name="kitchen_dish_ingr_rev_idx"
+            ),
+        ]
+
+
+class ImageJob(models.Model):
+    """
+    Post-processing of an uploaded image, queued by the save that stored
+    it and run by the worker in ``kitchen.jobs`` after the response.
+    """
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    model_label = models.CharField(max_length=100)
+    object_id = models.PositiveBigIntegerField()
+    field_name = models.CharField(max_length=100)
+    file_name = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("run_after", "id")
+        indexes = [
+            models.Index(
+                fields=("status", "run_after"),
+                name="kitchen_imagejob_queue_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.file_name} ({self.get_status_display()})"
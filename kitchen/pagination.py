@@ -0,0 +1,247 @@
+"""
+Keyset (cursor) pagination for the kitchen list views.
+
+Instead of ``OFFSET`` and a ``COUNT(*)`` per request, pages are fetched
+with a ``WHERE`` on the model's ``Meta.ordering`` fields plus the primary
+key, starting right after (or before) the last row of the current page.
+Every page costs a single indexed query however deep it is.
+"""
+from typing import Any
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q, QuerySet
+from django.http import Http404
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPage:
+    """
+    A page of rows together with the cursors leading to its neighbours.
+    Mirrors the parts of ``django.core.paginator.Page`` the templates use.
+    """
+    is_keyset = True
+
+    def __init__(
+        self,
+        object_list: list,
+        paginator: "KeysetPaginator",
+        has_next: bool,
+        has_previous: bool,
+    ) -> None:
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self) -> str:
+        return f"<KeysetPage of {len(self.object_list)} rows>"
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self) -> str | None:
+        if not self._has_next:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], "next")
+
+    @property
+    def previous_cursor(self) -> str | None:
+        if not self._has_previous:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], "previous")
+
+
+class KeysetPaginator:
+    """
+    Pages through ``queryset`` ordered by ``ordering`` and the primary key.
+
+    ``ordering`` defaults to the queryset's own ``order_by()``, such as the
+    relevance of a search, and otherwise to the model's ``Meta.ordering``.
+    Annotations in it, like the search rank, are carried in the cursor
+    like fields.
+
+    Cursors are signed, so they are opaque to clients and can't be forged
+    into arbitrary filters.
+    """
+    cursor_salt = "kitchen.pagination.cursor"
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        per_page: int,
+        ordering: tuple[str, ...] | None = None,
+    ) -> None:
+        if ordering is None:
+            ordering = (
+                tuple(queryset.query.order_by)
+                or tuple(queryset.model._meta.ordering)
+            )
+        if not all(isinstance(field, str) for field in ordering):
+            raise ValueError(
+                "Keyset pagination needs an ordering by field or annotation "
+                "names."
+            )
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(
+            field for field in ordering if field.lstrip("-") != "pk"
+        ) + ("pk",)
+
+    def encode_cursor(self, obj: Any, direction: str) -> str:
+        """
+        Encodes the ordering values of ``obj``, a model instance or a
+        ``values()`` row, into a cursor.
+        """
+        names = [field.lstrip("-") for field in self.ordering]
+        if isinstance(obj, dict):
+            values = [obj[name] for name in names]
+        else:
+            values = [getattr(obj, name) for name in names]
+        return signing.dumps(
+            {"direction": direction, "values": values},
+            salt=self.cursor_salt,
+            compress=True
+        )
+
+    def decode_cursor(self, cursor: str) -> tuple[str, list]:
+        try:
+            data = signing.loads(cursor, salt=self.cursor_salt)
+            direction, values = data["direction"], data["values"]
+        except (signing.BadSignature, KeyError, TypeError):
+            raise InvalidCursor("The cursor is invalid.")
+        if (
+            direction not in ("next", "previous")
+            or len(values) != len(self.ordering)
+        ):
+            raise InvalidCursor("The cursor is invalid.")
+        return direction, values
+
+    def page(self, cursor: str | None = None) -> KeysetPage:
+        """
+        Returns the page following or preceding the row encoded in
+        ``cursor``, or the first page without a cursor.
+        """
+        queryset, direction = self._page_queryset(cursor)
+        return self._make_page(list(queryset), direction)
+
+    async def apage(self, cursor: str | None = None) -> KeysetPage:
+        """
+        Async version of ``page()``, fetching the rows with the async ORM.
+        """
+        queryset, direction = self._page_queryset(cursor)
+        return self._make_page([row async for row in queryset], direction)
+
+    def _page_queryset(self, cursor: str | None) -> tuple[QuerySet, str]:
+        """
+        Builds the query of the page after ``cursor``, fetching one extra
+        row to tell whether there are more.
+        """
+        if not cursor:
+            return self._ordered(reverse=False)[:self.per_page + 1], "first"
+
+        direction, values = self.decode_cursor(cursor)
+        backwards = direction == "previous"
+        queryset = (
+            self._ordered(reverse=backwards)
+            .filter(self._after(values, reverse=backwards))
+            [:self.per_page + 1]
+        )
+        return queryset, direction
+
+    def _make_page(self, rows: list, direction: str) -> KeysetPage:
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if direction == "first":
+            return KeysetPage(
+                rows, self, has_next=has_more, has_previous=False
+            )
+        if direction == "previous":
+            rows.reverse()
+            return KeysetPage(rows, self, has_next=True, has_previous=has_more)
+        return KeysetPage(rows, self, has_next=has_more, has_previous=True)
+
+    def _ordered(self, reverse: bool) -> QuerySet:
+        return self.queryset.order_by(
+            *(self._flip(field) if reverse else field
+              for field in self.ordering)
+        )
+
+    def _after(self, values: list, reverse: bool) -> Q:
+        """
+        Builds the row-value comparison ``(f1, f2, ...) > (v1, v2, ...)``
+        as ``f1 > v1 OR (f1 = v1 AND f2 > v2) OR ...``, honouring the
+        direction of every ordering field.
+        """
+        condition = Q()
+        for position, field in enumerate(self.ordering):
+            if reverse:
+                field = self._flip(field)
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            step = Q(**{f"{name}__{lookup}": values[position]})
+            for previous, previous_field in enumerate(
+                self.ordering[:position]
+            ):
+                step &= Q(**{previous_field.lstrip("-"): values[previous]})
+            condition |= step
+        return condition
+
+    @staticmethod
+    def _flip(field: str) -> str:
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+
+class KeysetPaginationMixin:
+    """
+    Lets a ``ListView`` page with cursors instead of page numbers when its
+    ``pagination_mode``, or the ``KITCHEN_PAGINATION_MODE`` setting, is
+    ``"keyset"``. The current cursor is read from the ``cursor`` GET
+    parameter.
+
+    The page is fetched with the async ORM, so the view also needs
+    ``kitchen.async_views.AsyncListMixin``, listed after this mixin.
+    """
+    pagination_mode = None
+    cursor_kwarg = "cursor"
+
+    def get_pagination_mode(self) -> str:
+        return self.pagination_mode or getattr(
+            settings, "KITCHEN_PAGINATION_MODE", "offset"
+        )
+
+    async def apaginate_queryset(
+        self,
+        queryset: QuerySet,
+        page_size: int
+    ) -> tuple:
+        if self.get_pagination_mode() != "keyset":
+            return await super().apaginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size)
+        try:
+            page = await paginator.apage(
+                self.request.GET.get(self.cursor_kwarg)
+            )
+        except InvalidCursor as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,228 @@
+"""
+Query profiling for the instrumentation middleware.
+
+Every database connection runs its queries through ``time_query``. It adds
+each query to the timer of the current request when that request is
+measured by ``PerformanceMiddleware``. It also records every query slower
+than ``KITCHEN_SLOW_QUERY_MS`` in ``slow_query_log``, tagged with the view
+and URL name set by ``QueryOriginMiddleware``. The first occurrence of
+each query shape gets an ``EXPLAIN`` plan.
+"""
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+logger = logging.getLogger("kitchen.slow_queries")
+
+FINGERPRINT_SUBSTITUTIONS = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+class QueryTimer:
+    """
+    Counts the queries of a request and the time spent running them.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+
+
+current_query_timer = ContextVar("current_query_timer", default=None)
+current_request = ContextVar("current_request", default=None)
+explaining = ContextVar("explaining", default=False)
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Reduces ``sql`` to its shape: literals and placeholders become ``?``,
+    ``IN`` lists collapse to ``(...)`` and whitespace is squeezed, so the
+    same query with different values or list lengths looks the same.
+    """
+    for pattern, replacement in FINGERPRINT_SUBSTITUTIONS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def fingerprint(sql: str) -> str:
+    return hashlib.sha1(normalize_sql(sql).encode()).hexdigest()[:12]
+
+
+class SlowQueryLog:
+    """
+    Keeps the latest ``maxlen`` slow queries of the process in a ring
+    buffer, along with one ``EXPLAIN`` plan per fingerprint seen.
+    """
+
+    def __init__(self, maxlen: int = 200) -> None:
+        self.entries = deque(maxlen=maxlen)
+        self.plans = OrderedDict()
+        self.lock = threading.Lock()
+
+    def needs_plan(self, query_fingerprint: str) -> bool:
+        with self.lock:
+            return query_fingerprint not in self.plans
+
+    def add(self, entry: dict) -> None:
+        with self.lock:
+            if entry.get("plan"):
+                self.plans[entry["fingerprint"]] = entry["plan"]
+                while len(self.plans) > self.entries.maxlen:
+                    self.plans.popitem(last=False)
+            self.entries.append(entry)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.plans.clear()
+
+    def recent(self) -> list[dict]:
+        with self.lock:
+            return list(reversed(self.entries))
+
+    def groups(self) -> list[dict]:
+        """
+        Sums up the buffered queries per fingerprint, most time spent
+        first.
+        """
+        groups = {}
+        with self.lock:
+            for entry in self.entries:
+                group = groups.setdefault(entry["fingerprint"], {
+                    "fingerprint": entry["fingerprint"],
+                    "sql": entry["sql"],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "url_names": set(),
+                    "plan": self.plans.get(entry["fingerprint"], ""),
+                })
+                group["count"] += 1
+                group["total_ms"] += entry["duration_ms"]
+                group["max_ms"] = max(group["max_ms"], entry["duration_ms"])
+                if entry["url_name"]:
+                    group["url_names"].add(entry["url_name"])
+        return sorted(
+            groups.values(),
+            key=lambda group: group["total_ms"],
+            reverse=True
+        )
+
+
+slow_query_log = SlowQueryLog(
+    getattr(settings, "KITCHEN_SLOW_QUERY_BUFFER", 200)
+)
+
+
+def explain(connection, sql: str, params) -> str:
+    """
+    Returns the plan of a ``SELECT``, or an empty string when the database
+    can't explain it. Runs in a savepoint, so a failing ``EXPLAIN`` can't
+    break the transaction of the request.
+    """
+    if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return ""
+    token = explaining.set(True)
+    try:
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"{connection.ops.explain_query_prefix()} {sql}",
+                    params
+                )
+                rows = cursor.fetchall()
+    except DatabaseError:
+        return ""
+    finally:
+        explaining.reset(token)
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def query_origin() -> dict[str, str | None]:
+    """
+    Returns the path, view and URL name of the request running the current
+    query. The view is only known once the URL is resolved.
+    """
+    request = current_request.get()
+    if request is None:
+        return {"path": None, "view": None, "url_name": None}
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return {"path": request.path, "view": None, "url_name": None}
+    view = getattr(match.func, "view_class", match.func)
+    return {
+        "path": request.path,
+        "view": f"{view.__module__}.{view.__qualname__}",
+        "url_name": match.view_name,
+    }
+
+
+def record_slow_query(sql: str, params, context: dict, duration: float):
+    query_fingerprint = fingerprint(sql)
+    entry = {
+        "fingerprint": query_fingerprint,
+        "sql": sql,
+        "duration_ms": round(duration * 1000, 2),
+        **query_origin(),
+        "time": datetime.now(timezone.utc),
+        "plan": "",
+    }
+    if params is not None and slow_query_log.needs_plan(query_fingerprint):
+        entry["plan"] = explain(context["connection"], sql, params)
+    slow_query_log.add(entry)
+    logger.warning(
+        "Slow query %s took %.1f ms in %s (%s): %s",
+        query_fingerprint,
+        entry["duration_ms"],
+        entry["url_name"] or "-",
+        entry["view"] or "-",
+        normalize_sql(sql),
+    )
+
+
+def time_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper timing every query.
+
+    The request's timer and origin are looked up in context variables
+    rather than installed on the connection per request: connections are
+    thread local, and under ASGI the queries of a request run in a worker
+    thread while the middleware runs on the event loop. Context variables
+    follow the request into those threads.
+    """
+    if explaining.get():
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = time.perf_counter() - started
+
+    timer = current_query_timer.get()
+    if timer is not None:
+        timer.duration += duration
+        timer.count += 1
+    threshold = getattr(settings, "KITCHEN_SLOW_QUERY_MS", None)
+    if threshold is not None and duration * 1000 >= threshold:
+        record_slow_query(sql, None if many else params, context, duration)
+    return result
+
+
+def install_query_timer(connection, **kwargs) -> None:
+    """
+    Adds ``time_query`` to a new database connection. Connected to
+    ``connection_created``, so every connection of every thread has it.
+    """
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
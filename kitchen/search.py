@@ -0,0 +1,252 @@
+"""
+Search backends for the kitchen list views.
+
+Every backend narrows a queryset down to the rows whose search field
+contains the term and orders them by relevance. The backend is picked by
+the ``KITCHEN_SEARCH_BACKEND`` setting, a dotted path or ``"auto"`` to
+choose one for the database vendor:
+
+* PostgreSQL uses ``pg_trgm`` GIN indexes on the search fields and ranks by
+  trigram word similarity.
+* SQLite uses an FTS5 trigram table per model, kept in sync by the model
+  signals in ``kitchen.signals`` and ranked by bm25.
+* Anything else, or a database where the indexes are missing, falls back
+  to the plain ``icontains`` filter.
+"""
+import time
+from collections.abc import Iterable
+from functools import cache
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections, models
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Dish, DishType, Ingredient
+
+
+def searchable_fields() -> dict[type[models.Model], str]:
+    """
+    Maps every searchable model to the field its search form filters on.
+    """
+    return {
+        Dish: "name",
+        DishType: "name",
+        Ingredient: "name",
+        get_user_model(): "username",
+    }
+
+
+class SearchBackend:
+    """
+    Filters with ``icontains`` and keeps the model's default ordering.
+    Used as is when no index-backed backend is available, and as the
+    fallback of the other backends.
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        self.using = using
+
+    def search(self, queryset: QuerySet, term: str) -> QuerySet:
+        """
+        Narrows ``queryset`` down to the rows matching ``term``.
+
+        Parameters:
+            queryset (QuerySet): A queryset of a searchable model.
+            term (str): The text typed in the search form.
+
+        Returns:
+            QuerySet: The matching rows, most relevant first.
+        """
+        if not term:
+            return queryset
+        field = searchable_fields()[queryset.model]
+        return queryset.filter(**{f"{field}__icontains": term})
+
+    def index(self, instance: models.Model) -> None:
+        """
+        Adds or refreshes ``instance`` in the search index.
+        """
+
+    def unindex(self, instance: models.Model) -> None:
+        """
+        Removes ``instance`` from the search index.
+        """
+
+    def rebuild(self, model: type[models.Model]) -> None:
+        """
+        Rebuilds the whole search index of ``model`` from its table.
+        """
+
+
+class SQLiteFTSSearchBackend(SearchBackend):
+    """
+    Searches an FTS5 table per model, ``<model table>_fts``, whose rowid is
+    the model's primary key and whose trigram tokenizer matches substrings
+    the way ``icontains`` does. Terms shorter than a trigram can't use the
+    index and fall back to ``icontains``.
+    """
+    min_term_length = 3
+
+    @staticmethod
+    def table_name(model: type[models.Model]) -> str:
+        return f"{model._meta.db_table}_fts"
+
+    def has_index(self, model: type[models.Model]) -> bool:
+        return self.table_name(model) in self._existing_tables()
+
+    def search(self, queryset: QuerySet, term: str) -> QuerySet:
+        model = queryset.model
+        if len(term) < self.min_term_length or not self.has_index(model):
+            return super().search(queryset, term)
+
+        quote_name = connections[self.using].ops.quote_name
+        fts_table = quote_name(self.table_name(model))
+        model_table = quote_name(model._meta.db_table)
+        pk_column = quote_name(model._meta.pk.column)
+        match = '"{}"'.format(term.replace('"', '""'))
+        return queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH %s",
+                [match]
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT rank FROM {fts_table} "
+                f"WHERE {fts_table} MATCH %s "
+                f"AND rowid = {model_table}.{pk_column}",
+                [match]
+            )
+        ).order_by("search_rank", *model._meta.ordering)
+
+    def index(self, instance: models.Model) -> None:
+        model = type(instance)
+        if not self.has_index(model):
+            return
+        field = searchable_fields()[model]
+        self._execute(
+            f"INSERT OR REPLACE INTO {self._quoted_table(model)} "
+            "(rowid, content) VALUES (%s, %s)",
+            [instance.pk, getattr(instance, field)]
+        )
+
+    def unindex(self, instance: models.Model) -> None:
+        model = type(instance)
+        if self.has_index(model):
+            self._execute(
+                f"DELETE FROM {self._quoted_table(model)} WHERE rowid = %s",
+                [instance.pk]
+            )
+
+    def rebuild(self, model: type[models.Model]) -> None:
+        if not self.has_index(model):
+            return
+        quote_name = connections[self.using].ops.quote_name
+        field = model._meta.get_field(searchable_fields()[model])
+        self._execute(f"DELETE FROM {self._quoted_table(model)}")
+        self._execute(
+            f"INSERT INTO {self._quoted_table(model)} (rowid, content) "
+            f"SELECT {quote_name(model._meta.pk.column)}, "
+            f"{quote_name(field.column)} "
+            f"FROM {quote_name(model._meta.db_table)}"
+        )
+
+    def _quoted_table(self, model: type[models.Model]) -> str:
+        return connections[self.using].ops.quote_name(self.table_name(model))
+
+    def _execute(self, sql: str, params: list | None = None) -> None:
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def _existing_tables(self) -> set[str]:
+        """
+        Lists the tables of the database, once per backend instance. The
+        instances are dropped after every migration, see
+        ``clear_search_backends()``.
+        """
+        if not hasattr(self, "_tables"):
+            self._tables = set(
+                connections[self.using].introspection.table_names()
+            )
+        return self._tables
+
+
+class PostgresTrigramSearchBackend(SearchBackend):
+    """
+    Keeps the ``icontains`` filter, which PostgreSQL answers from the
+    ``gin_trgm_ops`` indexes on ``UPPER(<field>)`` created by the search
+    migration, and ranks the matches by trigram word similarity.
+    """
+
+    def search(self, queryset: QuerySet, term: str) -> QuerySet:
+        if not term:
+            return queryset
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        field = searchable_fields()[queryset.model]
+        return super().search(queryset, term).annotate(
+            search_rank=TrigramWordSimilarity(term, field)
+        ).order_by("-search_rank", *queryset.model._meta.ordering)
+
+
+VENDOR_BACKENDS = {
+    "postgresql": PostgresTrigramSearchBackend,
+    "sqlite": SQLiteFTSSearchBackend,
+}
+
+
+@cache
+def get_search_backend(using: str = DEFAULT_DB_ALIAS) -> SearchBackend:
+    """
+    Returns the search backend configured for the ``using`` database.
+    """
+    backend_path = getattr(settings, "KITCHEN_SEARCH_BACKEND", "auto")
+    if backend_path == "auto":
+        backend_class = VENDOR_BACKENDS.get(
+            connections[using].vendor,
+            SearchBackend
+        )
+    else:
+        backend_class = import_string(backend_path)
+    return backend_class(using)
+
+
+def clear_search_backends(**kwargs) -> None:
+    """
+    Forgets the cached backends, and the tables they have seen, so that
+    indexes created or dropped by a migration are picked up. Connected to
+    ``post_migrate``.
+    """
+    get_search_backend.cache_clear()
+
+
+def search_models(
+    term: str,
+    models_to_search: Iterable[type[models.Model]],
+    limit: int,
+    budget_ms: float,
+    using: str = DEFAULT_DB_ALIAS,
+) -> tuple[dict[type[models.Model], list[models.Model]], bool]:
+    """
+    Searches several models in turn with the configured backend, keeping
+    at most ``limit`` of the most relevant rows of each.
+
+    Once ``budget_ms`` milliseconds are spent no further model is
+    searched, so a slow query can't stretch the response: the results
+    gathered so far are returned and the search is flagged as timed out.
+
+    Returns:
+        tuple: The results per model, and whether the budget ran out.
+    """
+    backend = get_search_backend(using)
+    deadline = time.monotonic() + budget_ms / 1000
+    results = {}
+    for model in models_to_search:
+        if time.monotonic() >= deadline:
+            return results, True
+        results[model] = list(
+            backend.search(model._default_manager.using(using), term)[:limit]
+        )
+    return results, False
@@ -0,0 +1,145 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_save,
+)
+
+from .cache import bump_generation
+from .jobs import enqueue_image_job
+from .models import Cook, Dish, DishType, Ingredient
+from .profiling import install_query_timer
+from .search import (
+    clear_search_backends,
+    get_search_backend,
+    searchable_fields,
+)
+from .thumbnails import image_fields
+
+
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """
+    Refreshes the saved instance in the search index, unless the save was
+    limited to fields that aren't searched (like ``last_login``).
+    """
+    field = searchable_fields()[sender]
+    if update_fields is not None and field not in update_fields:
+        return
+    get_search_backend(kwargs["using"]).index(instance)
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    get_search_backend(kwargs["using"]).unindex(instance)
+
+
+def bump_model_generation(sender, update_fields=None, **kwargs):
+    """
+    Invalidates everything cached from the sender's table. Saves limited
+    to ``last_login``, which every login makes, are ignored.
+
+    The generation is bumped again once the transaction commits, so that
+    nothing cached from the old rows by a concurrent request in between
+    survives the change.
+    """
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    name = sender._meta.model_name
+    bump_generation(name)
+    transaction.on_commit(
+        lambda: bump_generation(name),
+        using=kwargs["using"]
+    )
+
+
+def bump_dish_ingredients_generation(sender, action, **kwargs):
+    """
+    Invalidates the cached dish fragments, which list ingredient names,
+    whenever a dish's set of ingredients changes.
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_model_generation(Ingredient, using=kwargs["using"])
+
+
+def bump_dish_cooks_generation(sender, action, **kwargs):
+    """
+    Invalidates the pages listing a dish's cooks whenever they change.
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_model_generation(Dish.cooks.through, using=kwargs["using"])
+
+
+def detect_image_upload(sender, instance, update_fields=None, **kwargs):
+    """
+    Notes whether the save is about to store a newly uploaded image, which
+    can only be told before the file field commits it.
+    """
+    field = image_fields()[sender]
+    field_file = getattr(instance, field)
+    instance._image_uploaded = (
+        (update_fields is None or field in update_fields)
+        and bool(field_file)
+        and not field_file._committed
+    )
+
+
+def queue_image_processing(sender, instance, **kwargs):
+    if instance.__dict__.pop("_image_uploaded", False):
+        enqueue_image_job(instance, image_fields()[sender])
+
+
+def connect_signals() -> None:
+    connection_created.connect(
+        install_query_timer,
+        dispatch_uid="kitchen_query_timer"
+    )
+    post_migrate.connect(
+        clear_search_backends,
+        dispatch_uid="kitchen_clear_search_backends"
+    )
+    for model in searchable_fields():
+        post_save.connect(
+            update_search_index,
+            sender=model,
+            dispatch_uid=f"kitchen_search_index_{model._meta.label_lower}"
+        )
+        post_delete.connect(
+            remove_from_search_index,
+            sender=model,
+            dispatch_uid=f"kitchen_search_unindex_{model._meta.label_lower}"
+        )
+
+    for model in image_fields():
+        pre_save.connect(
+            detect_image_upload,
+            sender=model,
+            dispatch_uid=f"kitchen_image_upload_{model._meta.label_lower}"
+        )
+        post_save.connect(
+            queue_image_processing,
+            sender=model,
+            dispatch_uid=f"kitchen_image_jobs_{model._meta.label_lower}"
+        )
+    for model in (Cook, Dish, DishType, Ingredient):
+        post_save.connect(
+            bump_model_generation,
+            sender=model,
+            dispatch_uid=f"kitchen_generation_save_{model._meta.label_lower}"
+        )
+        post_delete.connect(
+            bump_model_generation,
+            sender=model,
+            dispatch_uid=f"kitchen_generation_delete_{model._meta.label_lower}"
+        )
+    m2m_changed.connect(
+        bump_dish_cooks_generation,
+        sender=Dish.cooks.through,
+        dispatch_uid="kitchen_generation_dish_cooks"
+    )
+    m2m_changed.connect(
+        bump_dish_ingredients_generation,
+        sender=Dish.ingredients.through,
+        dispatch_uid="kitchen_generation_dish_ingredients"
+    )
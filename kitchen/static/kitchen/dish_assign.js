@@ -0,0 +1,25 @@
+// Submits the assign/unassign form in the background and swaps in the
+// returned fragment, so toggling doesn't reload the whole dish page.
+document.addEventListener("submit", async (event) => {
+  const form = event.target.closest(".dish-assign-form");
+  if (!form) {
+    return;
+  }
+  event.preventDefault();
+
+  const button = form.querySelector("button");
+  button.disabled = true;
+  try {
+    const response = await fetch(form.action, {
+      method: "POST",
+      body: new FormData(form),
+      headers: {"X-Requested-With": "XMLHttpRequest"},
+    });
+    if (!response.ok) {
+      throw new Error(response.statusText);
+    }
+    form.outerHTML = await response.text();
+  } catch (error) {
+    form.submit();
+  }
+});
@@ -0,0 +1,61 @@
+"""
+Content-addressed storage for the uploaded images.
+
+An upload is stored as ``<directory>/<sha256 of its content><extension>``,
+so uploading the same photo again stores nothing new: the name of the file
+already there is returned instead, and its modification time is refreshed
+so ``collect_media_garbage`` treats it as a new upload.
+"""
+import hashlib
+import os
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    A ``FileSystemStorage`` naming uploads by the SHA-256 of their content.
+
+    The hash is computed over ``chunk_size`` chunks, so large uploads are
+    never read into memory at once.
+    """
+    chunk_size = 64 * 1024
+
+    def content_hash(self, content: File) -> str:
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks(self.chunk_size):
+            digest.update(chunk)
+        content.seek(0)
+        return digest.hexdigest()
+
+    def save(self, name: str | None, content, max_length=None) -> str:
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        name = os.path.join(
+            directory,
+            f"{self.content_hash(content)}{extension}"
+        )
+        if self.exists(name):
+            try:
+                os.utime(self.path(name))
+            except FileNotFoundError:
+                pass
+            else:
+                return name
+        return super().save(name, content, max_length=max_length)
+
+    def save_as(self, name: str, content: File) -> str:
+        """
+        Stores ``content`` under exactly ``name``, replacing any file there.
+        Meant for files derived from an upload, which are named after it.
+        """
+        if self.exists(name):
+            self.delete(name)
+        return super().save(name, content)
@@ -0,0 +1,19 @@
+from django import template
+from django.utils.safestring import SafeString
+
+from kitchen.cache import get_dish_fragments
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def dish_fragment(context, dish, template_name: str) -> SafeString:
+    """
+    Outputs the cached ``template_name`` fragment of ``dish``. Views prime
+    the fragments of a whole page at once into ``dish_fragments``; dishes
+    that weren't primed are looked up one by one.
+    """
+    fragments = context.get("dish_fragments") or {}
+    if dish.pk in fragments:
+        return fragments[dish.pk]
+    return get_dish_fragments([dish], template_name)[dish.pk]
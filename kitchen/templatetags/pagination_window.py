@@ -0,0 +1,72 @@
+from django import template
+
+from .query_transform import query_transform
+
+register = template.Library()
+
+
+def page_window(
+    number: int,
+    num_pages: int,
+    radius: int = 2
+) -> list[int | None]:
+    """
+    Lists the page numbers to link to: the pages within ``radius`` of the
+    current one, plus the first and last page, with ``None`` standing for
+    the gaps in between. Only the visible pages are computed, so the cost
+    doesn't depend on the number of pages.
+    """
+    start = max(number - radius, 1)
+    end = min(number + radius, num_pages)
+
+    pages = []
+    if start > 1:
+        pages.append(1)
+        if start > 2:
+            pages.append(None)
+    pages.extend(range(start, end + 1))
+    if end < num_pages:
+        if end < num_pages - 1:
+            pages.append(None)
+        pages.append(num_pages)
+    return pages
+
+
+@register.inclusion_tag(
+    "kitchen/includes/pagination_window.html",
+    takes_context=True
+)
+def pagination_window(context, radius: int = 2) -> dict:
+    """
+    Renders the numbered page links around the current page. Every link
+    is built with ``query_transform``, so search parameters are kept.
+    """
+    request = context["request"]
+    page_obj = context["page_obj"]
+
+    def page_url(number: int) -> str:
+        return f"?{query_transform(request, page=number)}"
+
+    links = [
+        {
+            "number": number,
+            "url": page_url(number) if number else None,
+            "is_current": number == page_obj.number,
+        }
+        for number in page_window(
+            page_obj.number,
+            page_obj.paginator.num_pages,
+            radius
+        )
+    ]
+    return {
+        "links": links,
+        "previous_url": (
+            page_url(page_obj.previous_page_number())
+            if page_obj.has_previous() else None
+        ),
+        "next_url": (
+            page_url(page_obj.next_page_number())
+            if page_obj.has_next() else None
+        ),
+    }
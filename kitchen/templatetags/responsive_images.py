@@ -0,0 +1,49 @@
+from django import template
+from django.db.models.fields.files import FieldFile
+
+from kitchen.jobs import is_pending
+from kitchen.thumbnails import (
+    FALLBACK_WIDTH,
+    has_thumbnails,
+    thumbnail_name,
+    thumbnail_srcset,
+)
+
+register = template.Library()
+
+
+@register.filter
+def srcset(field_file: FieldFile, extension: str = "jpg") -> str:
+    """
+    Returns the ``srcset`` of the ``extension`` thumbnails of an image, or
+    an empty string while they don't exist.
+    """
+    if not has_thumbnails(field_file):
+        return ""
+    return thumbnail_srcset(field_file, extension)
+
+
+@register.inclusion_tag("kitchen/includes/responsive_image.html")
+def responsive_image(
+    field_file: FieldFile,
+    alt: str = "",
+    sizes: str = "100vw"
+) -> dict:
+    """
+    Renders an image as a ``<picture>`` offering its WebP thumbnails with
+    JPEG ones as the fallback. While a new upload is being processed a
+    placeholder is shown instead, and images that never got thumbnails
+    are shown as they are.
+    """
+    context = {"image": field_file, "alt": alt, "sizes": sizes}
+    if not has_thumbnails(field_file):
+        context["pending"] = is_pending(field_file)
+    else:
+        context.update({
+            "webp_srcset": thumbnail_srcset(field_file, "webp"),
+            "jpeg_srcset": thumbnail_srcset(field_file, "jpg"),
+            "fallback_url": field_file.storage.url(
+                thumbnail_name(field_file.name, FALLBACK_WIDTH, "jpg")
+            ),
+        })
+    return context
@@ -0,0 +1,56 @@
+"""
+Helpers for tests that upload images.
+"""
+import itertools
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+IMAGE_SHADES = itertools.count()
+
+
+def make_image(width: int = 400, height: int = 300) -> SimpleUploadedFile:
+    """
+    Makes a distinct JPEG photo every time, so the content-addressed
+    storage never reuses the file, and the thumbnails, of another test.
+    """
+    shade = next(IMAGE_SHADES)
+    buffer = BytesIO()
+    Image.new(
+        "RGB", (width, height), (255, shade % 256, shade // 256 % 256)
+    ).save(buffer, "JPEG")
+    return SimpleUploadedFile(
+        "photo.jpg",
+        buffer.getvalue(),
+        content_type="image/jpeg"
+    )
+
+
+def use_temporary_media_root(
+    test: TestCase | type[TestCase],
+    **overrides
+) -> str:
+    """
+    Points ``MEDIA_ROOT``, along with any other ``overrides``, at a new
+    temporary directory, removed again when the test is over.
+
+    Parameters:
+        test: The running test, or the test class when called from
+            ``setUpClass()``.
+
+    Returns:
+        str: The path of the temporary media root.
+    """
+    media_root = tempfile.mkdtemp()
+    settings_override = override_settings(MEDIA_ROOT=media_root, **overrides)
+    settings_override.enable()
+    add_cleanup = (
+        test.addClassCleanup if isinstance(test, type) else test.addCleanup
+    )
+    add_cleanup(shutil.rmtree, media_root)
+    add_cleanup(settings_override.disable)
+    return media_root
@@ -0,0 +1,62 @@
+"""
+Assertions on the query plans of querysets, for tests that guard the
+indexes the views rely on.
+"""
+import re
+
+from django.db import connection
+from django.db.models import QuerySet
+
+
+SQLITE_SCAN = re.compile(r"\bSCAN (?!CONSTANT ROW)")
+SQLITE_SORT = re.compile(r"USE TEMP B-TREE FOR (ORDER|GROUP) BY")
+
+POSTGRES_FULL_SCAN = re.compile(r"Seq Scan on \S+")
+POSTGRES_SORT = re.compile(r"^\s*(->\s*)?Sort\b", re.MULTILINE)
+
+
+def plan_problems(queryset: QuerySet) -> list[str]:
+    """
+    Runs ``EXPLAIN`` on ``queryset`` and lists what makes its cost grow
+    with the size of the tables: a table read from end to end, or a sort
+    over rows that weren't narrowed down by an index lookup first.
+
+    Parameters:
+        queryset (QuerySet): The query to check.
+
+    Returns:
+        list[str]: The offending lines of the plan, empty when the query
+        only reads what an index leads it to.
+    """
+    plan = queryset.explain()
+    if connection.vendor == "postgresql":
+        problems = POSTGRES_FULL_SCAN.findall(plan)
+        if POSTGRES_SORT.search(plan) and "Index Cond" not in plan:
+            problems.append("Sort")
+        return problems
+
+    lines = plan.splitlines()
+    problems = [
+        line.strip() for line in lines
+        if SQLITE_SCAN.search(line) and " INDEX " not in line
+    ]
+    if any(SQLITE_SCAN.search(line) for line in lines):
+        problems += [
+            line.strip() for line in lines if SQLITE_SORT.search(line)
+        ]
+    return problems
+
+
+class QueryPlanAssertionsMixin:
+    """
+    Adds ``assert_indexed()`` to a ``TestCase``.
+    """
+
+    def assert_indexed(self, queryset: QuerySet, msg: str = "") -> None:
+        problems = plan_problems(queryset)
+        if problems:
+            self.fail(
+                f"{msg or queryset.model.__name__} query is not fully "
+                f"served by indexes: {'; '.join(problems)}\n"
+                f"{queryset.query}"
+            )
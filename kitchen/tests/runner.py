@@ -0,0 +1,40 @@
+"""
+Test runner of the project, set as ``TEST_RUNNER``.
+"""
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class KitchenTestRunner(DiscoverRunner):
+    """
+    Runs the tests against a cache of their own, in a temporary directory
+    removed afterwards. The default cache is shared with the development
+    server, which the tests would otherwise clear and fill with pages and
+    generation counters of rows that only existed in the test database.
+
+    Request timing is off unless a test turns it on, so responses don't
+    get a ``Server-Timing`` header at random.
+    """
+
+    def setup_test_environment(self, **kwargs) -> None:
+        super().setup_test_environment(**kwargs)
+        self.cache_dir = tempfile.mkdtemp(prefix="restaurant_mate_test_")
+        self.settings_override = override_settings(
+            CACHES={
+                "default": {
+                    **settings.CACHES["default"],
+                    "LOCATION": self.cache_dir,
+                },
+            },
+            KITCHEN_TIMING_SAMPLE_RATE=0,
+        )
+        self.settings_override.enable()
+
+    def teardown_test_environment(self, **kwargs) -> None:
+        self.settings_override.disable()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -2,6 +2,8 @@ from django.test import TestCase, Client
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
+from kitchen.models import Dish, DishType, Ingredient
+
 
 class AdminSiteTests(TestCase):
     def setUp(self):
@@ -98,3 +100,27 @@ class AdminSiteTests(TestCase):
             f'<div class="readonly">{self.cook.slug}</div>'
         )
         self.assertNotContains(response, 'name="slug"')
+
+    def test_dish_cooks_and_ingredients_edited_inline(self):
+        dish = Dish.objects.create(
+            name="Borscht",
+            description="Beet soup",
+            price=10,
+            dish_type=DishType.objects.create(name="Soup"),
+            image="borscht.jpg"
+        )
+        dish.cooks.add(self.cook)
+        dish.ingredients.add(Ingredient.objects.create(name="Beet"))
+
+        response = self.client.get(
+            reverse("admin:kitchen_dish_change", args=[dish.pk])
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'name="dishcook_set-0-cook"')
+        self.assertContains(
+            response,
+            'name="dishingredient_set-0-ingredient"'
+        )
+        self.assertContains(response, "Test_first Test_last")
+        self.assertContains(response, "Beet")
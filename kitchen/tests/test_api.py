@@ -0,0 +1,156 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from kitchen.models import Dish, DishType, Ingredient
+from .db_test_data import dish_data
+
+
+def api_list(resource):
+    return reverse("kitchen:api-list", kwargs={"resource": resource})
+
+
+class CatalogueApiTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="dennie",
+            password="testpassword"
+        )
+        cls.dish_type = DishType.objects.create(name="Main Course")
+        tomato = Ingredient.objects.create(name="Tomato")
+        cheese = Ingredient.objects.create(name="Cheese")
+        for data in dish_data[:5]:
+            dish = Dish.objects.create(
+                name=data["name"],
+                description=data["description"],
+                price=data["price"],
+                dish_type=cls.dish_type,
+                image=data["image"]
+            )
+            dish.ingredients.add(tomato, cheese)
+            dish.cooks.add(cls.user)
+        cls.dish = Dish.objects.order_by("name").first()
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    def test_login_required(self):
+        self.client.logout()
+
+        response = self.client.get(api_list("dishes"))
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_list_returns_default_fields(self):
+        response = self.client.get(api_list("dishes"))
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(len(results), 5)
+        self.assertEqual(
+            results[0],
+            {
+                "id": self.dish.pk,
+                "name": self.dish.name,
+                "price": str(self.dish.price),
+                "dish_type": self.dish_type.pk,
+            }
+        )
+        self.assertIsNone(response.json()["next"])
+
+    def test_sparse_fieldset(self):
+        response = self.client.get(api_list("dishes"), {"fields": "name"})
+
+        self.assertEqual(
+            response.json()["results"][0],
+            {"id": self.dish.pk, "name": self.dish.name}
+        )
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(api_list("cooks"), {"fields": "password"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("password", response.json()["error"])
+
+    def test_unknown_resource_is_not_found(self):
+        response = self.client.get(api_list("orders"))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_include_costs_one_query_per_relation(self):
+        url = api_list("dishes")
+        params = {"include": "dish_type,ingredients,cooks"}
+
+        # session, user, dishes, then one query per relation
+        with self.assertNumQueries(6):
+            response = self.client.get(url, params)
+
+        item = response.json()["results"][0]
+        self.assertEqual(
+            item["dish_type"],
+            {"id": self.dish_type.pk, "name": "Main Course"}
+        )
+        self.assertEqual(
+            sorted(ingredient["name"] for ingredient in item["ingredients"]),
+            ["Cheese", "Tomato"]
+        )
+        self.assertEqual(
+            item["cooks"],
+            [{"id": self.user.pk, "username": "dennie", "slug": "dennie"}]
+        )
+
+    def test_reverse_relation_include(self):
+        response = self.client.get(api_list("cooks"), {"include": "dishes"})
+
+        dishes = response.json()["results"][0]["dishes"]
+        self.assertEqual(len(dishes), 5)
+
+    def test_cursor_pagination_walks_every_row(self):
+        names = []
+        url = api_list("dishes")
+        params = {"limit": 2, "fields": "name"}
+        while url:
+            data = self.client.get(url, params).json()
+            names += [item["name"] for item in data["results"]]
+            url, params = data["next"], None
+
+        self.assertEqual(
+            names,
+            list(Dish.objects.order_by("name").values_list("name", flat=True))
+        )
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(api_list("dishes"), {"cursor": "bogus"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail(self):
+        url = reverse(
+            "kitchen:api-detail",
+            kwargs={"resource": "dishes", "pk": self.dish.pk}
+        )
+
+        response = self.client.get(url, {"include": "ingredients"})
+
+        self.assertEqual(response.json()["id"], self.dish.pk)
+        self.assertEqual(len(response.json()["ingredients"]), 2)
+
+    async def test_served_by_async_views(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(
+            api_list("dishes"),
+            {"include": "ingredients"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 5)
+
+    def test_missing_detail_is_not_found(self):
+        url = reverse(
+            "kitchen:api-detail",
+            kwargs={"resource": "dishes", "pk": 0}
+        )
+
+        self.assertEqual(self.client.get(url).status_code, 404)
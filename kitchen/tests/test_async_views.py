@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from kitchen import views
+from kitchen.models import Dish, DishType, Ingredient
+from .db_test_data import dish_data
+
+
+class AsyncViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="dennie",
+            password="testpassword"
+        )
+        dish_type = DishType.objects.create(name="Main Course")
+        ingredient = Ingredient.objects.create(name="Tomato")
+        for data in dish_data[:8]:
+            dish = Dish.objects.create(
+                name=data["name"],
+                description=data["description"],
+                price=data["price"],
+                dish_type=dish_type,
+                image=data["image"]
+            )
+            dish.ingredients.add(ingredient)
+            dish.cooks.add(cls.user)
+        cls.dish = Dish.objects.first()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_html_list_and_detail_views_are_async(self):
+        for view in (
+            views.IndexView,
+            views.CookListView,
+            views.CookDetailView,
+            views.DishListView,
+            views.DishDetailView,
+            views.DishTypeListView,
+            views.IngredientListView,
+        ):
+            with self.subTest(view=view.__name__):
+                self.assertTrue(view.view_is_async)
+
+    async def test_pages_render_from_event_loop(self):
+        await self.async_client.aforce_login(self.user)
+        user = await get_user_model().objects.aget(pk=self.user.pk)
+
+        for url in (
+            reverse("kitchen:main-page"),
+            reverse("kitchen:cooks-page"),
+            reverse("kitchen:cook-detail-page", kwargs={"slug": user.slug}),
+            reverse("kitchen:dishes-page") + "?page=2",
+            reverse("kitchen:dish-detail-page", kwargs={"pk": self.dish.pk}),
+            reverse("kitchen:dish-types-page"),
+            reverse("kitchen:ingredients-page") + "?name=tom",
+        ):
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+        response = await self.async_client.get(
+            reverse("kitchen:dishes-page") + "?page=last"
+        )
+        self.assertEqual(response.context["page_obj"].number, 2)
+        self.assertContains(response, "Tomato")
+
+    async def test_missing_object_and_page_are_not_found(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(
+            reverse("kitchen:dish-detail-page", kwargs={"pk": 0})
+        )
+        self.assertEqual(response.status_code, 404)
+
+        response = await self.async_client.get(
+            reverse("kitchen:dishes-page") + "?page=9"
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_anonymous_user_is_redirected_to_login(self):
+        response = await self.async_client.get(reverse("kitchen:dishes-page"))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse("login"), response.url)
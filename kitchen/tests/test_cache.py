@@ -0,0 +1,243 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from kitchen.cache import (
+    bump_generation,
+    get_cache_stats,
+    get_dish_fragments,
+    get_generation,
+    search_models_cached,
+)
+from kitchen.checks import check_shared_cache
+from kitchen.models import Dish, DishType, Ingredient
+from .db_test_data import dish_data
+
+
+DISHES_LIST_URL = reverse("kitchen:dishes-page")
+DISH_TYPES_LIST_URL = reverse("kitchen:dish-types-page")
+MAIN_PAGE_URL = reverse("kitchen:main-page")
+
+
+class GenerationTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_generation_is_stable_until_bumped(self):
+        generation = get_generation("ingredient")
+        self.assertEqual(get_generation("ingredient"), generation)
+
+        bump_generation("ingredient")
+        self.assertGreater(get_generation("ingredient"), generation)
+
+    def test_evicted_generation_does_not_reuse_old_values(self):
+        generation = get_generation("ingredient")
+        cache.clear()
+        self.assertGreater(get_generation("ingredient"), generation)
+
+
+class DishFragmentCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="dennie",
+            password="testpassword"
+        )
+        dish_type = DishType.objects.create(name="Main Course")
+        cls.ingredient = Ingredient.objects.create(name="Tomato")
+        for data in dish_data[:6]:
+            dish = Dish.objects.create(
+                name=data["name"],
+                description=data["description"],
+                price=data["price"],
+                dish_type=dish_type,
+                image=data["image"]
+            )
+            dish.ingredients.add(cls.ingredient)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def get_dishes_page_queries(self) -> list[str]:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(DISHES_LIST_URL)
+        self.assertEqual(response.status_code, 200)
+        return [query["sql"] for query in queries.captured_queries]
+
+    def test_cached_cards_skip_ingredient_queries(self):
+        cold_queries = self.get_dishes_page_queries()
+        warm_queries = self.get_dishes_page_queries()
+
+        self.assertEqual(len(warm_queries), len(cold_queries) - 1)
+        self.assertFalse(
+            any("kitchen_ingredient" in sql for sql in warm_queries)
+        )
+
+    def test_renaming_ingredient_invalidates_cards(self):
+        self.client.get(DISHES_LIST_URL)
+        self.ingredient.name = "Basil"
+        self.ingredient.save()
+
+        response = self.client.get(DISHES_LIST_URL)
+
+        self.assertContains(response, "Basil")
+        self.assertNotContains(response, "Tomato")
+
+    def test_changing_dish_ingredients_invalidates_cards(self):
+        self.client.get(DISHES_LIST_URL)
+        dish = Dish.objects.first()
+        dish.ingredients.add(Ingredient.objects.create(name="Garlic"))
+
+        response = self.client.get(DISHES_LIST_URL)
+
+        self.assertContains(response, "Garlic")
+
+    def test_saving_dish_invalidates_its_card(self):
+        self.client.get(DISHES_LIST_URL)
+        dish = Dish.objects.first()
+        dish.price = "123.45"
+        dish.save()
+
+        response = self.client.get(DISHES_LIST_URL)
+
+        self.assertContains(response, "123.45")
+
+    def test_page_of_cards_is_counted_at_once(self):
+        dishes = list(Dish.objects.all())
+        for _ in range(2):
+            get_dish_fragments(dishes, "kitchen/includes/dish_card.html")
+
+        with mock.patch.object(cache, "incr", wraps=cache.incr) as incr:
+            get_dish_fragments(dishes, "kitchen/includes/dish_card.html")
+
+        incr.assert_called_once()
+        self.assertEqual(
+            get_cache_stats()["dish_fragments"],
+            {"hits": 2 * len(dishes), "misses": len(dishes)}
+        )
+
+
+class QuerysetCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="dennie",
+            password="testpassword"
+        )
+        cls.dish_type = DishType.objects.create(name="Main Course")
+        for data in dish_data[:4]:
+            Dish.objects.create(
+                name=data["name"],
+                description=data["description"],
+                price=data["price"],
+                dish_type=cls.dish_type,
+                image=data["image"]
+            )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def count_queries(self, url: str, data: dict | None = None) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        return len([
+            query for query in queries.captured_queries
+            if "kitchen_dishtype" in query["sql"]
+            or "kitchen_dish" in query["sql"]
+        ])
+
+    def test_cached_list_page_skips_queries(self):
+        self.assertGreater(self.count_queries(DISH_TYPES_LIST_URL), 0)
+        self.assertEqual(self.count_queries(DISH_TYPES_LIST_URL), 0)
+
+    def test_cached_index_page_skips_queries(self):
+        self.assertGreater(self.count_queries(MAIN_PAGE_URL), 0)
+        self.assertEqual(self.count_queries(MAIN_PAGE_URL), 0)
+
+    def test_saving_row_invalidates_cached_pages(self):
+        self.client.get(DISH_TYPES_LIST_URL)
+        self.dish_type.name = "Dessert"
+        self.dish_type.save()
+
+        response = self.client.get(DISH_TYPES_LIST_URL)
+
+        self.assertContains(response, "Dessert")
+
+    def test_search_pages_are_cached_per_term(self):
+        self.client.get(DISH_TYPES_LIST_URL, {"name": "Main"})
+
+        response = self.client.get(DISH_TYPES_LIST_URL, {"name": "Soup"})
+
+        self.assertEqual(len(response.context["dish_types"]), 0)
+
+    def test_search_ids_are_cached(self):
+        search_models_cached("pizza", [Dish], limit=5, budget_ms=1000)
+
+        with self.assertNumQueries(1):
+            results, timed_out = search_models_cached(
+                "pizza", [Dish], limit=5, budget_ms=1000
+            )
+
+        self.assertFalse(timed_out)
+        self.assertEqual(
+            [dish.name for dish in results[Dish]],
+            list(
+                Dish.objects.filter(name__icontains="pizza")
+                .values_list("name", flat=True)
+            )
+        )
+
+    def test_stats_count_hits_and_misses(self):
+        self.client.get(DISH_TYPES_LIST_URL)
+        self.client.get(DISH_TYPES_LIST_URL)
+
+        self.assertEqual(
+            get_cache_stats()["dishtype"],
+            {"hits": 1, "misses": 1}
+        )
+
+        out = StringIO()
+        call_command("cache_stats", "--reset", stdout=out)
+        self.assertIn("dishtype: 1 hits, 1 misses (50.0% hit rate)",
+                      out.getvalue())
+        self.assertEqual(get_cache_stats(), {})
+
+
+class SharedCacheCheckTest(TestCase):
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    })
+    def test_process_local_cache_is_reported(self):
+        self.assertEqual(
+            [warning.id for warning in check_shared_cache(None)],
+            ["kitchen.W001"]
+        )
+
+    def test_tests_run_against_a_cache_of_their_own(self):
+        location = settings.CACHES["default"]["LOCATION"]
+
+        self.assertTrue(
+            Path(location).name.startswith("restaurant_mate_test_")
+        )
+        self.assertNotEqual(
+            Path(location),
+            Path(tempfile.gettempdir()) / "restaurant_mate_cache"
+        )
@@ -0,0 +1,166 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from kitchen.models import Dish, DishType, Ingredient
+from .db_test_data import dish_data
+
+
+MAIN_PAGE_URL = reverse("kitchen:main-page")
+DISHES_LIST_URL = reverse("kitchen:dishes-page")
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="dennie",
+            password="testpassword"
+        )
+        cls.other_user = get_user_model().objects.create_user(
+            username="ray",
+            password="testpassword"
+        )
+        cls.dish_type = DishType.objects.create(name="Main Course")
+        cls.ingredient = Ingredient.objects.create(name="Tomato")
+        for data in dish_data[:4]:
+            dish = Dish.objects.create(
+                name=data["name"],
+                description=data["description"],
+                price=data["price"],
+                dish_type=cls.dish_type,
+                image=data["image"]
+            )
+            dish.ingredients.add(cls.ingredient)
+        cls.dish = Dish.objects.first()
+        cls.dish_url = reverse(
+            "kitchen:dish-detail-page",
+            kwargs={"pk": cls.dish.pk}
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def revalidate(self, url: str, response, **headers):
+        return self.client.get(
+            url,
+            headers={"if-none-match": response["ETag"], **headers}
+        )
+
+    def test_pages_send_validators(self):
+        for url in (MAIN_PAGE_URL, DISHES_LIST_URL, self.dish_url):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.has_header("ETag"))
+            self.assertTrue(response.has_header("Last-Modified"))
+            self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_fresh_page_is_not_rendered(self):
+        # The session and the user, plus the aggregate over the one dish of
+        # the detail page. List pages don't query the dish table.
+        for url, queries in (
+            (MAIN_PAGE_URL, 2),
+            (DISHES_LIST_URL, 2),
+            (self.dish_url, 3),
+        ):
+            response = self.client.get(url)
+            with self.assertNumQueries(queries):
+                revalidated = self.revalidate(url, response)
+
+            self.assertEqual(revalidated.status_code, 304)
+            self.assertEqual(revalidated.content, b"")
+            self.assertEqual(revalidated["ETag"], response["ETag"])
+
+    def test_if_modified_since_is_honoured(self):
+        response = self.client.get(self.dish_url)
+
+        revalidated = self.client.get(
+            self.dish_url,
+            headers={"if-modified-since": response["Last-Modified"]}
+        )
+
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_saving_dish_changes_validators(self):
+        response = self.client.get(self.dish_url)
+        self.dish.price = "99.99"
+        self.dish.save()
+
+        revalidated = self.revalidate(self.dish_url, response)
+
+        self.assertEqual(revalidated.status_code, 200)
+
+    def test_saving_dish_changes_list_validators(self):
+        for url in (MAIN_PAGE_URL, DISHES_LIST_URL):
+            response = self.client.get(url)
+            Dish.objects.filter(pk=self.dish.pk).first().save()
+
+            revalidated = self.revalidate(url, response)
+
+            self.assertEqual(revalidated.status_code, 200)
+
+    def test_new_csrf_token_keeps_page_fresh(self):
+        response = self.client.get(self.dish_url)
+        self.client.cookies["csrftoken"] = "a" * 32
+
+        revalidated = self.revalidate(self.dish_url, response)
+
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertIn("Cookie", revalidated["Vary"])
+        self.assertIn("Cookie", response["Vary"])
+
+    def test_renaming_ingredient_changes_validators(self):
+        response = self.client.get(DISHES_LIST_URL)
+        self.ingredient.name = "Basil"
+        self.ingredient.save()
+
+        revalidated = self.revalidate(DISHES_LIST_URL, response)
+
+        self.assertContains(revalidated, "Basil")
+
+    def test_assignment_changes_validators(self):
+        response = self.client.get(self.dish_url)
+        self.client.post(
+            reverse("kitchen:toggle-dish-assign", args=[self.dish.pk])
+        )
+
+        revalidated = self.revalidate(self.dish_url, response)
+
+        self.assertEqual(revalidated.status_code, 200)
+
+    def test_assignment_changes_validators_without_generations(self):
+        response = self.client.get(self.dish_url)
+        with mock.patch("kitchen.signals.bump_generation"):
+            self.client.post(
+                reverse("kitchen:toggle-dish-assign", args=[self.dish.pk])
+            )
+
+        revalidated = self.revalidate(self.dish_url, response)
+
+        self.assertContains(revalidated, "Unassign me from this dish")
+
+    def test_validators_differ_per_user_and_query(self):
+        response = self.client.get(DISHES_LIST_URL)
+
+        self.assertEqual(
+            self.revalidate(
+                f"{DISHES_LIST_URL}?name=Pizza", response
+            ).status_code,
+            200
+        )
+        self.client.force_login(self.other_user)
+        self.assertEqual(
+            self.revalidate(DISHES_LIST_URL, response).status_code,
+            200
+        )
+
+    def test_missing_dish_is_not_found(self):
+        response = self.client.get(
+            reverse("kitchen:dish-detail-page", kwargs={"pk": 0})
+        )
+
+        self.assertEqual(response.status_code, 404)
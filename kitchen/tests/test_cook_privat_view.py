@@ -1,11 +1,17 @@
+import threading
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from django.urls import reverse
 from django.core.paginator import Paginator
+from django.db import connection, connections
 from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed
+from django.test.utils import CaptureQueriesContext
 
 from kitchen.models import Dish, DishType, Ingredient
 from kitchen.forms import CookSearchForm
+from kitchen.views import ToggleAssignToDishView
 from .db_test_data import users, dish_data
 
 COOKS_LIST_URL = reverse("kitchen:cooks-page")
@@ -174,3 +180,141 @@ class PrivateCookViewTest(TestCase):
             args=[self.pizza.pk])
         )
         self.assertIn(self.pizza, self.user.dishes.all())
+
+    def test_toggle_assign_returns_json_state(self):
+        url = reverse("kitchen:toggle-dish-assign", args=[self.pizza.pk])
+        headers = {"accept": "application/json"}
+
+        response = self.client.post(url, headers=headers)
+        self.assertEqual(
+            response.json(),
+            {"dish": self.pizza.pk, "is_assigned": True}
+        )
+
+        response = self.client.post(url, headers=headers)
+        self.assertEqual(
+            response.json(),
+            {"dish": self.pizza.pk, "is_assigned": False}
+        )
+
+    def test_toggle_assign_returns_form_fragment(self):
+        response = self.client.post(
+            reverse("kitchen:toggle-dish-assign", args=[self.pizza.pk]),
+            headers={"x-requested-with": "XMLHttpRequest"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(
+            response,
+            "kitchen/includes/dish_assign_form.html"
+        )
+        self.assertContains(response, "Unassign me from this dish")
+
+    def test_toggle_assign_writes_first_and_only_through_table(self):
+        for expected_writes in (("DELETE", "INSERT"), ("DELETE",)):
+            with CaptureQueriesContext(connection) as queries:
+                ToggleAssignToDishView.toggle_assignment(
+                    dish_id=self.pizza.pk,
+                    cook_id=self.user.pk
+                )
+            statements = [
+                query["sql"] for query in queries
+                if query["sql"].split()[0] not in ("SAVEPOINT", "RELEASE")
+            ]
+            writes = [
+                sql for sql in statements
+                if sql.split()[0] in ("INSERT", "UPDATE", "DELETE")
+            ]
+            self.assertEqual(
+                tuple(sql.split()[0] for sql in writes),
+                expected_writes
+            )
+            self.assertTrue(statements[0].startswith("DELETE"))
+            for sql in writes:
+                self.assertIn(Dish.cooks.through._meta.db_table, sql)
+
+    def test_toggle_assign_sends_m2m_changed(self):
+        actions = []
+
+        def receiver(action, **kwargs):
+            actions.append(action)
+
+        m2m_changed.connect(receiver, sender=Dish.cooks.through)
+        self.addCleanup(
+            m2m_changed.disconnect, receiver, sender=Dish.cooks.through
+        )
+        for _ in range(2):
+            ToggleAssignToDishView.toggle_assignment(
+                dish_id=self.pizza.pk,
+                cook_id=self.user.pk
+            )
+
+        self.assertEqual(actions, ["post_add", "post_remove"])
+
+    def test_toggle_assign_to_missing_dish_returns_404(self):
+        response = self.client.post(
+            reverse("kitchen:toggle-dish-assign", args=[0])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_cook_detail_paginates_dishes(self):
+        self.user.dishes.add(*Dish.objects.all())
+        url = reverse("kitchen:cook-detail-page", args=[self.user.slug])
+
+        page_1 = self.client.get(url)
+        page_2 = self.client.get(url, {"page": 2})
+
+        self.assertEqual(len(page_1.context["dishes"]), 6)
+        self.assertEqual(len(page_2.context["dishes"]), 1)
+        self.assertTrue(page_1.context["is_paginated"])
+        self.assertContains(page_1, "Tomato")
+
+    def test_cook_detail_query_count_ignores_number_of_dishes(self):
+        url = reverse("kitchen:cook-detail-page", args=[self.user.slug])
+        self.user.dishes.add(self.pizza)
+        with CaptureQueriesContext(connection) as one_dish_queries:
+            self.client.get(url)
+
+        self.user.dishes.add(*Dish.objects.all())
+        with CaptureQueriesContext(connection) as all_dishes_queries:
+            self.client.get(url)
+
+        self.assertEqual(len(one_dish_queries), len(all_dishes_queries))
+
+
+class ConcurrentToggleAssignTest(TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="dennie",
+            password="testpassword"
+        )
+        self.dish = Dish.objects.create(
+            name="Pizza",
+            description="Cheesy",
+            price=10,
+            dish_type=DishType.objects.create(name="Main Course")
+        )
+
+    def test_double_click_from_two_threads_does_not_fail(self):
+        barrier = threading.Barrier(2)
+        errors = []
+
+        def toggle():
+            try:
+                barrier.wait()
+                ToggleAssignToDishView.toggle_assignment(
+                    dish_id=self.dish.pk,
+                    cook_id=self.user.pk
+                )
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=toggle) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertFalse(self.dish.cooks.exists())
@@ -2,6 +2,8 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
 from django.core.paginator import Paginator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from kitchen.models import Dish, DishType, Ingredient
 from kitchen.forms import DishSearchForm
@@ -118,3 +120,33 @@ class PrivateDishViewTest(TestCase):
             list(self.dishes_page_1.context["dishes"])
             + list(self.dishes_page_2.context["dishes"])
         )
+
+    def test_dish_detail_shows_assignment_state(self):
+        dish = Dish.objects.get(name="Pizza")
+        url = reverse("kitchen:dish-detail-page", args=[dish.pk])
+
+        response = self.client.get(url)
+        self.assertFalse(response.context["dish"].is_assigned_to_current_user)
+        self.assertContains(response, "Assign me to this dish")
+
+        dish.cooks.add(self.user)
+        response = self.client.get(url)
+        self.assertTrue(response.context["dish"].is_assigned_to_current_user)
+        self.assertContains(response, "Unassign me from this dish")
+
+    def test_dish_detail_query_count_ignores_assigned_dishes(self):
+        dish = Dish.objects.get(name="Pizza")
+        dish.cooks.add(self.user)
+        url = reverse("kitchen:dish-detail-page", args=[dish.pk])
+
+        with CaptureQueriesContext(connection) as few_dishes_queries:
+            self.client.get(url)
+
+        self.user.dishes.add(*Dish.objects.all())
+        with CaptureQueriesContext(connection) as many_dishes_queries:
+            response = self.client.get(url)
+
+        self.assertEqual(len(few_dishes_queries), len(many_dishes_queries))
+        self.assertContains(response, self.user.full_name())
+        self.assertContains(response, "Tomato")
+        self.assertContains(response, self.dish_type.name)
@@ -0,0 +1,126 @@
+import csv
+import json
+import os
+import tempfile
+import warnings
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from kitchen.export import EXPORT_FIELDS, dish_row, export_lines
+from kitchen.models import Dish, DishType, Ingredient
+from .db_test_data import dish_data
+
+
+EXPORT_URL = reverse("kitchen:dishes-export")
+
+
+class MenuExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="dennie",
+            password="testpassword"
+        )
+        dish_type = DishType.objects.create(name="Main Course")
+        tomato = Ingredient.objects.create(name="Tomato")
+        cheese = Ingredient.objects.create(name="Cheese")
+        for data in dish_data[:5]:
+            dish = Dish.objects.create(
+                name=data["name"],
+                description=data["description"],
+                price=data["price"],
+                dish_type=dish_type,
+                image=data["image"]
+            )
+            dish.ingredients.add(tomato, cheese)
+            dish.cooks.add(cls.user)
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    def test_csv_export_streams_every_dish(self):
+        response = self.client.get(EXPORT_URL)
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="menu.csv"', response["Content-Disposition"])
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual(tuple(rows[0]), EXPORT_FIELDS)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["dish_type"], "Main Course")
+        self.assertEqual(rows[0]["ingredients"], "Cheese|Tomato")
+        self.assertEqual(rows[0]["cooks"], "dennie")
+
+    def test_jsonl_export(self):
+        response = self.client.get(EXPORT_URL, {"format": "jsonl"})
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        dishes = [json.loads(line) for line in lines]
+        self.assertEqual(len(dishes), 5)
+        self.assertEqual(dishes[0]["ingredients"], ["Cheese", "Tomato"])
+        self.assertEqual(dishes[0]["cooks"], ["dennie"])
+
+    async def test_asgi_export_streams_from_async_iterator(self):
+        await self.async_client.aforce_login(self.user)
+
+        with (
+            warnings.catch_warnings(),
+            mock.patch("kitchen.export.dish_row", wraps=dish_row) as row,
+        ):
+            warnings.simplefilter("error")
+            response = await self.async_client.get(EXPORT_URL)
+            self.assertTrue(response.is_async)
+            self.assertEqual(row.call_count, 0)
+
+            lines = aiter(response.streaming_content)
+            header = await anext(lines)
+            first_dish = await anext(lines)
+            self.assertEqual(row.call_count, 1)
+            rest = [line async for line in lines]
+
+        self.assertEqual(header, b",".join(
+            field.encode() for field in EXPORT_FIELDS
+        ) + b"\r\n")
+        self.assertIn(b"Main Course", first_dish)
+        self.assertEqual(len(rest), 4)
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get(EXPORT_URL, {"format": "xml"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_relations_are_prefetched_per_batch(self):
+        with CaptureQueriesContext(connection) as queries:
+            lines = list(export_lines("jsonl", batch_size=2))
+
+        self.assertEqual(len(lines), 5)
+        # One query streaming the dishes, then ingredients and cooks once
+        # for each of the three batches.
+        self.assertEqual(len(queries), 1 + 3 * 2)
+
+    def test_command_writes_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "menu.csv")
+            out = StringIO()
+
+            call_command("export_menu", "--output", path, stdout=out)
+
+            with open(path, encoding="utf-8") as exported:
+                self.assertEqual(len(exported.readlines()), 6)
+        self.assertIn("5 dishes exported", out.getvalue())
+
+    def test_command_writes_to_stdout(self):
+        out = StringIO()
+
+        call_command("export_menu", "--format", "jsonl", stdout=out)
+
+        self.assertEqual(len(out.getvalue().splitlines()), 5)
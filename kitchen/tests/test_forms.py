@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django import forms
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -12,6 +12,7 @@ from kitchen.forms import (
     CookUpdateForm,
     ProfilePictureMixin
 )
+from .media import use_temporary_media_root
 
 
 class TestProfilePictureMixin(TestCase):
@@ -111,6 +112,8 @@ class TestProfilePictureMixin(TestCase):
 
 class CookFormTest(TestCase):
     def setUp(self):
+        use_temporary_media_root(self)
+
         img = Image.new("RGB", (1, 1))
         img.putpixel((0, 0), (255, 0, 0))
         buf = io.BytesIO()
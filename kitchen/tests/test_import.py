@@ -0,0 +1,162 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from kitchen.export import export_lines
+from kitchen.importer import InvalidRow, KitchenImporter
+from kitchen.models import Dish, DishType, Ingredient
+
+
+def dish_row(number, **overrides):
+    row = {
+        "name": f"Dish {number}",
+        "description": f"Description {number}",
+        "price": "9.50",
+        "dish_type": "Main Course",
+        "ingredients": ["Tomato", "Cheese"],
+        "cooks": ["dennie"],
+    }
+    row.update(overrides)
+    return row
+
+
+class KitchenImporterTest(TestCase):
+    def test_import_creates_dishes_and_relations(self):
+        created = KitchenImporter().run([
+            dish_row(1),
+            dish_row(2, ingredients=["Basil"], cooks=["dennie", "mia"]),
+        ])
+
+        self.assertEqual(created, 2)
+        dish = Dish.objects.get(name="Dish 2")
+        self.assertEqual(dish.dish_type.name, "Main Course")
+        self.assertEqual(
+            sorted(dish.ingredients.values_list("name", flat=True)),
+            ["Basil"]
+        )
+        self.assertEqual(
+            sorted(dish.cooks.values_list("username", flat=True)),
+            ["dennie", "mia"]
+        )
+        self.assertEqual(DishType.objects.count(), 1)
+        self.assertEqual(Ingredient.objects.count(), 3)
+
+    def test_import_reuses_existing_rows(self):
+        dish_type = DishType.objects.create(name="Main Course")
+        tomato = Ingredient.objects.create(name="Tomato")
+        cook = get_user_model().objects.create_user(username="dennie")
+
+        KitchenImporter().run([dish_row(1)])
+
+        dish = Dish.objects.get()
+        self.assertEqual(dish.dish_type, dish_type)
+        self.assertIn(tomato, dish.ingredients.all())
+        self.assertEqual(list(dish.cooks.all()), [cook])
+        self.assertEqual(DishType.objects.count(), 1)
+
+    def test_new_cooks_get_unique_slugs_and_no_password(self):
+        get_user_model().objects.create_user(username="anna")
+
+        KitchenImporter().run([dish_row(1, cooks=["Anna", "ANNA"])])
+
+        slugs = set(get_user_model().objects.values_list("slug", flat=True))
+        self.assertEqual(slugs, {"anna", "anna-1", "anna-2"})
+        cook = get_user_model().objects.get(username="Anna")
+        self.assertFalse(cook.has_usable_password())
+
+    def test_batches_use_a_fixed_number_of_queries(self):
+        KitchenImporter().run([dish_row(0)])
+
+        with CaptureQueriesContext(connection) as small:
+            KitchenImporter(batch_size=100).run(
+                dish_row(number) for number in range(5)
+            )
+        with CaptureQueriesContext(connection) as large:
+            KitchenImporter(batch_size=100).run(
+                dish_row(number) for number in range(50)
+            )
+
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(Dish.objects.count(), 56)
+
+    def test_invalid_row_reports_its_line(self):
+        with self.assertRaisesMessage(InvalidRow, "Row 2"):
+            KitchenImporter().run([dish_row(1), dish_row(2, price="free")])
+
+
+class ImportCommandTest(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, lines):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8", newline="") as output:
+            output.writelines(lines)
+        return path
+
+    def test_jsonl_import(self):
+        path = self.write(
+            "menu.jsonl",
+            [json.dumps(dish_row(number)) + "\n" for number in range(3)]
+        )
+        out = StringIO()
+
+        call_command("import_kitchen", path, "--batch-size=2", stdout=out)
+
+        self.assertEqual(Dish.objects.count(), 3)
+        self.assertIn("2 dishes imported...", out.getvalue())
+        self.assertIn("3 dishes imported from menu.jsonl.", out.getvalue())
+
+    def test_csv_error_names_the_file_line(self):
+        path = self.write("menu.csv", [
+            "name,price,dish_type\n",
+            "Soup,5,Starter\n",
+            "Stew,free,Main Course\n",
+        ])
+
+        with self.assertRaisesMessage(CommandError, "Row 3: invalid price"):
+            call_command("import_kitchen", path, stdout=StringIO())
+
+    def test_jsonl_row_must_be_an_object(self):
+        path = self.write("menu.jsonl", [
+            json.dumps(dish_row(1)) + "\n",
+            json.dumps(["Dish 2", "9.50"]) + "\n",
+        ])
+
+        with self.assertRaisesMessage(
+            CommandError,
+            "Line 2 is not a JSON object."
+        ):
+            call_command("import_kitchen", path, stdout=StringIO())
+        self.assertFalse(Dish.objects.exists())
+
+    def test_csv_export_round_trip(self):
+        KitchenImporter().run(dish_row(number) for number in range(3))
+        path = self.write("menu.csv", list(export_lines("csv")))
+        Dish.objects.all().delete()
+
+        call_command("import_kitchen", path, stdout=StringIO())
+
+        self.assertEqual(Dish.objects.count(), 3)
+        dish = Dish.objects.get(name="Dish 1")
+        self.assertEqual(
+            sorted(dish.ingredients.values_list("name", flat=True)),
+            ["Cheese", "Tomato"]
+        )
+        self.assertEqual(Ingredient.objects.count(), 2)
+        self.assertEqual(get_user_model().objects.count(), 1)
+
+    def test_unknown_format_is_rejected(self):
+        path = self.write("menu.txt", [])
+
+        with self.assertRaisesMessage(CommandError, "--format"):
+            call_command("import_kitchen", path)
@@ -0,0 +1,199 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from kitchen.jobs import (
+    MAX_ATTEMPTS,
+    RUNNING_TIMEOUT,
+    enqueue_image_job,
+    is_pending,
+    run_pending_jobs,
+)
+from kitchen.models import Dish, DishType, ImageJob
+from kitchen.thumbnails import has_thumbnails
+from .media import make_image, use_temporary_media_root
+
+
+class ImageJobTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        use_temporary_media_root(cls, KITCHEN_IMAGE_JOBS="manual")
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.dish_type = DishType.objects.create(name="Main Course")
+
+    def create_dish(self, image) -> Dish:
+        with self.captureOnCommitCallbacks(execute=True):
+            return Dish.objects.create(
+                name="Pizza",
+                description="Pizza",
+                price=10,
+                dish_type=self.dish_type,
+                image=image
+            )
+
+    def render_image(self, dish: Dish) -> str:
+        return Template(
+            "{% load responsive_images %}"
+            "{% responsive_image dish.image %}"
+        ).render(Context({"dish": dish}))
+
+    def test_upload_queues_job_instead_of_processing(self):
+        dish = self.create_dish(make_image())
+
+        job = ImageJob.objects.get()
+        self.assertEqual(job.model_label, "kitchen.dish")
+        self.assertEqual(job.object_id, dish.pk)
+        self.assertEqual(job.file_name, dish.image.name)
+        self.assertEqual(job.status, ImageJob.Status.PENDING)
+        self.assertFalse(has_thumbnails(dish.image))
+
+    def test_rolled_back_upload_leaves_no_placeholder(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                dish = Dish.objects.create(
+                    name="Pizza",
+                    description="Pizza",
+                    price=10,
+                    dish_type=self.dish_type,
+                    image=make_image()
+                )
+                raise RuntimeError
+
+        self.assertFalse(is_pending(dish.image))
+        self.assertFalse(ImageJob.objects.exists())
+
+    def test_reupload_with_thumbnails_queues_nothing(self):
+        image = make_image()
+        self.create_dish(image)
+        run_pending_jobs()
+
+        image.seek(0)
+        self.create_dish(image)
+
+        self.assertEqual(ImageJob.objects.count(), 1)
+
+    def test_saves_without_new_upload_queue_nothing(self):
+        dish = self.create_dish("dish_images/existing.jpg")
+        dish.name = "Pasta"
+        dish.save()
+
+        self.assertFalse(ImageJob.objects.exists())
+
+    def test_placeholder_is_shown_until_job_is_done(self):
+        dish = self.create_dish(make_image())
+
+        self.assertTrue(is_pending(dish.image))
+        self.assertIn("image-pending", self.render_image(dish))
+
+        self.assertEqual(run_pending_jobs(), 1)
+
+        self.assertEqual(ImageJob.objects.get().status, ImageJob.Status.DONE)
+        self.assertFalse(is_pending(dish.image))
+        self.assertIn("<picture>", self.render_image(dish))
+
+    def test_failed_job_is_retried_then_marked_failed(self):
+        self.create_dish(make_image())
+
+        with mock.patch(
+            "kitchen.jobs.generate_thumbnails",
+            side_effect=OSError("disk full")
+        ):
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                ImageJob.objects.update(run_after="2000-01-01T00:00Z")
+                run_pending_jobs()
+                job = ImageJob.objects.get()
+                self.assertEqual(job.attempts, attempt)
+
+        self.assertEqual(job.status, ImageJob.Status.FAILED)
+        self.assertEqual(job.last_error, "OSError: disk full")
+
+    def test_retry_is_delayed(self):
+        self.create_dish(make_image())
+
+        with mock.patch(
+            "kitchen.jobs.generate_thumbnails",
+            side_effect=OSError("disk full")
+        ):
+            run_pending_jobs()
+
+        self.assertEqual(run_pending_jobs(), 0)
+        self.assertEqual(
+            ImageJob.objects.get().status,
+            ImageJob.Status.PENDING
+        )
+
+    def test_job_of_replaced_image_does_no_work(self):
+        dish = self.create_dish(make_image())
+        Dish.objects.filter(pk=dish.pk).update(image="dish_images/new.jpg")
+
+        with mock.patch("kitchen.jobs.generate_thumbnails") as generate:
+            run_pending_jobs()
+
+        generate.assert_not_called()
+        self.assertEqual(ImageJob.objects.get().status, ImageJob.Status.DONE)
+
+    def test_upload_while_job_runs_queues_nothing(self):
+        dish = self.create_dish(make_image())
+        ImageJob.objects.update(status=ImageJob.Status.RUNNING)
+
+        enqueue_image_job(dish, "image")
+
+        self.assertEqual(ImageJob.objects.count(), 1)
+
+    def test_job_of_dead_worker_is_claimed_again(self):
+        self.create_dish(make_image())
+        ImageJob.objects.update(status=ImageJob.Status.RUNNING, attempts=1)
+        self.assertEqual(run_pending_jobs(), 0)
+
+        ImageJob.objects.update(
+            updated_at=timezone.now() - RUNNING_TIMEOUT
+        )
+
+        self.assertEqual(run_pending_jobs(), 1)
+        job = ImageJob.objects.get()
+        self.assertEqual(job.status, ImageJob.Status.DONE)
+        self.assertEqual(job.attempts, 2)
+
+    def test_abandoned_job_out_of_attempts_is_failed(self):
+        self.create_dish(make_image())
+        ImageJob.objects.update(
+            status=ImageJob.Status.RUNNING,
+            attempts=MAX_ATTEMPTS,
+            updated_at=timezone.now() - RUNNING_TIMEOUT
+        )
+
+        self.assertEqual(run_pending_jobs(), 0)
+        self.assertEqual(ImageJob.objects.get().status, ImageJob.Status.FAILED)
+
+    def test_admin_retries_failed_jobs(self):
+        self.create_dish(make_image())
+        ImageJob.objects.update(
+            status=ImageJob.Status.FAILED,
+            attempts=MAX_ATTEMPTS
+        )
+        admin_user = get_user_model().objects.create_superuser(
+            username="admin",
+            password="adminpassword"
+        )
+        self.client.force_login(admin_user)
+
+        self.client.post(
+            reverse("admin:kitchen_imagejob_changelist"),
+            {
+                "action": "retry_jobs",
+                "_selected_action": [ImageJob.objects.get().pk],
+            }
+        )
+
+        job = ImageJob.objects.get()
+        self.assertEqual(job.status, ImageJob.Status.PENDING)
+        self.assertEqual(job.attempts, 0)
@@ -0,0 +1,48 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class RegenerateCookSlugsCommandTest(TestCase):
+    def setUp(self):
+        self.renamed = get_user_model().objects.create_user(
+            username="john",
+            first_name="John",
+            last_name="Wick",
+        )
+        self.untouched = get_user_model().objects.create_user(
+            username="ray",
+            first_name="Ray",
+            last_name="Charles",
+        )
+        self.namesake = get_user_model().objects.create_user(
+            username="jonathan",
+            first_name="Jonathan",
+            last_name="Wick",
+        )
+        get_user_model().objects.filter(pk=self.renamed.pk).update(
+            first_name="Jonathan"
+        )
+        get_user_model().objects.filter(pk=self.untouched.pk).update(slug="")
+
+    def test_regenerates_stale_and_missing_slugs_only(self):
+        out = StringIO()
+        call_command("regenerate_cook_slugs", batch_size=1, stdout=out)
+
+        self.renamed.refresh_from_db()
+        self.untouched.refresh_from_db()
+        self.namesake.refresh_from_db()
+        self.assertEqual(self.renamed.slug, "jonathan-wick-1")
+        self.assertEqual(self.untouched.slug, "ray-charles")
+        self.assertEqual(self.namesake.slug, "jonathan-wick")
+        self.assertIn("3 cooks checked, 2 slugs updated.", out.getvalue())
+
+    def test_dry_run_does_not_save(self):
+        out = StringIO()
+        call_command("regenerate_cook_slugs", dry_run=True, stdout=out)
+
+        self.renamed.refresh_from_db()
+        self.assertEqual(self.renamed.slug, "john-wick")
+        self.assertIn("2 slugs would be updated.", out.getvalue())
@@ -0,0 +1,291 @@
+import json
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from kitchen.middleware import (
+    AsyncWhiteNoiseMiddleware,
+    StorePreviousURLMiddleware,
+)
+
+
+REFERER = "http://testserver/dishes/"
+
+
+class StorePreviousURLMiddlewareTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = StorePreviousURLMiddleware(
+            lambda request: HttpResponse()
+        )
+
+    def make_request(self, path="/", referer=REFERER, session_data=None):
+        request = self.factory.get(path, HTTP_REFERER=referer)
+        SessionMiddleware(lambda request: HttpResponse()).process_request(
+            request
+        )
+        request.session.update(session_data or {})
+        request.session.accessed = request.session.modified = False
+        return request
+
+    def test_stores_new_referer_in_session(self):
+        request = self.make_request()
+        self.middleware(request)
+
+        self.assertEqual(request.session["previous_url"], REFERER)
+        self.assertEqual(request.previous_url, REFERER)
+        self.assertTrue(request.session.modified)
+
+    def test_unchanged_referer_does_not_modify_session(self):
+        request = self.make_request(session_data={"previous_url": REFERER})
+        self.middleware(request)
+
+        self.assertEqual(request.previous_url, REFERER)
+        self.assertFalse(request.session.modified)
+
+    def test_missing_referer_without_stored_value_does_not_modify_session(
+        self
+    ):
+        request = self.make_request(referer=None)
+        del request.META["HTTP_REFERER"]
+        self.middleware(request)
+
+        self.assertIsNone(request.previous_url)
+        self.assertFalse(request.session.modified)
+
+    def test_excluded_paths_read_but_do_not_store(self):
+        stored_url = "http://testserver/cooks/"
+        for path in ("/static/app.css", "/files/dish.jpg", "/admin/"):
+            request = self.make_request(
+                path=path,
+                session_data={"previous_url": stored_url}
+            )
+            self.middleware(request)
+
+            self.assertEqual(request.previous_url, stored_url)
+            self.assertEqual(request.session["previous_url"], stored_url)
+            self.assertFalse(request.session.modified)
+
+    @override_settings(PREVIOUS_URL_STORAGE="cookie")
+    def test_excluded_paths_read_but_do_not_store_cookie(self):
+        middleware = StorePreviousURLMiddleware(lambda request: HttpResponse())
+        cookie = middleware(self.make_request()).cookies["previous_url"]
+
+        request = self.make_request(path="/admin/", referer=None)
+        request.COOKIES["previous_url"] = cookie.value
+        excluded_response = middleware(request)
+
+        self.assertEqual(request.previous_url, REFERER)
+        self.assertNotIn("previous_url", excluded_response.cookies)
+
+    @override_settings(PREVIOUS_URL_STORAGE="cookie")
+    def test_cookie_storage_sets_signed_cookie_only_on_change(self):
+        middleware = StorePreviousURLMiddleware(lambda request: HttpResponse())
+        request = self.make_request()
+        response = middleware(request)
+
+        self.assertFalse(request.session.accessed)
+        cookie = response.cookies["previous_url"]
+        self.assertNotEqual(cookie.value, REFERER)
+
+        repeated_request = self.make_request()
+        repeated_request.COOKIES["previous_url"] = cookie.value
+        repeated_response = middleware(repeated_request)
+
+        self.assertEqual(repeated_request.previous_url, REFERER)
+        self.assertNotIn("previous_url", repeated_response.cookies)
+
+
+class AsyncStorePreviousURLMiddlewareTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+        async def get_response(request):
+            return HttpResponse()
+
+        self.get_response = get_response
+
+    def make_request(self, path="/"):
+        request = self.factory.get(path, HTTP_REFERER=REFERER)
+        SessionMiddleware(lambda request: HttpResponse()).process_request(
+            request
+        )
+        return request
+
+    async def test_runs_as_coroutine_and_stores_referer(self):
+        middleware = StorePreviousURLMiddleware(self.get_response)
+        request = self.make_request()
+
+        self.assertTrue(iscoroutinefunction(middleware))
+        await middleware(request)
+
+        self.assertEqual(request.previous_url, REFERER)
+        self.assertTrue(request.session.modified)
+
+    async def test_excluded_path_gets_stored_value(self):
+        middleware = StorePreviousURLMiddleware(self.get_response)
+        request = self.make_request(path="/admin/")
+        await sync_to_async(request.session.__setitem__)(
+            "previous_url",
+            "http://testserver/cooks/"
+        )
+        request.session.modified = False
+
+        await middleware(request)
+
+        self.assertEqual(request.previous_url, "http://testserver/cooks/")
+        self.assertFalse(request.session.modified)
+
+    @override_settings(PREVIOUS_URL_STORAGE="cookie")
+    async def test_cookie_storage_stays_on_event_loop(self):
+        middleware = StorePreviousURLMiddleware(self.get_response)
+        request = self.make_request()
+
+        with mock.patch("kitchen.middleware.sync_to_async") as to_thread:
+            response = await middleware(request)
+
+        to_thread.assert_not_called()
+        self.assertIn("previous_url", response.cookies)
+        self.assertFalse(request.session.accessed)
+
+
+@override_settings(KITCHEN_TIMING_SAMPLE_RATE=1)
+class PerformanceMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="dennie",
+            password="testpassword"
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def server_timing(self, response) -> dict:
+        metrics = {}
+        for metric in response["Server-Timing"].split(", "):
+            name, *params = metric.split(";")
+            metrics[name] = dict(param.split("=", 1) for param in params)
+        return metrics
+
+    def test_sampled_request_reports_timings(self):
+        with self.assertLogs("kitchen.performance", "INFO") as logs:
+            response = self.client.get(reverse("kitchen:dishes-page"))
+
+        metrics = self.server_timing(response)
+        self.assertEqual(set(metrics), {"db", "view", "tpl", "total"})
+        self.assertGreater(float(metrics["tpl"]["dur"]), 0)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["url_name"], "kitchen:dishes-page")
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["db_queries"], 0)
+        self.assertEqual(
+            metrics["db"]["desc"],
+            f'"{record["db_queries"]} queries"'
+        )
+
+    def test_measures_propagate_at_info_level(self):
+        logger = logging.getLogger("kitchen.performance")
+
+        self.assertTrue(logger.isEnabledFor(logging.INFO))
+        self.assertTrue(logger.propagate)
+        self.assertEqual(logger.handlers, [])
+
+    def test_dropped_log_line_is_not_serialized(self):
+        logger = logging.getLogger("kitchen.performance")
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.WARNING)
+
+        with mock.patch("kitchen.middleware.json") as json_module:
+            response = self.client.get(reverse("kitchen:dishes-page"))
+
+        json_module.dumps.assert_not_called()
+        self.assertIn("Server-Timing", response)
+
+    @override_settings(KITCHEN_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_request_is_left_alone(self):
+        response = self.client.get(reverse("kitchen:dishes-page"))
+
+        self.assertNotIn("Server-Timing", response)
+
+    async def test_async_view_queries_are_counted(self):
+        await self.async_client.aforce_login(self.user)
+
+        with self.assertLogs("kitchen.performance", "INFO") as logs:
+            response = await self.async_client.get(
+                reverse("kitchen:api-list", kwargs={"resource": "dishes"})
+            )
+
+        self.assertIn("Server-Timing", response)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["url_name"], "kitchen:api-list")
+        self.assertGreater(record["db_queries"], 0)
+
+
+class TimingDefaultTest(TestCase):
+    def test_tests_measure_no_request_unless_asked(self):
+        user = get_user_model().objects.create_user(
+            username="dennie",
+            password="testpassword"
+        )
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("kitchen:dishes-page"))
+
+        self.assertNotIn("Server-Timing", response)
+
+
+class AsyncWhiteNoiseMiddlewareTest(TestCase):
+    def setUp(self):
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root)
+        self.content = b"body { color: tomato; }\n" * 5000
+        Path(static_root, "app.css").write_bytes(self.content)
+        settings_override = override_settings(STATIC_ROOT=static_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        async def get_response(request):
+            return HttpResponse("page")
+
+        self.middleware = AsyncWhiteNoiseMiddleware(get_response)
+
+    async def test_streams_static_file_from_async_iterator(self):
+        request = RequestFactory().get("/static/app.css")
+
+        self.assertTrue(iscoroutinefunction(self.middleware))
+        response = await self.middleware(request)
+
+        self.assertTrue(response.is_async)
+        self.assertEqual(
+            b"".join([chunk async for chunk in response]),
+            self.content
+        )
+
+    async def test_other_requests_reach_django(self):
+        response = await self.middleware(RequestFactory().get("/dishes/"))
+
+        self.assertEqual(response.content, b"page")
+
+    # The debug toolbar is sync only, and only loaded for development.
+    @override_settings(
+        DEBUG=True,
+        MIDDLEWARE=[
+            path for path in settings.MIDDLEWARE
+            if not path.startswith("debug_toolbar.")
+        ]
+    )
+    def test_asgi_stack_needs_no_adapting(self):
+        with self.assertNoLogs("django.request", "DEBUG"):
+            ASGIHandler()
@@ -1,8 +1,13 @@
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.urls import reverse
 
-from kitchen.models import DishType, Ingredient, Dish
+from kitchen.models import DishType, Ingredient, Dish, allocate_slug
 
 
 class ModelsTests(TestCase):
@@ -39,6 +44,96 @@ class ModelsTests(TestCase):
             f"{self.cook.first_name.lower()}-{self.cook.last_name.lower()}"
         )
 
+    def test_cook_namesakes_get_numbered_slugs(self):
+        namesakes = [
+            get_user_model().objects.create_user(
+                username=f"namesake{num}",
+                first_name="Test_first_name",
+                last_name="Test_last_name",
+            )
+            for num in range(3)
+        ]
+        self.assertEqual(
+            [cook.slug for cook in namesakes],
+            [f"{self.cook.slug}-{num}" for num in range(1, 4)]
+        )
+
+    def test_generate_unique_slug_uses_single_query(self):
+        for num in range(5):
+            get_user_model().objects.create_user(
+                username=f"namesake{num}",
+                first_name="Test_first_name",
+                last_name="Test_last_name",
+            )
+        cook = get_user_model()(
+            username="newcomer",
+            first_name="Test_first_name",
+            last_name="Test_last_name",
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                cook.generate_unique_slug(),
+                f"{self.cook.slug}-6"
+            )
+
+    def test_allocate_slug_fills_first_gap(self):
+        self.assertEqual(allocate_slug("chef", set()), "chef")
+        self.assertEqual(
+            allocate_slug("chef", {"chef", "chef-1", "chef-3", "chefs-2"}),
+            "chef-2"
+        )
+
+    def test_cook_save_retries_when_slug_is_taken_concurrently(self):
+        taken_slug = self.cook.slug
+        free_slug = f"{taken_slug}-1"
+        with mock.patch.object(
+            get_user_model(),
+            "generate_unique_slug",
+            side_effect=[taken_slug, free_slug],
+        ):
+            cook = get_user_model().objects.create_user(
+                username="racer",
+                first_name="Test_first_name",
+                last_name="Test_last_name",
+            )
+        self.assertEqual(cook.slug, free_slug)
+
+    def test_cook_login_costs_single_update(self):
+        cook = get_user_model().objects.get(pk=self.cook.pk)
+        with CaptureQueriesContext(connection) as queries:
+            update_last_login(None, cook)
+
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]["sql"].startswith("UPDATE"))
+
+    def test_cook_save_keeps_slug_when_names_unchanged(self):
+        cook = get_user_model().objects.get(pk=self.cook.pk)
+        cook.bio = "New bio"
+        with CaptureQueriesContext(connection) as queries:
+            cook.save()
+
+        self.assertFalse(
+            any(query["sql"].startswith("SELECT") for query in queries)
+        )
+        self.assertEqual(cook.slug, self.cook.slug)
+
+    def test_cook_save_regenerates_slug_when_name_changed(self):
+        cook = get_user_model().objects.get(pk=self.cook.pk)
+        cook.last_name = "Renamed"
+        cook.save(update_fields=["last_name"])
+
+        cook.refresh_from_db()
+        self.assertEqual(cook.slug, "test_first_name-renamed")
+
+    def test_cook_loaded_without_names_reads_them_before_save(self):
+        cook = get_user_model().objects.only("pk", "slug").get(
+            pk=self.cook.pk
+        )
+        cook.first_name = "Other"
+        cook.save()
+
+        self.assertEqual(cook.slug, "other-test_last_name")
+
     def test_cook_get_absolute_url(self):
         self.assertEqual(
             self.cook.get_absolute_url(),
@@ -0,0 +1,167 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from kitchen.models import Dish, DishType
+from kitchen.pagination import InvalidCursor, KeysetPaginator
+from kitchen.search import get_search_backend
+from .db_test_data import dish_data
+
+
+DISHES_LIST_URL = reverse("kitchen:dishes-page")
+
+
+class KeysetPaginatorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        dish_type = DishType.objects.create(name="Main Course")
+        for data in dish_data + dish_data[:2]:
+            Dish.objects.create(
+                name=data["name"],
+                description=data["description"],
+                price=data["price"],
+                dish_type=dish_type,
+                image=data["image"]
+            )
+        cls.expected = list(Dish.objects.order_by("name", "pk"))
+
+    def test_walks_forward_and_back_through_duplicate_names(self):
+        paginator = KeysetPaginator(Dish.objects.all(), per_page=4)
+
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        third = paginator.page(second.next_cursor)
+
+        self.assertEqual(
+            list(first) + list(second) + list(third),
+            self.expected
+        )
+        self.assertFalse(first.has_previous())
+        self.assertFalse(third.has_next())
+        self.assertEqual(
+            list(paginator.page(third.previous_cursor)),
+            list(second)
+        )
+        self.assertEqual(
+            list(paginator.page(second.previous_cursor)),
+            list(first)
+        )
+
+    def test_page_costs_single_query_without_count(self):
+        paginator = KeysetPaginator(Dish.objects.all(), per_page=4)
+        cursor = paginator.page().next_cursor
+
+        with CaptureQueriesContext(connection) as queries:
+            paginator.page(cursor)
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("COUNT", queries[0]["sql"])
+
+    def test_tampered_cursor_is_rejected(self):
+        paginator = KeysetPaginator(Dish.objects.all(), per_page=4)
+        cursor = paginator.page().next_cursor
+
+        with self.assertRaises(InvalidCursor):
+            paginator.page(cursor[:-1] + "x")
+
+
+@override_settings(KITCHEN_PAGINATION_MODE="keyset")
+class KeysetListViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="dennie")
+        dish_type = DishType.objects.create(name="Main Course")
+        for num in range(8):
+            Dish.objects.create(
+                name=f"Soup {num}",
+                description="",
+                price=5,
+                dish_type=dish_type,
+                image="dish.jpg"
+            )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_list_view_pages_with_cursor_and_keeps_search(self):
+        response = self.client.get(DISHES_LIST_URL, {"name": "soup"})
+
+        page_obj = response.context["page_obj"]
+        self.assertTrue(page_obj.is_keyset)
+        self.assertEqual(len(response.context["dishes"]), 6)
+        next_query = urlencode(
+            {"name": "soup", "cursor": page_obj.next_cursor}
+        )
+        self.assertContains(response, next_query.replace("&", "&amp;"))
+
+        response = self.client.get(
+            DISHES_LIST_URL,
+            {"name": "soup", "cursor": page_obj.next_cursor}
+        )
+        self.assertEqual(
+            [dish.name for dish in response.context["dishes"]],
+            ["Soup 6", "Soup 7"]
+        )
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(DISHES_LIST_URL, {"cursor": "invalid"})
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(KITCHEN_PAGINATION_MODE="keyset")
+class KeysetSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="dennie")
+        dish_type = DishType.objects.create(name="Main Course")
+        for name in (
+            "Apple soup with many other words",
+            "Bean soup",
+            "Carrot soup and bread",
+            "Daikon soup soup",
+            "Egg soup",
+            "Fennel soup with toast",
+            "Soup soup soup",
+            "Soupy",
+        ):
+            Dish.objects.create(
+                name=name,
+                description="",
+                price=5,
+                dish_type=dish_type,
+                image="dish.jpg"
+            )
+
+    def test_pages_keep_search_ranking(self):
+        ranked = [
+            dish.name for dish in
+            get_search_backend().search(Dish.objects.all(), "soup")
+        ]
+        self.assertNotEqual(ranked, sorted(ranked))
+        self.client.force_login(self.user)
+
+        first = self.client.get(DISHES_LIST_URL, {"name": "soup"})
+        second = self.client.get(
+            DISHES_LIST_URL,
+            {"name": "soup", "cursor": first.context["page_obj"].next_cursor}
+        )
+        previous = self.client.get(
+            DISHES_LIST_URL,
+            {
+                "name": "soup",
+                "cursor": second.context["page_obj"].previous_cursor,
+            }
+        )
+
+        self.assertEqual(
+            [dish.name for dish in first.context["dishes"]]
+            + [dish.name for dish in second.context["dishes"]],
+            ranked
+        )
+        self.assertEqual(
+            list(previous.context["dishes"]),
+            list(first.context["dishes"])
+        )
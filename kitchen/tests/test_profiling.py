@@ -0,0 +1,117 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from kitchen.models import DishType
+from kitchen.profiling import SlowQueryLog, fingerprint, slow_query_log
+
+
+class FingerprintTest(TestCase):
+    def test_literals_and_in_lists_collapse(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM dish WHERE id IN (1, 2, 3)"),
+            fingerprint("SELECT *  FROM dish WHERE id IN (%s, %s)"),
+        )
+        self.assertEqual(
+            fingerprint("SELECT * FROM dish WHERE name = 'Soup'"),
+            fingerprint("SELECT * FROM dish WHERE name = 'It''s pie'"),
+        )
+
+    def test_different_queries_differ(self):
+        self.assertNotEqual(
+            fingerprint("SELECT * FROM dish WHERE id = 1"),
+            fingerprint("SELECT * FROM dish WHERE price = 1"),
+        )
+
+
+class SlowQueryLogTest(TestCase):
+    def entry(self, sql, duration_ms=1.0, url_name=None):
+        return {
+            "fingerprint": fingerprint(sql),
+            "sql": sql,
+            "duration_ms": duration_ms,
+            "url_name": url_name,
+            "plan": "SCAN dish",
+        }
+
+    def test_buffer_is_bounded(self):
+        log = SlowQueryLog(maxlen=3)
+        for num in range(5):
+            log.add(self.entry(f"SELECT {num} FROM dish_{num}"))
+
+        self.assertEqual(
+            [entry["sql"] for entry in log.recent()],
+            [f"SELECT {num} FROM dish_{num}" for num in (4, 3, 2)]
+        )
+
+    def test_groups_sum_up_per_fingerprint(self):
+        log = SlowQueryLog()
+        log.add(self.entry("SELECT 1", 5.0, "kitchen:index"))
+        log.add(self.entry("SELECT 2", 7.0, "kitchen:dishes-page"))
+        log.add(self.entry("SELECT name FROM dish", 1.0))
+
+        group = log.groups()[0]
+        self.assertEqual(group["count"], 2)
+        self.assertEqual(group["total_ms"], 12.0)
+        self.assertEqual(group["max_ms"], 7.0)
+        self.assertEqual(
+            group["url_names"],
+            {"kitchen:index", "kitchen:dishes-page"}
+        )
+        self.assertEqual(group["plan"], "SCAN dish")
+        self.assertFalse(log.needs_plan(fingerprint("SELECT 3")))
+
+
+@override_settings(KITCHEN_SLOW_QUERY_MS=0)
+class SlowQueryCaptureTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cook = get_user_model().objects.create_user(
+            username="dennie",
+            password="testpassword"
+        )
+        cls.staff = get_user_model().objects.create_user(
+            username="staff",
+            password="testpassword",
+            is_staff=True
+        )
+        DishType.objects.create(name="Soup")
+
+    def setUp(self):
+        slow_query_log.clear()
+        self.addCleanup(slow_query_log.clear)
+
+    def test_slow_query_is_recorded_with_origin_and_plan(self):
+        self.client.force_login(self.cook)
+        with self.assertLogs("kitchen.slow_queries", "WARNING"):
+            self.client.get(reverse("kitchen:dish-types-page"))
+
+        entries = [
+            entry for entry in slow_query_log.recent()
+            if "kitchen_dishtype" in entry["sql"]
+        ]
+        self.assertTrue(entries)
+        url = reverse("kitchen:dish-types-page")
+        self.assertEqual(entries[0]["url_name"], "kitchen:dish-types-page")
+        self.assertEqual(entries[0]["path"], url)
+        self.assertIn("DishTypeListView", entries[0]["view"])
+        self.assertTrue(
+            any(group["plan"] for group in slow_query_log.groups())
+        )
+
+    @override_settings(KITCHEN_SLOW_QUERY_MS=None)
+    def test_capture_can_be_disabled(self):
+        list(DishType.objects.all())
+
+        self.assertEqual(slow_query_log.recent(), [])
+
+    def test_view_is_staff_only(self):
+        list(DishType.objects.all())
+        self.client.force_login(self.cook)
+        response = self.client.get(reverse("kitchen:slow-queries"))
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse("kitchen:slow-queries"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "kitchen_dishtype")
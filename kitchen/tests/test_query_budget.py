@@ -0,0 +1,153 @@
+import time
+from itertools import cycle, islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from kitchen import urls
+from kitchen.models import Dish, DishType, Ingredient
+from .db_test_data import dish_data, dish_types, ingredients, users
+
+
+SIZES = (10, 1000)
+
+# Routes that change data are posted to, the rest are fetched.
+POST_ROUTES = {"toggle-dish-assign"}
+
+
+def seed(dishes: int) -> dict:
+    """
+    Builds the users, dish types and ingredients of ``db_test_data`` and
+    ``dishes`` dishes cycling through its dishes, each with two cooks and
+    three ingredients.
+    """
+    cooks = [
+        get_user_model().objects.create_user(**data) for data in users
+    ]
+    # The visiting cook is staff, so the staff-only pages are checked too.
+    cooks[0].is_staff = True
+    cooks[0].save(update_fields=["is_staff"])
+    types = DishType.objects.bulk_create(
+        DishType(**data) for data in dish_types
+    )
+    kitchen_ingredients = Ingredient.objects.bulk_create(
+        Ingredient(**data) for data in ingredients
+    )
+    created = Dish.objects.bulk_create(
+        Dish(
+            name=f"{data['name']} {num}",
+            description=data["description"],
+            price=data["price"],
+            image=data["image"],
+            dish_type=types[num % len(types)],
+        )
+        for num, data in enumerate(islice(cycle(dish_data), dishes))
+    )
+    Dish.cooks.through.objects.bulk_create(
+        Dish.cooks.through(dish=dish, cook=cooks[(num + step) % len(cooks)])
+        for num, dish in enumerate(created)
+        for step in range(2)
+    )
+    Dish.ingredients.through.objects.bulk_create(
+        Dish.ingredients.through(
+            dish=dish,
+            ingredient=kitchen_ingredients[
+                (num + step) % len(kitchen_ingredients)
+            ]
+        )
+        for num, dish in enumerate(created)
+        for step in range(3)
+    )
+    return {
+        "cook": cooks[0],
+        "dish": created[0],
+        "dish_type": types[0],
+        "ingredient": kitchen_ingredients[0],
+    }
+
+
+def route_kwargs(name: str, objects: dict) -> dict:
+    """
+    Returns the URL kwargs of route ``name``. A new route with arguments
+    has to be added here, so it can't escape the budget check.
+    """
+    slug = {"slug": objects["cook"].slug}
+    dish = {"pk": objects["dish"].pk}
+    return {
+        "cook-detail-page": slug,
+        "cook-update": slug,
+        "cook-delete": slug,
+        "dish-detail-page": dish,
+        "dish-update": dish,
+        "dish-delete": dish,
+        "toggle-dish-assign": dish,
+        "dish-type-update": {"pk": objects["dish_type"].pk},
+        "dish-type-delete": {"pk": objects["dish_type"].pk},
+        "ingredient-update": {"pk": objects["ingredient"].pk},
+        "ingredient-delete": {"pk": objects["ingredient"].pk},
+        "api-list": {"resource": "dishes"},
+        "api-detail": {"resource": "dishes", **dish},
+    }.get(name, {})
+
+
+@override_settings(KITCHEN_SLOW_QUERY_MS=None)
+class QueryBudgetTest(TestCase):
+    """
+    Visits every named route of ``kitchen.urls`` with a small and a large
+    menu and checks that no page makes more queries as the menu grows.
+    Slow query capture is off, as its ``EXPLAIN`` would skew the counts.
+    """
+
+    def visit(self, name: str, objects: dict) -> tuple[int, int, float]:
+        url = reverse(f"kitchen:{name}", kwargs=route_kwargs(name, objects))
+        send = self.client.post if name in POST_ROUTES else self.client.get
+        cache.clear()
+        ContentType.objects.clear_cache()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = send(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            elapsed = (time.perf_counter() - started) * 1000
+        return response.status_code, len(queries), elapsed
+
+    def test_query_counts_do_not_grow_with_the_menu(self):
+        route_names = [
+            pattern.name for pattern in urls.urlpatterns if pattern.name
+        ]
+        results = {}
+        for size in SIZES:
+            with transaction.atomic():
+                objects = seed(size)
+                self.client.force_login(objects["cook"])
+                results[size] = {
+                    name: self.visit(name, objects) for name in route_names
+                }
+                transaction.set_rollback(True)
+
+        small, large = SIZES
+        print(
+            f"\n{'route':<20} {'status':>6} "
+            f"{f'q@{small}':>7} {f'q@{large}':>7} "
+            f"{f'ms@{small}':>8} {f'ms@{large}':>8}"
+        )
+        for name in route_names:
+            status, small_queries, small_ms = results[small][name]
+            _, large_queries, large_ms = results[large][name]
+            print(
+                f"{name:<20} {status:>6} {small_queries:>7} "
+                f"{large_queries:>7} {small_ms:>8.1f} {large_ms:>8.1f}"
+            )
+
+        for name in route_names:
+            with self.subTest(route=name):
+                self.assertLess(results[large][name][0], 400)
+                self.assertLessEqual(
+                    results[large][name][1],
+                    results[small][name][1]
+                )
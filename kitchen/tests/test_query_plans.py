@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+
+from kitchen.api import ResourceQuery, get_resources
+from kitchen.models import Dish, DishType, Ingredient
+from kitchen.pagination import KeysetPaginator
+from kitchen.views import (
+    CookListView,
+    DishDetailView,
+    DishListView,
+    DishTypeListView,
+    IndexView,
+    IngredientListView,
+)
+from .query_plans import QueryPlanAssertionsMixin, plan_problems
+
+
+LIST_VIEWS = (CookListView, DishListView, DishTypeListView, IngredientListView)
+
+
+class QueryPlanTest(QueryPlanAssertionsMixin, TestCase):
+    """
+    Checks on a seeded dataset that the main query of every view reads
+    through an index instead of scanning or sorting a whole table.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cook_model = get_user_model()
+        cls.cooks = cook_model.objects.bulk_create(
+            cook_model(username=f"cook{num}", slug=f"cook{num}")
+            for num in range(200)
+        )
+        dish_types = DishType.objects.bulk_create(
+            DishType(name=f"Type {num}") for num in range(200)
+        )
+        cls.ingredients = Ingredient.objects.bulk_create(
+            Ingredient(name=f"Ingredient {num}") for num in range(500)
+        )
+        cls.dishes = Dish.objects.bulk_create(
+            Dish(
+                name=f"Dish {num}",
+                description="",
+                price=10,
+                dish_type=dish_types[num % 200],
+            )
+            for num in range(2000)
+        )
+        Dish.cooks.through.objects.bulk_create(
+            Dish.cooks.through(dish=dish, cook=cls.cooks[num % 200])
+            for num, dish in enumerate(cls.dishes)
+        )
+        Dish.ingredients.through.objects.bulk_create(
+            Dish.ingredients.through(
+                dish=dish,
+                ingredient=cls.ingredients[(num + step) % 500]
+            )
+            for num, dish in enumerate(cls.dishes)
+            for step in range(3)
+        )
+
+    def make_view(self, view_class, **kwargs):
+        request = RequestFactory().get("/")
+        request.user = self.cooks[0]
+        view = view_class()
+        view.setup(request, **kwargs)
+        return view
+
+    def test_index_latest_dishes(self):
+        self.assert_indexed(IndexView.queryset)
+
+    def test_list_pages(self):
+        for view_class in LIST_VIEWS:
+            view = self.make_view(view_class)
+            queryset = view.get_queryset()
+            with self.subTest(view=view_class.__name__):
+                self.assert_indexed(queryset[:view.paginate_by])
+
+                paginator = KeysetPaginator(queryset, view.paginate_by)
+                cursor = paginator.page().next_cursor
+                self.assert_indexed(paginator._page_queryset(cursor)[0])
+
+    def test_dish_detail(self):
+        dish = self.dishes[0]
+        view = self.make_view(DishDetailView, pk=dish.pk)
+
+        self.assert_indexed(view.get_queryset().filter(pk=dish.pk))
+        self.assert_indexed(dish.cooks.all())
+        self.assert_indexed(dish.ingredients.all())
+
+    def test_reverse_relations(self):
+        self.assert_indexed(self.cooks[0].dishes.all())
+        self.assert_indexed(self.ingredients[0].dishes.all())
+
+    def test_api_pages(self):
+        for name, resource in get_resources().items():
+            with self.subTest(resource=name):
+                self.assert_indexed(ResourceQuery(resource).queryset()[:50])
+
+    def test_unindexed_sort_is_reported(self):
+        problems = plan_problems(Dish.objects.order_by("description"))
+
+        self.assertTrue(problems)
@@ -0,0 +1,215 @@
+from io import StringIO
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models.signals import post_migrate
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from kitchen.models import Dish, DishType, Ingredient
+from kitchen.search import (
+    SearchBackend,
+    SQLiteFTSSearchBackend,
+    get_search_backend,
+)
+from kitchen.views import SearchView
+
+
+class SQLiteFTSSearchBackendTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dish_type = DishType.objects.create(name="Main Course")
+        for name in ("Pasta Carbonara", "Pasta", "Pizza", "Antipasto"):
+            Dish.objects.create(
+                name=name,
+                description=f"{name} description",
+                price=10,
+                dish_type=cls.dish_type,
+                image="dish.jpg"
+            )
+        cls.backend = get_search_backend()
+
+    def search(self, term):
+        return list(
+            self.backend.search(Dish.objects.all(), term)
+            .values_list("name", flat=True)
+        )
+
+    def test_sqlite_uses_fts_backend(self):
+        self.assertIsInstance(self.backend, SQLiteFTSSearchBackend)
+        self.assertTrue(self.backend.has_index(Dish))
+
+    def test_search_matches_substrings_ranked_by_relevance(self):
+        results = self.search("past")
+
+        self.assertEqual(results[0], "Pasta")
+        self.assertCountEqual(
+            results,
+            ["Pasta", "Pasta Carbonara", "Antipasto"]
+        )
+
+    def test_short_terms_fall_back_to_icontains(self):
+        self.assertCountEqual(self.search("zz"), ["Pizza"])
+
+    def test_index_follows_saves_and_deletes(self):
+        pizza = Dish.objects.get(name="Pizza")
+        pizza.name = "Calzone"
+        pizza.save()
+        Dish.objects.get(name="Antipasto").delete()
+
+        self.assertEqual(self.search("calz"), ["Calzone"])
+        self.assertEqual(self.search("pizz"), [])
+        self.assertCountEqual(
+            self.search("past"),
+            ["Pasta", "Pasta Carbonara"]
+        )
+
+    def test_rebuild_command_restores_index(self):
+        Dish.objects.filter(name="Pizza").update(name="Focaccia")
+        self.assertEqual(self.search("focac"), [])
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertEqual(self.search("focac"), ["Focaccia"])
+
+    def test_indexes_all_searchable_models(self):
+        get_user_model().objects.create_user(username="gordon")
+        Ingredient.objects.create(name="Basil")
+
+        self.assertEqual(
+            list(self.backend.search(
+                get_user_model().objects.all(), "gord"
+            )),
+            list(get_user_model().objects.filter(username="gordon"))
+        )
+        self.assertEqual(
+            self.backend.search(Ingredient.objects.all(), "basi").count(),
+            1
+        )
+        self.assertEqual(
+            self.backend.search(DishType.objects.all(), "course").count(),
+            1
+        )
+
+
+class SearchBackendSelectionTest(TestCase):
+    def tearDown(self):
+        get_search_backend.cache_clear()
+
+    def test_migrate_refreshes_known_tables(self):
+        backend = get_search_backend()
+        backend._tables = set()
+        self.assertFalse(backend.has_index(Dish))
+
+        post_migrate.send(
+            sender=apps.get_app_config("kitchen"),
+            app_config=apps.get_app_config("kitchen"),
+            verbosity=0,
+            interactive=False,
+            using="default",
+            apps=apps,
+            plan=[],
+        )
+
+        self.assertIsNot(get_search_backend(), backend)
+        self.assertTrue(get_search_backend().has_index(Dish))
+
+    @override_settings(KITCHEN_SEARCH_BACKEND="kitchen.search.SearchBackend")
+    def test_backend_can_be_configured(self):
+        get_search_backend.cache_clear()
+        self.assertIs(type(get_search_backend()), SearchBackend)
+
+    def test_list_view_searches_through_backend(self):
+        user = get_user_model().objects.create_user(username="dennie")
+        self.client.force_login(user)
+        dish_type = DishType.objects.create(name="Soups")
+        for name in ("Tomato Soup", "Onion Soup", "Salad"):
+            Dish.objects.create(
+                name=name,
+                description="",
+                price=5,
+                dish_type=dish_type,
+                image="dish.jpg"
+            )
+
+        response = self.client.get(
+            reverse("kitchen:dishes-page"),
+            {"name": "soup"}
+        )
+
+        self.assertEqual(response.context["paginator"].count, 2)
+        self.assertContains(response, "Onion Soup")
+        self.assertNotContains(response, "Salad")
+
+
+class SearchViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="tomasz",
+            first_name="Tomasz",
+            last_name="Kowalski",
+        )
+        cls.dish_type = DishType.objects.create(name="Tomato based")
+        Ingredient.objects.create(name="Tomato")
+        for num in range(7):
+            Dish.objects.create(
+                name=f"Tomato Soup {num}",
+                description="",
+                price=5,
+                dish_type=cls.dish_type,
+                image="dish.jpg"
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_search_groups_results_by_type(self):
+        response = self.client.get(reverse("kitchen:search"), {"query": "tom"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "kitchen/search_results.html")
+        groups = {
+            group["type"]: group["results"]
+            for group in response.context["groups"]
+        }
+        self.assertEqual(len(groups["dishes"]), 5)
+        self.assertEqual(
+            groups["cooks"][0]["url"],
+            self.user.get_absolute_url()
+        )
+        self.assertEqual(groups["ingredients"][0]["label"], "Tomato")
+        self.assertEqual(
+            groups["dish_types"][0]["url"],
+            f"{reverse('kitchen:dish-types-page')}?name=Tomato+based"
+        )
+
+    def test_search_returns_json(self):
+        response = self.client.get(
+            reverse("kitchen:search"),
+            {"query": "tomato", "format": "json"}
+        )
+
+        payload = response.json()
+        self.assertEqual(payload["query"], "tomato")
+        self.assertFalse(payload["timed_out"])
+        self.assertEqual(
+            [group["type"] for group in payload["groups"]],
+            ["dishes", "cooks", "ingredients", "dish_types"]
+        )
+
+    def test_search_stops_when_latency_budget_is_spent(self):
+        response = SearchView.as_view(latency_budget_ms=0)(
+            self.make_request({"query": "tomato"})
+        )
+
+        self.assertTrue(response.context_data["timed_out"])
+        self.assertEqual(response.context_data["groups"], [])
+
+    def make_request(self, data):
+        request = RequestFactory().get(reverse("kitchen:search"), data)
+        request.user = self.user
+        return request
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from kitchen.models import Dish, DishType
+from kitchen.storage import ContentAddressedStorage
+from .media import use_temporary_media_root
+
+
+class ContentAddressedStorageTest(TestCase):
+    def setUp(self) -> None:
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+        self.storage = ContentAddressedStorage(location=self.location)
+
+    def test_files_are_named_by_content_hash(self):
+        content = b"pizza photo"
+
+        name = self.storage.save("dish_images/Pizza.JPG", ContentFile(content))
+
+        self.assertEqual(
+            name,
+            f"dish_images/{hashlib.sha256(content).hexdigest()}.jpg"
+        )
+
+    def test_identical_uploads_are_stored_once(self):
+        first = self.storage.save("dish_images/a.jpg", ContentFile(b"same"))
+        second = self.storage.save("dish_images/b.jpg", ContentFile(b"same"))
+        other = self.storage.save("dish_images/c.jpg", ContentFile(b"other"))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(len(self.storage.listdir("dish_images")[1]), 2)
+
+    def test_hash_is_computed_in_chunks(self):
+        self.storage.chunk_size = 4
+        content = ContentFile(b"x" * 10)
+        chunk_sizes = []
+        original_chunks = content.chunks
+
+        def chunks(chunk_size=None):
+            chunk_sizes.append(chunk_size)
+            return original_chunks(chunk_size)
+
+        content.chunks = chunks
+
+        digest = self.storage.content_hash(content)
+
+        self.assertEqual(digest, hashlib.sha256(b"x" * 10).hexdigest())
+        self.assertEqual(chunk_sizes, [4])
+
+    def test_save_as_keeps_name_and_replaces_file(self):
+        self.storage.save_as("dish_images/a.w320.jpg", ContentFile(b"old"))
+        name = self.storage.save_as(
+            "dish_images/a.w320.jpg",
+            ContentFile(b"new")
+        )
+
+        self.assertEqual(name, "dish_images/a.w320.jpg")
+        with self.storage.open(name) as stored:
+            self.assertEqual(stored.read(), b"new")
+
+
+class CollectMediaGarbageCommandTest(TestCase):
+    def setUp(self) -> None:
+        use_temporary_media_root(self)
+
+        self.kept = default_storage.save(
+            "dish_images/kept.jpg",
+            ContentFile(b"kept")
+        )
+        self.orphan = default_storage.save(
+            "dish_images/orphan.jpg",
+            ContentFile(b"orphan")
+        )
+        self.kept_thumbnail = self.kept.replace(".jpg", ".w320.webp")
+        self.orphan_thumbnail = self.orphan.replace(".jpg", ".w320.webp")
+        for name in (self.kept_thumbnail, self.orphan_thumbnail):
+            default_storage.save_as(name, ContentFile(b"thumbnail"))
+        Dish.objects.create(
+            name="Pizza",
+            description="Pizza",
+            price=10,
+            dish_type=DishType.objects.create(name="Main Course"),
+            image=self.kept
+        )
+
+    def age_files(self) -> None:
+        an_hour_ago = time.time() - 2 * 3600
+        for name in default_storage.listdir("dish_images")[1]:
+            os.utime(
+                default_storage.path(f"dish_images/{name}"),
+                (an_hour_ago, an_hour_ago)
+            )
+
+    def test_unreferenced_files_and_thumbnails_are_deleted(self):
+        self.age_files()
+        out = StringIO()
+
+        call_command("collect_media_garbage", stdout=out)
+
+        self.assertIn("2 unreferenced files deleted", out.getvalue())
+        self.assertTrue(default_storage.exists(self.kept))
+        self.assertTrue(default_storage.exists(self.kept_thumbnail))
+        self.assertFalse(default_storage.exists(self.orphan))
+        self.assertFalse(default_storage.exists(self.orphan_thumbnail))
+
+    def test_recent_files_are_kept(self):
+        call_command("collect_media_garbage", stdout=StringIO())
+
+        self.assertTrue(default_storage.exists(self.orphan))
+
+    def test_reuploaded_file_is_kept_with_its_thumbnails(self):
+        self.age_files()
+
+        name = default_storage.save(
+            "dish_images/again.jpg",
+            ContentFile(b"orphan")
+        )
+        call_command("collect_media_garbage", stdout=StringIO())
+
+        self.assertEqual(name, self.orphan)
+        self.assertTrue(default_storage.exists(self.orphan))
+        self.assertTrue(default_storage.exists(self.orphan_thumbnail))
+
+    def test_dry_run_deletes_nothing(self):
+        self.age_files()
+        out = StringIO()
+
+        call_command("collect_media_garbage", "--dry-run", stdout=out)
+
+        self.assertIn("2 unreferenced files would be deleted", out.getvalue())
+        self.assertTrue(default_storage.exists(self.orphan))
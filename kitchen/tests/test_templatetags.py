@@ -0,0 +1,49 @@
+from django.core.paginator import Paginator
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase
+
+from kitchen.templatetags.pagination_window import page_window
+
+
+class PageWindowTest(TestCase):
+    def test_window_without_gaps(self):
+        self.assertEqual(page_window(1, 3), [1, 2, 3])
+        self.assertEqual(page_window(4, 7), [1, 2, 3, 4, 5, 6, 7])
+
+    def test_window_with_gaps_on_both_sides(self):
+        self.assertEqual(
+            page_window(50_000, 100_000),
+            [1, None, 49_998, 49_999, 50_000, 50_001, 50_002, None, 100_000]
+        )
+
+    def test_window_at_the_edges(self):
+        self.assertEqual(page_window(1, 100), [1, 2, 3, None, 100])
+        self.assertEqual(page_window(100, 100), [1, None, 98, 99, 100])
+
+
+class PaginationWindowTagTest(TestCase):
+    def render(self, page_number, num_pages):
+        paginator = Paginator(range(num_pages), 1)
+        page_obj = paginator.page(page_number)
+        request = RequestFactory().get(
+            "/dishes/",
+            {"name": "soup", "page": page_number}
+        )
+        return Template(
+            "{% load pagination_window %}{% pagination_window %}"
+        ).render(Context({"request": request, "page_obj": page_obj}))
+
+    def test_links_keep_search_query(self):
+        html = self.render(5, 10)
+
+        self.assertIn('href="?name=soup&amp;page=4"', html)
+        self.assertIn('href="?name=soup&amp;page=7"', html)
+        self.assertIn('href="?name=soup&amp;page=10"', html)
+        self.assertIn('<span class="page-link">5</span>', html)
+        self.assertNotIn('page=9"', html)
+
+    def test_renders_only_visible_window_of_huge_paginator(self):
+        html = self.render(50_000, 100_000)
+
+        self.assertEqual(html.count('class="page-link"'), 9)
+        self.assertEqual(html.count("&hellip;"), 2)
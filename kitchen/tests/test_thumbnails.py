@@ -0,0 +1,111 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from kitchen.models import Dish, DishType
+from kitchen.thumbnails import (
+    THUMBNAIL_WIDTHS,
+    has_thumbnails,
+    thumbnail_name,
+)
+from .media import make_image, use_temporary_media_root
+
+
+class ThumbnailTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        use_temporary_media_root(cls, KITCHEN_IMAGE_JOBS="sync")
+
+    def setUp(self) -> None:
+        self.dish_type = DishType.objects.create(name="Main Course")
+
+    def create_dish(self, image) -> Dish:
+        with self.captureOnCommitCallbacks(execute=True):
+            return Dish.objects.create(
+                name="Pizza",
+                description="Pizza",
+                price=10,
+                dish_type=self.dish_type,
+                image=image
+            )
+
+    def test_upload_generates_thumbnails_next_to_original(self):
+        dish = self.create_dish(make_image(2000, 1000))
+
+        self.assertTrue(has_thumbnails(dish.image))
+        for width in THUMBNAIL_WIDTHS:
+            for extension, image_format in (("webp", "WEBP"), ("jpg", "JPEG")):
+                name = thumbnail_name(dish.image.name, width, extension)
+                self.assertTrue(name.startswith("dish_images/"))
+                with dish.image.storage.open(name) as thumbnail:
+                    with Image.open(thumbnail) as image:
+                        self.assertEqual(image.format, image_format)
+                        self.assertEqual(image.size, (width, width // 2))
+
+    def test_small_images_are_not_upscaled(self):
+        dish = self.create_dish(make_image(200, 100))
+
+        name = thumbnail_name(dish.image.name, THUMBNAIL_WIDTHS[-1], "jpg")
+        with dish.image.storage.open(name) as thumbnail:
+            with Image.open(thumbnail) as image:
+                self.assertEqual(image.size, (200, 100))
+
+    def test_missing_original_is_skipped(self):
+        dish = self.create_dish("dish_images/missing.jpg")
+
+        self.assertFalse(has_thumbnails(dish.image))
+
+    def test_srcset_helpers(self):
+        dish = self.create_dish(make_image(800, 600))
+
+        rendered = Template(
+            "{% load responsive_images %}"
+            "{{ dish.image|srcset:'webp' }}|"
+            "{% responsive_image dish.image alt=dish.name %}"
+        ).render(Context({"dish": dish}))
+
+        srcset, picture = rendered.split("|")
+        self.assertEqual(srcset.count("w, "), len(THUMBNAIL_WIDTHS) - 1)
+        self.assertIn(".w320.webp 320w", srcset)
+        self.assertIn('<source type="image/webp"', picture)
+        self.assertIn(".w640.jpg", picture)
+
+    def test_helpers_fall_back_to_original(self):
+        dish = self.create_dish("dish_images/missing.jpg")
+
+        rendered = Template(
+            "{% load responsive_images %}"
+            "{{ dish.image|srcset }}"
+            "{% responsive_image dish.image %}"
+        ).render(Context({"dish": dish}))
+
+        self.assertNotIn("<picture>", rendered)
+        self.assertIn(dish.image.url, rendered)
+
+    def test_dish_without_image_renders_no_img(self):
+        dish = self.create_dish("")
+
+        rendered = Template(
+            "{% load responsive_images %}"
+            "{% responsive_image dish.image %}"
+        ).render(Context({"dish": dish}))
+
+        self.assertNotIn("<img", rendered)
+
+    def test_backfill_command_generates_missing_thumbnails(self):
+        dish = self.create_dish(make_image(800, 600))
+        for width in THUMBNAIL_WIDTHS:
+            for extension in ("webp", "jpg"):
+                dish.image.storage.delete(
+                    thumbnail_name(dish.image.name, width, extension)
+                )
+
+        out = StringIO()
+        call_command("generate_thumbnails", stdout=out)
+
+        self.assertTrue(has_thumbnails(dish.image))
+        self.assertIn("thumbnails generated for 1.", out.getvalue())
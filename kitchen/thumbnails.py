@@ -0,0 +1,143 @@
+"""
+Thumbnails of the uploaded dish images and profile pictures.
+
+Every image gets a copy at each of ``THUMBNAIL_WIDTHS`` in WebP and in
+JPEG, stored next to the original as ``<name>.w<width>.<extension>``.
+Images narrower than a width are never upscaled: their copy keeps the
+original size.
+"""
+import logging
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .cache import IMAGE_GENERATION, bump_generation
+from .models import Dish
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_WIDTHS = (320, 640, 1280)
+THUMBNAIL_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+FALLBACK_WIDTH = 640
+
+
+def image_fields() -> dict[type[models.Model], str]:
+    """
+    Maps every model with uploaded images to its image field.
+    """
+    return {
+        Dish: "image",
+        get_user_model(): "profile_picture",
+    }
+
+
+def thumbnail_name(name: str, width: int, extension: str) -> str:
+    """
+    Returns the storage name of the ``width`` wide ``extension`` thumbnail
+    of the file stored as ``name``.
+    """
+    stem = name.rsplit(".", 1)[0]
+    return f"{stem}.w{width}.{extension}"
+
+
+def save_derived_file(storage: Storage, name: str, content: bytes) -> str:
+    """
+    Writes ``content`` under exactly ``name``, replacing any file there,
+    whether or not the storage renames what it saves.
+    """
+    if hasattr(storage, "save_as"):
+        return storage.save_as(name, ContentFile(content))
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(content))
+
+
+def has_thumbnails(field_file: FieldFile) -> bool:
+    """
+    Tells whether the thumbnails of ``field_file`` were generated. The
+    widest JPEG is written last, so its presence means all are there.
+    """
+    if not field_file:
+        return False
+    return field_file.storage.exists(
+        thumbnail_name(field_file.name, THUMBNAIL_WIDTHS[-1], "jpg")
+    )
+
+
+def generate_thumbnails(field_file: FieldFile) -> list[str]:
+    """
+    Writes every thumbnail of ``field_file``, replacing existing ones, and
+    invalidates the cached fragments that embed image URLs.
+
+    Returns:
+        list[str]: The storage names of the thumbnails written.
+    """
+    storage = field_file.storage
+    with storage.open(field_file.name, "rb") as original:
+        with Image.open(original) as image:
+            image = ImageOps.exif_transpose(image).convert("RGB")
+
+    names = []
+    for width in THUMBNAIL_WIDTHS:
+        resized = image
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for extension, (image_format, options) in THUMBNAIL_FORMATS.items():
+            name = thumbnail_name(field_file.name, width, extension)
+            buffer = BytesIO()
+            resized.save(buffer, image_format, **options)
+            names.append(
+                save_derived_file(storage, name, buffer.getvalue())
+            )
+
+    bump_generation(IMAGE_GENERATION)
+    return names
+
+
+def ensure_thumbnails(field_file: FieldFile) -> bool:
+    """
+    Generates the thumbnails of ``field_file`` unless they already exist.
+    Missing files are skipped, and files that can't be read as images are
+    logged and skipped.
+
+    Returns:
+        bool: Whether thumbnails were generated.
+    """
+    if (
+        not field_file
+        or has_thumbnails(field_file)
+        or not field_file.storage.exists(field_file.name)
+    ):
+        return False
+    try:
+        generate_thumbnails(field_file)
+    except (OSError, UnidentifiedImageError) as error:
+        logger.warning(
+            "Could not generate thumbnails of %s: %s",
+            field_file.name,
+            error
+        )
+        return False
+    return True
+
+
+def thumbnail_srcset(field_file: FieldFile, extension: str) -> str:
+    """
+    Returns the ``srcset`` attribute value listing the ``extension``
+    thumbnails of ``field_file``.
+    """
+    storage = field_file.storage
+    return ", ".join(
+        f"{storage.url(thumbnail_name(field_file.name, width, extension))} "
+        f"{width}w"
+        for width in THUMBNAIL_WIDTHS
+    )
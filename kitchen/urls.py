@@ -4,6 +4,7 @@ from kitchen import views
 
 urlpatterns = [
     path("", views.IndexView.as_view(), name="main-page"),
+    path("search/", views.SearchView.as_view(), name="search"),
     path("cooks/", views.CookListView.as_view(), name="cooks-page"),
     path(
         "cooks/create/",
@@ -30,6 +31,11 @@ urlpatterns = [
         views.DishListView.as_view(),
         name="dishes-page"
     ),
+    path(
+        "dishes/export/",
+        views.DishExportView.as_view(),
+        name="dishes-export"
+    ),
     path(
         "dishes/<int:pk>/",
         views.DishDetailView.as_view(),
@@ -95,6 +101,21 @@ urlpatterns = [
         views.IngredientDeleteView.as_view(),
         name="ingredient-delete"
     ),
+    path(
+        "slow-queries/",
+        views.SlowQueryView.as_view(),
+        name="slow-queries"
+    ),
+    path(
+        "api/<slug:resource>/",
+        views.ApiListView.as_view(),
+        name="api-list"
+    ),
+    path(
+        "api/<slug:resource>/<int:pk>/",
+        views.ApiDetailView.as_view(),
+        name="api-detail"
+    ),
 ]
 
 app_name = "kitchen"
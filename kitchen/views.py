@@ -1,13 +1,54 @@
 from typing import Any
+from django.conf import settings
 from django.contrib.auth import logout, get_user_model
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import Paginator
 from django.shortcuts import render, redirect
-from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.views import generic
 from django.urls import reverse, reverse_lazy
-from django.db.models import QuerySet
+from django.utils.http import urlencode
+from django.db import transaction
+from django.db.models.signals import m2m_changed
+from django.db.models import (
+    Aggregate,
+    Count,
+    Exists,
+    Max,
+    OuterRef,
+    Prefetch,
+    QuerySet,
+    Subquery,
+)
 
+from .api import InvalidQuery, ResourceQuery, get_resources
+from .async_views import (
+    AsyncDetailMixin,
+    AsyncListMixin,
+    AsyncLoginRequiredMixin,
+    aevaluate,
+)
+from .cache import (
+    CachedPageMixin,
+    aget_dish_fragments,
+    search_models_cached,
+)
+from .conditional import ConditionalGetMixin
+from .export import EXPORT_FORMATS, aexport_lines, export_lines
 from .models import Dish, Cook, DishType, Ingredient
+from .pagination import InvalidCursor, KeysetPaginationMixin
+from .profiling import slow_query_log
+from .search import get_search_backend
 from .forms import (
     CookCreationForm,
     CookUpdateForm,
@@ -15,11 +56,18 @@ from .forms import (
     CookSearchForm,
     DishSearchForm,
     DishTypeSearchForm,
-    IngredientSearchForm
+    IngredientSearchForm,
+    KitchenSearchForm,
 )
 
 
-class IndexView(LoginRequiredMixin, generic.ListView):
+class IndexView(
+    AsyncLoginRequiredMixin,
+    ConditionalGetMixin,
+    CachedPageMixin,
+    AsyncListMixin,
+    generic.ListView
+):
     """
     Handles HTTP requests to the main page,
     displaying the three most recently updated dishes.
@@ -27,9 +75,18 @@ class IndexView(LoginRequiredMixin, generic.ListView):
     template_name = "kitchen/index.html"
     model = Dish
     context_object_name = "dishes"
-    queryset = Dish.objects.all().order_by("-updated_at")[:3] \
-        .prefetch_related("ingredients")
+    queryset = Dish.objects.all().order_by("-updated_at")[:3]
     paginate_by = 3
+    page_cache_name = "latest_dishes"
+    freshness_generations = ("dish", "cook", "image", "ingredient")
+
+    async def aget_context_data(self, **kwargs) -> dict[Any]:
+        context = await super().aget_context_data(**kwargs)
+        context["dish_fragments"] = await aget_dish_fragments(
+            context["dishes"],
+            "kitchen/includes/dish_preview.html"
+        )
+        return context
 
 
 class LogoutView(generic.View):
@@ -46,7 +103,12 @@ class LogoutView(generic.View):
         return render(request, "registration/logged_out.html")
 
 
-class CookListView(LoginRequiredMixin, generic.ListView):
+class CookListView(
+    AsyncLoginRequiredMixin,
+    KeysetPaginationMixin,
+    AsyncListMixin,
+    generic.ListView
+):
     template_name = "kitchen/all_cooks.html"
     model = Cook
     context_object_name = "cooks"
@@ -64,16 +126,46 @@ class CookListView(LoginRequiredMixin, generic.ListView):
         queryset = get_user_model().objects.all()
         form = CookSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(
-                username__icontains=form.cleaned_data["username"]
+            return get_search_backend().search(
+                queryset,
+                form.cleaned_data["username"]
             )
         return queryset
 
 
-class CookDetailView(LoginRequiredMixin, generic.DetailView):
+class CookDetailView(
+    AsyncLoginRequiredMixin,
+    AsyncDetailMixin,
+    generic.DetailView
+):
+    """
+    Handles HTTP requests to a cook's page. The cook's dishes are shown
+    a page at a time as cached cards, so the page cost doesn't grow with
+    the number of dishes the cook is on.
+    """
     template_name = "kitchen/cook_detail.html"
     model = Cook
     context_object_name = "cook"
+    dishes_paginate_by = 6
+
+    async def aget_context_data(self, **kwargs) -> dict[Any]:
+        context = await super().aget_context_data(**kwargs)
+        dishes = self.object.dishes.all()
+        paginator = Paginator(dishes, self.dishes_paginate_by)
+        paginator.__dict__["count"] = await dishes.acount()
+        page_obj = paginator.get_page(self.request.GET.get("page"))
+        await aevaluate(page_obj.object_list)
+        context.update({
+            "dishes": page_obj.object_list,
+            "dish_fragments": await aget_dish_fragments(
+                page_obj.object_list,
+                "kitchen/includes/dish_card.html"
+            ),
+            "paginator": paginator,
+            "page_obj": page_obj,
+            "is_paginated": page_obj.has_other_pages(),
+        })
+        return context
 
 
 class CookCreateView(LoginRequiredMixin, generic.CreateView):
@@ -107,11 +199,18 @@ class CookDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("kitchen:cooks-page")
 
 
-class DishListView(LoginRequiredMixin, generic.ListView):
+class DishListView(
+    AsyncLoginRequiredMixin,
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    AsyncListMixin,
+    generic.ListView
+):
     model = Dish
     template_name = "kitchen/dishes_list.html"
     context_object_name = "dishes"
     paginate_by = 6
+    freshness_generations = ("dish", "cook", "image", "ingredient")
 
     def get_context_data(self, *, object_list=None, **kwargs) -> dict[Any]:
         context = super(DishListView, self).get_context_data(**kwargs)
@@ -121,20 +220,83 @@ class DishListView(LoginRequiredMixin, generic.ListView):
         )
         return context
 
+    async def aget_context_data(self, **kwargs) -> dict[Any]:
+        context = await super().aget_context_data(**kwargs)
+        context["dish_fragments"] = await aget_dish_fragments(
+            context["dishes"],
+            "kitchen/includes/dish_card.html"
+        )
+        return context
+
     def get_queryset(self) -> QuerySet[Dish]:
-        queryset = Dish.objects.all().prefetch_related("ingredients")
+        queryset = Dish.objects.all()
         form = DishSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(
-                name__icontains=form.cleaned_data["name"]
+            return get_search_backend().search(
+                queryset,
+                form.cleaned_data["name"]
             )
         return queryset
 
 
-class DishDetailView(LoginRequiredMixin, generic.DetailView):
+class DishDetailView(
+    AsyncLoginRequiredMixin,
+    ConditionalGetMixin,
+    AsyncDetailMixin,
+    generic.DetailView
+):
     model = Dish
     template_name = "kitchen/dish_detail.html"
     context_object_name = "dish"
+    freshness_generations = ("cook", "dishtype", "image", "ingredient")
+
+    def get_freshness_queryset(self) -> QuerySet[Dish]:
+        return Dish.objects.filter(pk=self.kwargs["pk"])
+
+    def get_freshness_aggregates(self) -> dict[str, Aggregate]:
+        """
+        Assigning a cook doesn't touch the dish row, so the number and the
+        latest id of the dish's rows in the through table are added. Any
+        assignment or unassignment changes one of them.
+        """
+        assignments = Dish.cooks.through.objects.filter(
+            dish_id=OuterRef("pk")
+        ).order_by().values("dish_id")
+        return {
+            "assignments": Max(Subquery(
+                assignments.annotate(rows=Count("pk")).values("rows")
+            )),
+            "last_assignment": Max(Subquery(
+                assignments.annotate(last=Max("pk")).values("last")
+            )),
+        }
+
+    def get_queryset(self) -> QuerySet[Dish]:
+        """
+        Builds the dish page from three queries whatever the data size: the
+        dish joined with its type and annotated with whether the current
+        user is assigned to it, then its cooks and its ingredients limited
+        to the columns the template shows.
+        """
+        return Dish.objects.select_related("dish_type").prefetch_related(
+            Prefetch(
+                "cooks",
+                queryset=get_user_model().objects.only(
+                    "id", "first_name", "last_name"
+                )
+            ),
+            Prefetch(
+                "ingredients",
+                queryset=Ingredient.objects.only("id", "name")
+            ),
+        ).annotate(
+            is_assigned_to_current_user=Exists(
+                Dish.cooks.through.objects.filter(
+                    dish_id=OuterRef("pk"),
+                    cook_id=self.request.user.pk
+                )
+            )
+        )
 
 
 class DishCreateView(LoginRequiredMixin, generic.CreateView):
@@ -158,7 +320,154 @@ class DishDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("kitchen:dishes-page")
 
 
-class DishTypeListView(LoginRequiredMixin, generic.ListView):
+class DishExportView(LoginRequiredMixin, generic.View):
+    """
+    Handles HTTP GET requests to download the whole menu, streamed as CSV
+    or, with ``?format=jsonl``, as JSON lines.
+
+    Under ASGI the lines come from an async iterator: Django reads a sync
+    one whole into memory before streaming it from the event loop.
+    """
+    batch_size = 1000
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        export_format = request.GET.get("format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return HttpResponseBadRequest(
+                f"Unknown export format: {export_format}"
+            )
+        lines = (
+            aexport_lines if isinstance(request, ASGIRequest)
+            else export_lines
+        )
+        response = StreamingHttpResponse(
+            lines(export_format, self.batch_size),
+            content_type=EXPORT_FORMATS[export_format]
+        )
+        response.headers["Content-Disposition"] = (
+            f'attachment; filename="menu.{export_format}"'
+        )
+        return response
+
+
+class ApiResourceMixin:
+    """
+    Resolves the API resource named in the URL and the ``fields`` and
+    ``include`` query parameters of the request.
+    """
+
+    def get_resource_query(self) -> ResourceQuery:
+        resource = get_resources().get(self.kwargs["resource"])
+        if resource is None:
+            raise Http404("Unknown resource.")
+        return ResourceQuery(
+            resource,
+            fields=self.request.GET.get("fields"),
+            include=self.request.GET.get("include"),
+        )
+
+
+class ApiListView(AsyncLoginRequiredMixin, ApiResourceMixin, generic.View):
+    """
+    Handles HTTP GET requests to list a catalogue resource as JSON, a page
+    at a time. The ``cursor`` of the next and previous pages are given as
+    ready-made URLs, and ``limit`` sets the page size.
+    """
+    raise_exception = True
+    page_size = 50
+    max_page_size = 200
+
+    async def get(
+        self,
+        request: HttpRequest,
+        *args,
+        **kwargs
+    ) -> HttpResponse:
+        try:
+            limit = int(request.GET.get("limit", self.page_size))
+        except ValueError:
+            return JsonResponse({"error": "Invalid limit."}, status=400)
+        limit = min(max(limit, 1), self.max_page_size)
+        try:
+            results, page = await self.get_resource_query().page(
+                limit,
+                request.GET.get("cursor")
+            )
+        except (InvalidQuery, InvalidCursor) as error:
+            return JsonResponse({"error": str(error)}, status=400)
+        return JsonResponse({
+            "results": results,
+            "next": self.page_url(page.next_cursor),
+            "previous": self.page_url(page.previous_cursor),
+        })
+
+    def page_url(self, cursor: str | None) -> str | None:
+        if cursor is None:
+            return None
+        params = self.request.GET.copy()
+        params["cursor"] = cursor
+        return f"{self.request.path}?{params.urlencode()}"
+
+
+class ApiDetailView(
+    AsyncLoginRequiredMixin,
+    ApiResourceMixin,
+    generic.View
+):
+    """
+    Handles HTTP GET requests to fetch one row of a catalogue resource as
+    JSON.
+    """
+    raise_exception = True
+
+    async def get(
+        self,
+        request: HttpRequest,
+        *args,
+        **kwargs
+    ) -> HttpResponse:
+        try:
+            result = await self.get_resource_query().get(kwargs["pk"])
+        except InvalidQuery as error:
+            return JsonResponse({"error": str(error)}, status=400)
+        except ObjectDoesNotExist:
+            raise Http404("No row found matching the query.")
+        return JsonResponse(result)
+
+
+class SlowQueryView(
+    LoginRequiredMixin,
+    UserPassesTestMixin,
+    generic.TemplateView
+):
+    """
+    Shows staff the slow queries buffered by this process, grouped by
+    fingerprint with their plans, and the latest ones with the page that
+    ran them.
+    """
+    template_name = "kitchen/slow_queries.html"
+    recent_limit = 50
+
+    def test_func(self) -> bool:
+        return self.request.user.is_staff
+
+    def get_context_data(self, **kwargs) -> dict[Any]:
+        context = super().get_context_data(**kwargs)
+        context["groups"] = slow_query_log.groups()
+        context["recent"] = slow_query_log.recent()[:self.recent_limit]
+        context["threshold_ms"] = getattr(
+            settings, "KITCHEN_SLOW_QUERY_MS", None
+        )
+        return context
+
+
+class DishTypeListView(
+    AsyncLoginRequiredMixin,
+    CachedPageMixin,
+    KeysetPaginationMixin,
+    AsyncListMixin,
+    generic.ListView
+):
     model = DishType
     template_name = "kitchen/dish_type_list.html"
     context_object_name = "dish_types"
@@ -176,8 +485,9 @@ class DishTypeListView(LoginRequiredMixin, generic.ListView):
         queryset = DishType.objects.all()
         form = DishTypeSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(
-                name__icontains=form.cleaned_data["name"]
+            return get_search_backend().search(
+                queryset,
+                form.cleaned_data["name"]
             )
         return queryset
 
@@ -204,7 +514,13 @@ class DishTypeDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("kitchen:dish-types-page")
 
 
-class IngredientListView(LoginRequiredMixin, generic.ListView):
+class IngredientListView(
+    AsyncLoginRequiredMixin,
+    CachedPageMixin,
+    KeysetPaginationMixin,
+    AsyncListMixin,
+    generic.ListView
+):
     model = Ingredient
     template_name = "kitchen/ingredient_list.html"
     context_object_name = "ingredients"
@@ -222,8 +538,9 @@ class IngredientListView(LoginRequiredMixin, generic.ListView):
         queryset = Ingredient.objects.all()
         form = IngredientSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(
-                name__icontains=form.cleaned_data["name"]
+            return get_search_backend().search(
+                queryset,
+                form.cleaned_data["name"]
             )
         return queryset
 
@@ -250,16 +567,166 @@ class IngredientDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("kitchen:ingredients-page")
 
 
-class ToggleAssignToDishView(generic.View):
-    def post(self, request: HttpRequest, pk: int) -> HttpResponseRedirect:
-        cook = get_user_model().objects.get(id=request.user.id)
-        if Dish.objects.get(id=pk) in cook.dishes.all():
-            cook.dishes.remove(pk)
+class SearchView(LoginRequiredMixin, generic.TemplateView):
+    """
+    Handles HTTP GET requests to search dishes, cooks, ingredients and
+    dish types at once.
+
+    Each type contributes at most ``results_per_type`` of its most relevant
+    matches, and types are searched in turn only until
+    ``latency_budget_ms`` is spent. Results are rendered as a page, or as
+    JSON for ``?format=json`` and requests accepting ``application/json``.
+    """
+    template_name = "kitchen/search_results.html"
+    results_per_type = 5
+    latency_budget_ms = 250
+    result_groups = (
+        ("dishes", "Dishes", Dish),
+        ("cooks", "Cooks", Cook),
+        ("ingredients", "Ingredients", Ingredient),
+        ("dish_types", "Dish Types", DishType),
+    )
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        context = self.get_context_data(**kwargs)
+        if (
+            request.GET.get("format") == "json"
+            or "application/json" in request.headers.get("Accept", "")
+        ):
+            return JsonResponse({
+                "query": context["query"],
+                "timed_out": context["timed_out"],
+                "groups": context["groups"],
+            })
+        return self.render_to_response(context)
+
+    def get_context_data(self, **kwargs) -> dict[Any]:
+        context = super().get_context_data(**kwargs)
+        form = KitchenSearchForm(self.request.GET)
+        query = form.cleaned_data["query"] if form.is_valid() else ""
+        groups, timed_out = [], False
+
+        if query:
+            results, timed_out = search_models_cached(
+                query,
+                [model for _, _, model in self.result_groups],
+                limit=self.results_per_type,
+                budget_ms=self.latency_budget_ms
+            )
+            groups = [
+                {
+                    "type": group_type,
+                    "label": label,
+                    "results": [
+                        self.serialize_result(obj)
+                        for obj in results[model]
+                    ],
+                }
+                for group_type, label, model in self.result_groups
+                if model in results
+            ]
+
+        context.update({
+            "search_form": form,
+            "query": query,
+            "groups": groups,
+            "timed_out": timed_out,
+        })
+        return context
+
+    @staticmethod
+    def serialize_result(obj: Any) -> dict[str, Any]:
+        if isinstance(obj, Cook):
+            return {
+                "id": obj.pk,
+                "label": obj.username,
+                "url": obj.get_absolute_url(),
+            }
+        if isinstance(obj, Dish):
+            url = obj.get_absolute_url()
+        elif isinstance(obj, Ingredient):
+            url = reverse("kitchen:ingredients-page")
         else:
-            cook.dishes.add(pk)
+            url = reverse("kitchen:dish-types-page")
+        if not isinstance(obj, Dish):
+            url = f"{url}?{urlencode({'name': obj.name})}"
+        return {"id": obj.pk, "label": obj.name, "url": url}
+
+
+class ToggleAssignToDishView(LoginRequiredMixin, generic.View):
+    """
+    Handles HTTP POST requests to assign the current user to a dish, or to
+    unassign them if they are already assigned.
+
+    Background requests get the new state back instead of a redirect:
+    JSON when they accept ``application/json``, otherwise the re-rendered
+    assign form fragment when sent with ``X-Requested-With``. Plain form
+    submissions are redirected to the dish page.
+    """
+    fragment_template_name = "kitchen/includes/dish_assign_form.html"
+
+    def post(self, request: HttpRequest, pk: int) -> HttpResponse:
+        is_assigned = self.toggle_assignment(
+            dish_id=pk,
+            cook_id=request.user.pk
+        )
+
+        if "application/json" in request.headers.get("Accept", ""):
+            return JsonResponse({"dish": pk, "is_assigned": is_assigned})
+        if request.headers.get("X-Requested-With") == "XMLHttpRequest":
+            return render(
+                request,
+                self.fragment_template_name,
+                {"dish": {"id": pk}, "is_assigned": is_assigned}
+            )
         return HttpResponseRedirect(
             reverse_lazy(
                 "kitchen:dish-detail-page",
                 args=[pk]
             )
         )
+
+    @staticmethod
+    def toggle_assignment(dish_id: int, cook_id: int) -> bool:
+        """
+        Toggles the cook-dish row in the through table within a single
+        transaction: deletes it if it exists, inserts it otherwise.
+
+        The transaction starts with the write, so concurrent double clicks
+        queue up on the write lock instead of both reading first and then
+        failing to upgrade their locks, which is how SQLite answers two
+        read-then-write transactions. The insert ignores conflicts, so a
+        click that lost the race leaves exactly one row behind instead of
+        failing on the unique constraint. ``m2m_changed`` is sent as the
+        related manager would, which invalidates the pages showing the
+        dish's cooks.
+
+        Returns:
+            bool: Whether the cook is assigned to the dish afterwards.
+        """
+        through_model = Dish.cooks.through
+        with transaction.atomic():
+            deleted, _ = through_model.objects.filter(
+                dish_id=dish_id,
+                cook_id=cook_id
+            ).delete()
+            if deleted:
+                action = "remove"
+            elif Dish.objects.filter(pk=dish_id).exists():
+                through_model.objects.bulk_create(
+                    [through_model(dish_id=dish_id, cook_id=cook_id)],
+                    ignore_conflicts=True
+                )
+                action = "add"
+            else:
+                raise Http404("No dish found matching the query.")
+            m2m_changed.send(
+                sender=through_model,
+                action=f"post_{action}",
+                instance=Dish(pk=dish_id),
+                reverse=False,
+                model=get_user_model(),
+                pk_set={cook_id},
+                using=through_model.objects.db,
+            )
+        return action == "add"
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 import os
+import tempfile
 from pathlib import Path
 
 import dj_database_url
@@ -39,14 +40,14 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "kitchen",
-    "debug_toolbar",
     "storages",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "kitchen.middleware.AsyncWhiteNoiseMiddleware",
+    "kitchen.middleware.PerformanceMiddleware",
+    "kitchen.middleware.QueryOriginMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -55,6 +56,12 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "kitchen.middleware.StorePreviousURLMiddleware",]
 
+# The toolbar middleware is sync only, which would make every request pay a
+# thread switch under ASGI, so the toolbar is only loaded for development.
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(2, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "restaurant_mate.urls"
 
 TEMPLATES = [
@@ -90,6 +97,34 @@ DATABASES = {
 db_from_env = dj_database_url.config(conn_max_age=500)
 DATABASES["default"].update(db_from_env)
 
+# SQLite test databases live in a file rather than in shared-cache memory,
+# where a connection that finds a table locked fails at once instead of
+# waiting for the lock like it does in production.
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"].setdefault("TEST", {}).setdefault(
+        "NAME",
+        Path(tempfile.gettempdir()) / f"restaurant_mate_test_{os.getpid()}.db"
+    )
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# The kitchen caches are invalidated through generation counters kept in
+# the cache itself, so every worker process has to share it. A
+# process-local backend such as LocMemCache would keep serving pages that
+# another worker already invalidated. Set DJANGO_CACHE_DIR to place the
+# cache files; the test runner gives every run a directory of its own.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get(
+            "DJANGO_CACHE_DIR",
+            Path(tempfile.gettempdir()) / "restaurant_mate_cache"
+        ),
+    }
+}
+
+TEST_RUNNER = "kitchen.tests.runner.KitchenTestRunner"
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -144,7 +179,7 @@ STORAGES = {
     #     "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
     # },
     "default": {
-        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "BACKEND": "kitchen.storage.ContentAddressedStorage",
     },
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
@@ -164,6 +199,68 @@ AUTH_USER_MODEL = "kitchen.Cook"
 
 LOGIN_REDIRECT_URL = "/"
 
+# Where StorePreviousURLMiddleware keeps the previous URL: "session" or
+# "cookie" (a signed cookie, which avoids session writes altogether).
+PREVIOUS_URL_STORAGE = os.environ.get("PREVIOUS_URL_STORAGE", "session")
+
+# Search backend of the kitchen list views: a dotted path to a
+# kitchen.search.SearchBackend subclass, or "auto" to pick one for the
+# database vendor.
+KITCHEN_SEARCH_BACKEND = os.environ.get("KITCHEN_SEARCH_BACKEND", "auto")
+
+# Pagination of the kitchen list views: "offset" for numbered pages, or
+# "keyset" for cursor pages that skip the COUNT(*) and stay fast when deep.
+KITCHEN_PAGINATION_MODE = os.environ.get("KITCHEN_PAGINATION_MODE", "offset")
+
+# How queued image jobs run: "thread" in a worker thread of each process,
+# "sync" right after the upload commits, or "manual" via run_image_jobs.
+KITCHEN_IMAGE_JOBS = os.environ.get("KITCHEN_IMAGE_JOBS", "thread")
+
+# Share of requests PerformanceMiddleware measures, from 0 to 1. Measured
+# requests get a Server-Timing header and a line in the kitchen.performance
+# log at INFO level, which propagates to wherever the deployment sends its
+# logs.
+KITCHEN_TIMING_SAMPLE_RATE = float(
+    os.environ.get("KITCHEN_TIMING_SAMPLE_RATE", "0.1")
+)
+
+# Queries slower than this many milliseconds are kept, with an EXPLAIN plan
+# per query shape, in an in-memory buffer of the latest
+# KITCHEN_SLOW_QUERY_BUFFER ones shown to staff at /slow-queries/, and are
+# logged to KITCHEN_SLOW_QUERY_LOG, in the temporary directory unless set.
+KITCHEN_SLOW_QUERY_MS = float(os.environ.get("KITCHEN_SLOW_QUERY_MS", "100"))
+KITCHEN_SLOW_QUERY_BUFFER = int(
+    os.environ.get("KITCHEN_SLOW_QUERY_BUFFER", "200")
+)
+KITCHEN_SLOW_QUERY_LOG = os.environ.get(
+    "KITCHEN_SLOW_QUERY_LOG",
+    Path(tempfile.gettempdir()) / "restaurant_mate_slow_queries.log"
+)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "slow_queries_file": {
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": KITCHEN_SLOW_QUERY_LOG,
+            "maxBytes": 10 * 1024 * 1024,
+            "backupCount": 3,
+            "delay": True,
+        },
+    },
+    "loggers": {
+        "kitchen.performance": {
+            "level": "INFO",
+        },
+        "kitchen.slow_queries": {
+            "handlers": ["slow_queries_file"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+    },
+}
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]